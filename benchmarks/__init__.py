@@ -0,0 +1,10 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Benchmarks for kodi-addon-checker, run them from the repository root, e.g.:
+        python -m benchmarks.bench_repository_fetch
+"""
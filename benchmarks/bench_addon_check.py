@@ -0,0 +1,72 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Run all checks of check_addon.start on a synthetic skin and report the
+    wall-clock time, e.g. to compare the file checks across commits.
+"""
+
+import argparse
+import tempfile
+from os.path import abspath, dirname, join
+
+from kodi_addon_checker import check_addon
+from kodi_addon_checker.common import load_plugins
+from kodi_addon_checker.config import Config
+from kodi_addon_checker.reporter import ReportManager
+from kodi_addon_checker.result_cache import ResultCache
+from kodi_addon_checker.runner import FileCheckRunner
+
+from .common import synthetic_skin, timed
+
+REPO_INDEX = join(dirname(dirname(abspath(__file__))), "tests", "fixtures", "repository", "addons.xml")
+
+
+class Args():
+    PR = False
+    allow_folder_id_mismatch = False
+    skip_dependency_checks = True
+    branch = "matrix"
+    jobs = 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--xml", type=int, default=2000, help="xml files in the skin")
+    parser.add_argument("--images", type=int, default=500, help="images in the skin")
+    parser.add_argument("--languages", type=int, default=20, help="languages of the skin")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1], help="--jobs values to compare")
+    parser.add_argument("--cache", action="store_true", help="compare a cold and a warm result cache")
+    args = parser.parse_args()
+
+    load_plugins()
+    ReportManager.enable([])
+    config = Config(None)
+    config.configs["check_kodi_leia_deprecations"] = True
+    all_repo_addons = check_addon.get_all_repo_addons(repo_index=[REPO_INDEX])
+
+    print(f"skin with {args.xml} xml files, {args.images} images, {args.languages} languages")
+    with tempfile.TemporaryDirectory() as path:
+        addon_path = synthetic_skin(path, args.xml, args.images, args.languages)
+        for jobs in args.jobs:
+            check_args = Args()
+            check_args.jobs = jobs
+            elapsed, report = timed(check_addon.start, addon_path, check_args, all_repo_addons, config)
+            print(f"check_addon.start --jobs {jobs}: {elapsed * 1000:8.1f}ms "
+                  f"({report.problem_count} problems, {report.warning_count} warnings)")
+
+        if args.cache:
+            FileCheckRunner.configure(ResultCache(join(path, "cache")))
+            for state, repeat in (("cold", 1), ("warm", 3)):
+                elapsed, report = timed(check_addon.start, addon_path, Args(), all_repo_addons, config,
+                                        repeat=repeat)
+                print(f"check_addon.start {state} cache: {elapsed * 1000:8.1f}ms "
+                      f"({report.problem_count} problems, {report.warning_count} warnings)")
+            FileCheckRunner.cache.save()
+
+
+if __name__ == "__main__":
+    main()
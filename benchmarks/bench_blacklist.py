@@ -0,0 +1,94 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time the Kodi Leia deprecation scan of check_addon.start on a large
+    synthetic skin: one walk and `term in line` test per term and line for the
+    problems and again for the warnings as before, against a single scan with
+    the compiled TermScanner.
+"""
+
+import argparse
+import os
+import pathlib
+import tempfile
+
+from kodi_addon_checker.check_string import find_blacklisted_strings
+from kodi_addon_checker.handle_files import FileIndex
+from kodi_addon_checker.report import Report
+
+from .common import synthetic_skin, timed
+
+LEIA_DEPRECATIONS = ["System.HasModalDialog", "StringCompare", "SubString", "IntegerGreaterThan",
+                     "ListItem.ChannelNumber", "ListItem.SubChannelNumber", "MusicPlayer.ChannelNumber",
+                     "MusicPlayer.SubChannelNumber", "VideoPlayer.ChannelNumber", "VideoPlayer.SubChannelNumber"]
+
+
+def legacy_find_in_file(path, search_terms, whitelisted_file_types):
+    results = []
+    if search_terms:
+        for directory in os.walk(path):
+            for file_name in directory[2]:
+                if pathlib.Path(file_name).suffix in whitelisted_file_types or not whitelisted_file_types:
+                    file_path = os.path.join(directory[0], file_name)
+                    with open(file_path, "r", encoding="utf8") as searchfile:
+                        linenumber = 0
+                        for line in searchfile:
+                            linenumber = linenumber + 1
+                            for term in search_terms:
+                                if term in line:
+                                    results.append({"term": term, "line": line.strip(),
+                                                    "searchfile": file_path, "linenumber": linenumber})
+    return results
+
+
+def legacy_scan(addon_path, problems, warnings, file_types):
+    return (legacy_find_in_file(addon_path, problems, file_types),
+            legacy_find_in_file(addon_path, warnings, file_types))
+
+
+def scan(addon_path, problems, warnings, file_types):
+    report = Report("")
+    find_blacklisted_strings(report, FileIndex(addon_path), problems, warnings, file_types)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--xml", type=int, default=4000, help="xml files in the skin")
+    parser.add_argument("--large-mb", type=int, default=100, help="size of the single large xml file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        addon_path = synthetic_skin(path, args.xml, image_count=0, language_count=1)
+        size = sum(entry.stat.st_size for entry in FileIndex(addon_path))
+        baseline, (problems, _) = timed(legacy_scan, addon_path, LEIA_DEPRECATIONS, [], [".py", ".xml"])
+        scanned, report = timed(scan, addon_path, LEIA_DEPRECATIONS, [], [".py", ".xml"])
+        # the deprecations are also reported as warnings by some configurations
+        split_baseline, _ = timed(legacy_scan, addon_path, LEIA_DEPRECATIONS[:5], LEIA_DEPRECATIONS[5:],
+                                  [".py", ".xml"])
+        split_scanned, _ = timed(scan, addon_path, LEIA_DEPRECATIONS[:5], LEIA_DEPRECATIONS[5:], [".py", ".xml"])
+    assert len(problems) == report.problem_count
+
+    print(f"skin with {args.xml} xml files ({size // 2 ** 20}MB), {report.problem_count} hits")
+    print(f"{'problems only:':26}{baseline * 1000:8.1f}ms before, {scanned * 1000:8.1f}ms single scan")
+    print(f"{'problems and warnings:':26}{split_baseline * 1000:8.1f}ms before, "
+          f"{split_scanned * 1000:8.1f}ms single scan")
+
+    with tempfile.TemporaryDirectory() as path:
+        line = '<control type="label"><visible>String.IsEqual(ListItem.Label,Bench)</visible></control>\n'
+        with open(os.path.join(path, "Includes.xml"), "w", encoding="utf-8") as xml_file:
+            for _ in range(args.large_mb * 2 ** 20 // len(line)):
+                xml_file.write(line)
+            xml_file.write("<visible>StringCompare(a,b)</visible>\n")
+        baseline, _ = timed(legacy_scan, path, LEIA_DEPRECATIONS, [], [".py", ".xml"])
+        scanned, _ = timed(scan, path, LEIA_DEPRECATIONS, [], [".py", ".xml"])
+    print(f"{args.large_mb}MB xml file:{'':12}{baseline * 1000:8.1f}ms before, {scanned * 1000:8.1f}ms memory-mapped "
+          f"({args.large_mb / scanned:.0f}MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time selecting the files of the per-type checks (xml, json, po, images,
+    whitelist) from the index of a large skin, scanning the whole list per
+    check as before against the extension and name buckets of FileIndex.
+"""
+
+import argparse
+import os
+import re
+import tempfile
+
+from kodi_addon_checker.check_files import WHITELIST
+from kodi_addon_checker.handle_files import FileIndex
+
+from .common import timed
+
+IMAGE = re.compile(r"(?!fanart\.jpg|icon\.png).*\.(png|jpg|jpeg|gif)$")
+
+
+def full_scans(file_index):
+    """The selection done by the checks on the list of {"path", "name"} dicts"""
+    selected = 0
+    for ext in (".xml", ".json"):
+        selected += sum(1 for file in file_index if os.path.splitext(file["name"])[1].lower() == ext)
+    selected += sum(1 for file in file_index if file["name"] == "strings.po")
+    selected += sum(1 for file in file_index if IMAGE.match(file["name"]) is not None)
+    for file in file_index:
+        file_parts = file["name"].rsplit(".")
+        if len(file_parts) > 1 and WHITELIST.match("." + file_parts[-1]) is None:
+            selected += 1
+    return selected
+
+
+def buckets(file_index):
+    selected = len(file_index.with_extension(".xml")) + len(file_index.with_extension(".json"))
+    selected += len(file_index.named("strings.po"))
+    selected += sum(1 for file in file_index.with_extension(".png", ".jpg", ".jpeg", ".gif")
+                    if file.name.endswith(file.ext) and not file.name.startswith(("fanart.jpg", "icon.png")))
+    rejected = [ext for ext in file_index.extensions() if ext and WHITELIST.match(ext) is None]
+    rejected_names = [file.name for file in file_index.with_extension("")
+                      if "." in file.name and WHITELIST.match("." + file.name.rsplit(".")[-1]) is None]
+    return selected + len(file_index.select(extensions=rejected, names=rejected_names))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50000, help="files in the skin")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        extensions = [".png"] * 14 + [".xml", ".jpg", ".ttf", ".po", ".json"]
+        for i in range(args.files):
+            directory = os.path.join(path, f"dir{i % 100}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"file{i}{extensions[i % len(extensions)]}"), "wb"):
+                pass
+        index_time, file_index = timed(FileIndex, path, repeat=1)
+
+    baseline, baseline_selected = timed(full_scans, file_index)
+    bucketed, bucketed_selected = timed(buckets, file_index)
+    assert baseline_selected == bucketed_selected
+
+    print(f"{args.files} files, FileIndex built in {index_time * 1000:.1f}ms")
+    print(f"{'full list scans:':18}{baseline * 1000:8.1f}ms")
+    print(f"{'buckets:':18}{bucketed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time and measure the peak memory of checking a decompression bomb icon, a
+    small png file of a huge transparent image: opening and decoding it for
+    the transparency check as before, against the budget check reading the
+    headers. Every variant runs in a fresh process, the peak memory is the
+    maximum resident set size of that process.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import struct
+import tempfile
+import time
+import zlib
+
+from PIL import Image
+
+from kodi_addon_checker import check_artwork, image_probe
+from kodi_addon_checker.common import has_transparency
+
+
+def bomb_png(path, size):
+    """Write a size x size RGBA png of transparent pixels, compressed row by row"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    compressor = zlib.compressobj(9)
+    row = b"\0" * (1 + 4 * size)
+    data = b"".join(compressor.compress(row) for _ in range(size)) + compressor.flush()
+    with open(path, "wb") as png:
+        png.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+                  + chunk(b"IDAT", data) + chunk(b"IEND", b""))
+
+
+def legacy_check(path):
+    Image.MAX_IMAGE_PIXELS = None
+    with Image.open(path) as im:
+        return has_transparency(im)
+
+
+def budget_check(path):
+    return check_artwork._image_budget(path, image_probe.probe_headers(path),  # pylint: disable=protected-access
+                                       check_artwork.DEFAULT_IMAGE_BUDGET)
+
+
+def _measure(func, path, queue):
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def measure(func, path):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(func, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000, help="width and height of the image")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        icon = os.path.join(path, "icon.png")
+        bomb_png(icon, args.size)
+        print(f"{args.size}x{args.size} RGBA png of {os.path.getsize(icon) / 1024:.0f}KB")
+        for label, func in (("decode", legacy_check), ("budget", budget_check)):
+            elapsed, max_rss = measure(func, icon)
+            print(f"  {label:7s} {elapsed * 1000:8.1f}ms, peak {max_rss / 1024:7.1f}MB resident")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time the image checks of check_artwork on a kodi.resource.images like
+    add-on with thousands of png and jpeg files: opening every image with PIL
+    as before, against probing the headers.
+"""
+
+import argparse
+import io
+import os
+import tempfile
+
+from PIL import Image
+
+from kodi_addon_checker import check_artwork
+from kodi_addon_checker.report import Report
+
+from .common import timed
+
+
+def legacy_check_images(images):
+    for image in images:
+        Image.open(image)
+
+
+def check_images(images):
+    report = Report("")
+    for image in images:
+        check_artwork._check_image_file(report, image,  # pylint: disable=protected-access
+                                        check_artwork.DEFAULT_IMAGE_BUDGET)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=5000, help="images in the add-on")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        images = []
+        contents = {}
+        for ext, image_format in ((".png", "PNG"), (".jpg", "JPEG")):
+            data = io.BytesIO()
+            Image.new("RGB", (256, 256), (20, 40, 60)).save(data, image_format, dpi=(72, 72))
+            contents[ext] = data.getvalue()
+        for i in range(args.images):
+            ext = (".png", ".jpg")[i % 2]
+            images.append(os.path.join(path, f"image{i}{ext}"))
+            with open(images[-1], "wb") as image_file:
+                image_file.write(contents[ext])
+
+        print(f"{args.images} images")
+        elapsed, _ = timed(legacy_check_images, images)
+        print(f"Image.open:        {elapsed * 1000:8.1f}ms")
+        elapsed, _ = timed(check_images, images)
+        print(f"_check_image_file: {elapsed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
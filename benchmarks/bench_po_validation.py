@@ -0,0 +1,57 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time the strings.po checks of a language add-on like resource.language.*
+    with tens of PO files of thousands of strings: loading every file with
+    polib as before (--deep-po-validation), against the streaming validator.
+"""
+
+import argparse
+import os
+import tempfile
+
+from kodi_addon_checker.check_string import check_for_invalid_strings_po
+from kodi_addon_checker.report import Report
+
+from .common import timed
+
+
+def check(file_index, deep):
+    report = Report("")
+    check_for_invalid_strings_po(report, file_index, True, deep=deep)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=75, help="PO files in the add-on")
+    parser.add_argument("--strings", type=int, default=3000, help="strings in every PO file")
+    args = parser.parse_args()
+
+    entries = "".join(f'#. Label of control {i}\n#: xbmc/guilib/control.cpp:{i}\nmsgctxt "#{i}"\n'
+                      f'msgid "String {i} with \\"quotes\\""\nmsgstr "Zeichenkette {i}"\n\n'
+                      for i in range(args.strings))
+    with tempfile.TemporaryDirectory() as path:
+        file_index = []
+        for i in range(args.files):
+            code = "en_gb" if i == 0 else f"{chr(97 + i // 26)}{chr(97 + i % 26)}_xx"
+            language = os.path.join(path, "resources", "language", f"resource.language.{code}")
+            os.makedirs(language)
+            with open(os.path.join(language, "strings.po"), "w", encoding="utf-8") as po_file:
+                po_file.write(f'msgid ""\nmsgstr ""\n"Language: {code}\\n"\n\n{entries}')
+            file_index.append({"path": language, "name": "strings.po"})
+
+        size = sum(os.path.getsize(os.path.join(po["path"], po["name"])) for po in file_index)
+        print(f"{args.files} PO files of {args.strings} strings, {size / 1024 / 1024:.1f}MB")
+        for label, deep in (("polib", True), ("streaming", False)):
+            elapsed, report = timed(check, file_index, deep)
+            assert report.problem_count == 0
+            print(f"  {label:9s} {elapsed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
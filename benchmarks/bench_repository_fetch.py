@@ -0,0 +1,50 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Compare fetching all branch indexes one by one with get_all_repo_addons(),
+    against a local HTTP server that emulates the latency of the mirror.
+"""
+
+import argparse
+
+from kodi_addon_checker import ValidKodiVersions, check_addon
+from kodi_addon_checker.addons.Repository import Repository
+
+from .common import index_server, synthetic_index, timed
+
+
+def fetch_serial():
+    return {branch: Repository(branch, check_addon.ROOT_URL.format(branch=branch))
+            for branch in ValidKodiVersions}
+
+
+def fetch_concurrent():
+    return dict(check_addon.get_all_repo_addons().items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=3000, help="add-ons per branch index")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds of latency per request")
+    args = parser.parse_args()
+
+    payload = synthetic_index(args.addons)
+    payloads = {branch: payload for branch in ValidKodiVersions}
+
+    with index_server(payloads, args.latency) as root_url:
+        check_addon.ROOT_URL = root_url
+        serial, _ = timed(fetch_serial)
+        concurrent, repos = timed(fetch_concurrent)
+
+    assert all(len(repo.addons) == args.addons for repo in repos.values())
+    print(f"{len(payloads)} branches x {args.addons} add-ons, {args.latency * 1000:.0f}ms latency")
+    print(f"serial:     {serial:.3f}s")
+    print(f"concurrent: {concurrent:.3f}s ({serial / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
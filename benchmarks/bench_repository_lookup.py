@@ -0,0 +1,66 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Compare Repository membership and latest-version lookups against the
+    previous linear scans on a synthetic catalog.
+"""
+
+import argparse
+
+from kodi_addon_checker.addons.Repository import Repository
+from kodi_addon_checker.versions import AddonVersion
+
+from .common import index_server, synthetic_index, timed
+
+
+def linear_contains(repo, addon_id):
+    for addon in repo.addons:
+        if addon.id == addon_id:
+            return True
+    return False
+
+
+def linear_find(repo, addon_id):
+    addon_instances = [addon for addon in repo.addons if addon.id == addon_id]
+    if not addon_instances:
+        return None
+    addon_instances.sort(key=lambda addon: AddonVersion(addon.version), reverse=True)
+    return addon_instances[0]
+
+
+def lookup(repo, addon_ids, contains, find):
+    found = 0
+    for addon_id in addon_ids:
+        if contains(repo, addon_id) and find(repo, addon_id) is not None:
+            found += 1
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=10000, help="add-ons in the catalog")
+    parser.add_argument("--lookups", type=int, default=1000, help="number of add-on ids looked up")
+    args = parser.parse_args()
+
+    with index_server({"matrix": synthetic_index(args.addons)}) as root_url:
+        repo = Repository("matrix", root_url.format(branch="matrix"))
+
+    # half of the looked up ids exist in the catalog
+    addon_ids = [f"plugin.video.addon{args.addons - i}" if i % 2 else f"plugin.video.missing{i}"
+                 for i in range(args.lookups)]
+
+    linear, expected = timed(lookup, repo, addon_ids, linear_contains, linear_find, repeat=1)
+    indexed, found = timed(lookup, repo, addon_ids, lambda r, a: a in r, Repository.find)
+    assert found == expected
+
+    print(f"{args.lookups} lookups in a {args.addons} add-on catalog")
+    print(f"linear:  {linear * 1000:.1f}ms")
+    print(f"indexed: {indexed * 1000:.3f}ms ({linear / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
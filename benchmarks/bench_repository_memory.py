@@ -0,0 +1,65 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Measure the tracemalloc peak of loading all branch indexes with the
+    streaming loader, against buffering and parsing each payload as a whole.
+"""
+
+import argparse
+import gzip
+import tracemalloc
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import requests
+
+from kodi_addon_checker import ValidKodiVersions
+from kodi_addon_checker.addons.Addon import Addon
+from kodi_addon_checker.addons.Repository import Repository
+
+from .common import index_server, synthetic_index
+
+
+def load_buffered(url):
+    """The loader used before streaming: response, gunzipped bytes and tree coexist"""
+    content = requests.get(url, timeout=30).content
+    with gzip.open(BytesIO(content), "rb") as xml_file:
+        content = xml_file.read()
+    return [Addon(addon) for addon in ET.fromstring(content).findall("addon")]
+
+
+def load_streaming(url):
+    return Repository("matrix", url).addons
+
+
+def measure(loader, root_url):
+    tracemalloc.start()
+    repos = {branch: loader(root_url.format(branch=branch)) for branch in ValidKodiVersions}
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert all(repos.values())
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=5000, help="add-ons per branch index")
+    args = parser.parse_args()
+
+    payload = synthetic_index(args.addons)
+    with index_server({branch: payload for branch in ValidKodiVersions}) as root_url:
+        buffered = measure(load_buffered, root_url)
+        streaming = measure(load_streaming, root_url)
+
+    print(f"{len(ValidKodiVersions)} branches x {args.addons} add-ons "
+          f"({len(payload) // 1024}KB compressed per branch)")
+    for name, (current, peak) in (("buffered", buffered), ("streaming", streaming)):
+        print(f"{name + ':':11}retained {current / 2 ** 20:6.1f}MB, peak {peak / 2 ** 20:6.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
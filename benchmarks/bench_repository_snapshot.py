@@ -0,0 +1,60 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Compare loading all branches from the cached addons.xml.gz payloads
+    with loading them from the binary repository snapshots.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from kodi_addon_checker import ValidKodiVersions
+from kodi_addon_checker.addons.RepositoryCatalog import RepositoryCatalog
+from kodi_addon_checker.addons.RepositoryCache import RepositoryCache
+
+from .common import index_server, synthetic_index, timed
+
+
+def load(root_url, cache):
+    catalog = RepositoryCatalog(root_url, cache=cache)
+    return [catalog[branch] for branch in ValidKodiVersions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=5000, help="add-ons per branch index")
+    args = parser.parse_args()
+
+    # every branch gets its own payload, so nothing is shared between them
+    payloads = {branch: synthetic_index(args.addons + i) for i, branch in enumerate(ValidKodiVersions)}
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = RepositoryCache(cache_dir, max_age=3600)
+        with index_server(payloads) as root_url:
+            load(root_url, cache)
+
+            def without_snapshot():
+                for name in os.listdir(cache_dir):
+                    if name.endswith(".snapshot"):
+                        os.unlink(os.path.join(cache_dir, name))
+                return load(root_url, cache)
+
+            parsed_time, parsed = timed(without_snapshot)
+            snapshot_time, loaded = timed(load, root_url, cache)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    assert [len(repo.addons) for repo in parsed] == [len(repo.addons) for repo in loaded]
+    print(f"{len(ValidKodiVersions)} branches x ~{args.addons} add-ons from a warm cache")
+    print(f"parse payloads:  {parsed_time * 1000:.0f}ms (includes writing the snapshots)")
+    print(f"load snapshots:  {snapshot_time * 1000:.0f}ms ({parsed_time / snapshot_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time check_reverse_dependencies() for every script.module.* add-on of a
+    synthetic multi-branch catalog, against the previous linear scans.
+"""
+
+import argparse
+
+from kodi_addon_checker import ValidKodiVersions
+from kodi_addon_checker.addons.RepositoryCatalog import RepositoryCatalog
+from kodi_addon_checker.check_dependencies import check_reverse_dependencies
+from kodi_addon_checker.report import Report
+
+from .common import index_server, synthetic_index, timed
+
+
+def linear_reverse_dependencies(addon, branch_name, all_repo_addons):
+    """The scans done before the inverted index existed"""
+    rdepends = []
+    rdepends_lower_branch = []
+    branch_found = False
+    for branch, repo in sorted(all_repo_addons.items()):
+        scan = [candidate for candidate in repo.addons if candidate.dependsOn(addon)]
+        if not branch_found and branch != branch_name:
+            for rdepend in scan:
+                if rdepend not in rdepends_lower_branch:
+                    rdepends_lower_branch.append(rdepend)
+            continue
+        branch_found = True
+        for rdepend in scan:
+            if rdepend not in rdepends_lower_branch and rdepend not in rdepends:
+                rdepends.append(rdepend)
+    return rdepends, rdepends_lower_branch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=5000, help="add-ons per branch index")
+    parser.add_argument("--modules", type=int, default=1000, help="script.module.* add-ons per branch")
+    parser.add_argument("--sample", type=int, default=5, help="modules checked with the linear scans")
+    args = parser.parse_args()
+
+    payload = synthetic_index(args.addons, args.modules)
+    with index_server({branch: payload for branch in ValidKodiVersions}) as root_url:
+        catalog = RepositoryCatalog(root_url)
+        catalog.prefetch()
+
+    modules = [f"script.module.mod{i}" for i in range(args.modules)]
+
+    def indexed():
+        for module in modules:
+            check_reverse_dependencies(Report(module), module, "matrix", catalog)
+
+    def linear():
+        for module in modules[:args.sample]:
+            linear_reverse_dependencies(module, "matrix", catalog)
+
+    indexed_time, _ = timed(indexed)
+    linear_time, _ = timed(linear, repeat=1)
+    linear_estimate = linear_time / args.sample * args.modules
+
+    print(f"{len(ValidKodiVersions)} branches x {args.addons} add-ons, {args.modules} modules checked")
+    print(f"linear:  {linear_estimate:.1f}s (extrapolated from {args.sample} modules)")
+    print(f"indexed: {indexed_time * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
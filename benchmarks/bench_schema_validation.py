@@ -0,0 +1,68 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Validate the addon.xml of a batch of add-ons, compiling every schema per
+    validation as before and with the process-wide schema registry, and count
+    the stat calls of the validation with a warm registry.
+"""
+
+import argparse
+import os
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+import xmlschema
+
+from kodi_addon_checker import schema_validation
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.schema_validation import SchemaRegistry
+
+from .common import synthetic_addons_xml, timed
+
+
+def validate(addons):
+    for addon in addons:
+        schema_validation.schemas(Report(""), addon, "matrix")
+
+
+def validate_uncompiled(addons):
+    get = SchemaRegistry.get
+    SchemaRegistry.get = xmlschema.XMLSchema
+    try:
+        validate(addons)
+    finally:
+        SchemaRegistry.get = get
+
+
+def stat_calls(addons):
+    with mock.patch("os.lstat", side_effect=os.lstat) as lstat, mock.patch("os.stat", side_effect=os.stat) as stat:
+        validate(addons)
+    return lstat.call_count + stat.call_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=50, help="add-ons validated per run")
+    args = parser.parse_args()
+
+    addons = ET.fromstring(synthetic_addons_xml(args.addons)).findall("addon")
+    for addon in addons:
+        ET.SubElement(addon, "extension", point="xbmc.python.pluginsource", library="main.py")
+
+    baseline, _ = timed(validate_uncompiled, addons, repeat=1)
+    validate(addons[:1])
+    registry, _ = timed(validate, addons)
+    stats = stat_calls(addons)
+
+    print(f"{args.addons} add-ons")
+    print(f"{'compile per validation:':28}{baseline * 1000:8.1f}ms")
+    print(f"{'schema registry:':28}{registry * 1000:8.1f}ms")
+    print(f"{'stat calls:':28}{stats:8d}")
+
+
+if __name__ == "__main__":
+    main()
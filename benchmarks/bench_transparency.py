@@ -0,0 +1,77 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time the transparency check of 3840x2160 RGBA fanart: listing the alpha
+    band in Python and scanning it pixel by pixel as before, against the
+    band extrema. The images are decoded before timing, only the scan is
+    measured.
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from PIL import Image
+
+from kodi_addon_checker.common import has_transparency
+
+from .common import timed
+
+
+def legacy_has_transparency(im):
+    try:
+        if im.mode == "RGBA":
+            alpha = im.split()[-1]
+            listdata = list(alpha.getdata())
+            first_transparent_pixel = next(x[0]
+                                           for x in enumerate(listdata) if x[1] < 255)
+            if first_transparent_pixel is not None:
+                return True
+        return False
+    except StopIteration:
+        return False
+
+
+def check_images(func, images):
+    return [func(im) for im in images]
+
+
+def peak_memory(func, images):
+    tracemalloc.start()
+    try:
+        check_images(func, images)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=3, help="4K images to check")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        images = []
+        for i in range(args.images):
+            image_path = os.path.join(path, f"fanart{i}.png")
+            # solid images are the worst case of the legacy scan, every pixel is visited
+            Image.new("RGBA", (3840, 2160), (20, 40, 60, 255)).save(image_path)
+            with Image.open(image_path) as im:
+                im.load()
+                images.append(im)
+
+        print(f"{args.images} 3840x2160 RGBA png images")
+        for label, func in (("list(getdata())", legacy_has_transparency), ("getextrema", has_transparency)):
+            elapsed, result = timed(check_images, func, images)
+            assert not any(result)
+            print(f"  {label:16s} {elapsed * 1000:8.1f}ms, "
+                  f"peak {peak_memory(func, images) / 1024 / 1024:6.1f}MB traced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time the full decode of --verify-images on an add-on with many 1920x1080
+    screenshots, serially and in a pool of worker processes.
+"""
+
+import argparse
+import os
+import tempfile
+
+from PIL import Image
+
+from kodi_addon_checker import check_artwork
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.runner import FileCheckRunner
+
+from .common import timed
+
+
+def verify_images(jobs, images):
+    report = Report("")
+    FileCheckRunner(jobs).run(report, check_artwork._verify_image_file,  # pylint: disable=protected-access
+                              [(image, 10, check_artwork.DEFAULT_IMAGE_BUDGET) for image in images])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=40, help="images in the add-on")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes, 0 for one per core")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        images = []
+        sources = {ext: os.path.join(path, f"source{ext}") for ext in (".png", ".jpg")}
+        for source in sources.values():
+            Image.effect_noise((1920, 1080), 40).convert("RGB").save(source)
+        for i in range(args.images):
+            ext = (".png", ".jpg")[i % 2]
+            images.append(os.path.join(path, f"screenshot{i}{ext}"))
+            os.link(sources[ext], images[-1])
+
+        jobs = args.jobs or os.cpu_count() or 1
+        print(f"{args.images} 1920x1080 images, {jobs} jobs")
+        # the worker pool is started before timing, it is shared by all add-ons of a run
+        verify_images(jobs, images[:jobs * 2])
+        for label, run_jobs in (("serial", 1), ("pool", jobs)):
+            elapsed, _ = timed(verify_images, run_jobs, images)
+            print(f"  {label:6s} {elapsed * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Micro-benchmarks for version handling: sorting repository add-ons by version,
+    dependency checks against a catalog and KodiVersion comparisons, with and
+    without the version parsing cache.
+"""
+
+import argparse
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+from kodi_addon_checker import ValidKodiVersions, versions
+from kodi_addon_checker.addons.Repository import Repository
+from kodi_addon_checker.check_dependencies import check_addon_dependencies
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.versions import AddonVersion, KodiVersion
+
+from .common import index_server, synthetic_index, timed
+
+
+class Args():
+    PR = False
+    branch = "matrix"
+
+
+@contextmanager
+def uncached():
+    cached = versions._parse_version  # pylint: disable=protected-access
+    versions._parse_version = cached.__wrapped__  # pylint: disable=protected-access
+    try:
+        yield
+    finally:
+        versions._parse_version = cached  # pylint: disable=protected-access
+
+
+def sort_versions(version_strings):
+    return sorted(version_strings, key=AddonVersion, reverse=True)
+
+
+def check_dependencies(repo, addon_elements):
+    for element in addon_elements:
+        check_addon_dependencies(Report(""), repo, element, Args())
+
+
+def compare_branches(count):
+    branches = [KodiVersion(branch) for branch in ValidKodiVersions]
+    target = KodiVersion("matrix")
+    return sum(1 for _ in range(count) for branch in branches if branch >= target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--addons", type=int, default=10000, help="add-ons in the catalog")
+    args = parser.parse_args()
+
+    with index_server({"matrix": synthetic_index(args.addons)}) as root_url:
+        repo = Repository("matrix", root_url.format(branch="matrix"))
+    version_strings = [addon.version for addon in repo.addons]
+
+    # addon.xml elements depending on every module of the catalog
+    addon_elements = [ET.fromstring(
+        '<addon id="plugin.video.bench" version="1.0.0"><requires>'
+        '<import addon="xbmc.python" version="3.0.0"/>'
+        + "".join(f'<import addon="script.module.mod{i}" version="1.0.{i % 5}"/>' for i in range(j, j + 20))
+        + "</requires></addon>") for j in range(0, 200, 20)] * 10
+
+    print(f"{args.addons} add-on catalog")
+    for name, func, func_args in (("sort repository versions", sort_versions, (version_strings,)),
+                                  ("dependency checks", check_dependencies, (repo, addon_elements))):
+        with uncached():
+            baseline, _ = timed(func, *func_args)
+        versions._parse_version.cache_clear()  # pylint: disable=protected-access
+        func(*func_args)
+        cached, _ = timed(func, *func_args)
+        print(f"{name + ':':26}{baseline * 1000:8.1f}ms uncached, {cached * 1000:8.1f}ms cached")
+
+    compare_time, _ = timed(compare_branches, 100000)
+    print(f"{'1M KodiVersion compares:':26}{compare_time * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
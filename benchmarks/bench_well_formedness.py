@@ -0,0 +1,68 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Time and measure the peak memory of the well-formedness checks of a large
+    skin xml and a large bundled json file: building the whole document with
+    ET.parse and json.load as before, against the streaming validators.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from kodi_addon_checker import well_formedness
+
+from .common import timed
+
+
+def json_load(path):
+    with open(path, "r", encoding="utf8") as json_data:
+        json.load(json_data)
+
+
+def peak_memory(func, path):
+    tracemalloc.start()
+    try:
+        func(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200000, help="controls / json objects in the files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        xml_path = os.path.join(path, "Includes.xml")
+        with open(xml_path, "w", encoding="utf-8") as xml_file:
+            xml_file.write("<includes>\n")
+            for i in range(args.items):
+                xml_file.write(f'<control type="button" id="{i}"><label>$LOCALIZE[{i}]</label>'
+                               "<onclick>Action(Select)</onclick></control>\n")
+            xml_file.write("</includes>\n")
+        json_path = os.path.join(path, "data.json")
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            json.dump([{"id": i, "label": f"item {i}", "thumb": "special://skin/media/thumb.png",
+                        "values": [i, i / 2, True, None]} for i in range(args.items)], json_file, indent=1)
+
+        for name, file_path, checks in (
+                ("xml", xml_path, (("ET.parse", ET.parse), ("check_xml", well_formedness.check_xml))),
+                ("json", json_path, (("json.load", json_load), ("check_json", well_formedness.check_json)))):
+            print(f"{name} file of {os.path.getsize(file_path) / 1024 / 1024:.1f}MB")
+            for label, func in checks:
+                elapsed, _ = timed(func, file_path)
+                print(f"  {label:10s} {elapsed * 1000:8.1f}ms, "
+                      f"peak {peak_memory(func, file_path) / 1024 / 1024:6.1f}MB traced")
+
+
+if __name__ == "__main__":
+    main()
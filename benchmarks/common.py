@@ -0,0 +1,164 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import gzip
+import os
+import struct
+import threading
+import zlib
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def synthetic_addons_xml(addon_count, module_count=200):
+    """Build an addons.xml document resembling the official repository indexes
+        :addon_count: number of add-ons in the index
+        :module_count: number of script.module.* add-ons the other add-ons depend on
+    """
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', "<addons>"]
+    for i in range(addon_count):
+        if i < module_count:
+            addon_id = f"script.module.mod{i}"
+            imports = ['<import addon="xbmc.python" version="3.0.0"/>']
+        else:
+            addon_id = f"plugin.video.addon{i}"
+            imports = ['<import addon="xbmc.python" version="3.0.0"/>',
+                       f'<import addon="script.module.mod{i % module_count}" version="1.0.{i % 7}"/>',
+                       f'<import addon="script.module.mod{(i * 7) % module_count}" optional="true"/>']
+        lines.append(f'<addon id="{addon_id}" name="Addon {i}" version="1.{i % 13}.{i % 5}" provider-name="bench">')
+        lines.append(f"<requires>{''.join(imports)}</requires>")
+        lines.append('<extension point="xbmc.addon.metadata"><summary lang="en_GB">Synthetic add-on</summary>'
+                     '<description lang="en_GB">Synthetic add-on used for benchmarking</description>'
+                     '<platform>all</platform><license>GPL-3.0-only</license></extension>')
+        lines.append("</addon>")
+    lines.append("</addons>")
+    return "\n".join(lines).encode("utf-8")
+
+
+def synthetic_index(addon_count, module_count=200):
+    """Gzipped synthetic addons.xml, as served by the mirrors"""
+    return gzip.compress(synthetic_addons_xml(addon_count, module_count))
+
+
+def tiny_png(width=1, height=1):
+    """A valid, solid RGB PNG of the given dimensions"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\0" + b"\x80" * 3 * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def synthetic_skin(path, xml_count=2000, image_count=500, language_count=20):
+    """Create a skin-like add-on directory tree for the file check benchmarks
+        :path: parent directory, the add-on is created as <path>/skin.bench
+        :xml_count: number of window/include xml files
+        :image_count: number of media files
+        :language_count: number of resource.language.* directories with a strings.po
+        :return: path of the add-on, with a trailing separator like the command line
+    """
+    addon_path = os.path.join(path, "skin.bench")
+    os.makedirs(os.path.join(addon_path, "xml"))
+    with open(os.path.join(addon_path, "addon.xml"), "w", encoding="utf-8") as addon_xml:
+        addon_xml.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<addon id="skin.bench" name="Bench" version="1.0.0" provider-name="bench">'
+                        '<requires><import addon="xbmc.gui" version="5.15.0"/></requires>'
+                        '<extension point="xbmc.gui.skin" debugging="false"><res width="1920" height="1080" '
+                        'aspect="16:9" default="true" folder="xml"/></extension>'
+                        '<extension point="xbmc.addon.metadata"><summary lang="en_GB">Bench</summary>'
+                        '<description lang="en_GB">Bench</description><platform>all</platform>'
+                        '<license>GPL-3.0-only</license><assets><icon>icon.png</icon></assets>'
+                        '</extension></addon>\n')
+    with open(os.path.join(addon_path, "icon.png"), "wb") as icon:
+        icon.write(tiny_png(256, 256))
+    _skin_windows(addon_path, xml_count)
+    _skin_media(addon_path, image_count)
+    _skin_languages(addon_path, language_count)
+    return addon_path + os.sep
+
+
+def _skin_windows(addon_path, xml_count):
+    """Window xml files of 40 controls, one in 997 uses a deprecated condition"""
+    for i in range(xml_count):
+        controls = []
+        for j in range(40):
+            condition = "StringCompare(ListItem.Label,Bench)" if (i * 40 + j) % 997 == 0 else \
+                        "String.IsEqual(ListItem.Label,Bench)"
+            controls.append(f'<control type="label" id="{j}"><visible>{condition}</visible>'
+                            f'<label>$INFO[ListItem.Label]</label><font>font{j % 12}</font></control>')
+        with open(os.path.join(addon_path, "xml", f"Window{i}.xml"), "w", encoding="utf-8") as window:
+            window.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<window id="{i}"><controls>\n'
+                         + "\n".join(controls) + "\n</controls></window>\n")
+
+
+def _skin_media(addon_path, image_count):
+    """Small png files spread over ten media directories"""
+    png = tiny_png(32, 32)
+    for i in range(image_count):
+        media = os.path.join(addon_path, "media", f"set{i % 10}")
+        os.makedirs(media, exist_ok=True)
+        with open(os.path.join(media, f"image{i}.png"), "wb") as image:
+            image.write(png)
+
+
+def _skin_languages(addon_path, language_count):
+    """A strings.po of 500 entries per language directory"""
+    entries = "".join(f'msgctxt "#{31000 + i}"\nmsgid "String {i}"\nmsgstr ""\n\n' for i in range(500))
+    for i in range(language_count):
+        code = "en_gb" if i == 0 else f"x{i:02d}_xx"
+        language = os.path.join(addon_path, "resources", "language", f"resource.language.{code}")
+        os.makedirs(language)
+        with open(os.path.join(language, "strings.po"), "w", encoding="utf-8") as po_file:
+            po_file.write(f'msgid ""\nmsgstr ""\n"Language: {code}\\n"\n\n{entries}')
+
+
+@contextmanager
+def index_server(payloads, latency=0.0):
+    """Serve {"<branch>": <addons.xml.gz bytes>} at http://127.0.0.1:<port>/<branch>/addons.xml.gz
+
+        :latency: seconds slept before answering each request, to emulate a remote mirror
+        :return: the url template, suitable as ROOT_URL
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # pylint: disable=invalid-name
+            time.sleep(latency)
+            payload = payloads.get(self.path.strip("/").split("/")[0])
+            if payload is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/{{branch}}/addons.xml.gz"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Return the best wall-clock time of `repeat` calls and the last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
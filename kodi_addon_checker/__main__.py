@@ -12,12 +12,15 @@ import os
 import sys
 
 from kodi_addon_checker import __version__, check_addon, ValidKodiVersions
+from kodi_addon_checker.addons.RepositoryCache import RepositoryCache
 from kodi_addon_checker.check_repo import check_repo
 from kodi_addon_checker.common import load_plugins
 from kodi_addon_checker.config import Config, ConfigManager
 from kodi_addon_checker.logger import Logger
 from kodi_addon_checker.record import INFORMATION, PROBLEM, WARNING, Record
 from kodi_addon_checker.report import Report
+from kodi_addon_checker.result_cache import ResultCache
+from kodi_addon_checker.runner import FileCheckRunner
 
 
 def dir_type(dir_path):
@@ -73,19 +76,61 @@ def main():
     parser.add_argument("--branch", choices=ValidKodiVersions, required=True,
                         help="Target branch name where the checker will resolve dependencies")
     parser.add_argument("--PR", help="Tell if tool is to run on a pull requests or not", action='store_true')
+    parser.add_argument("--changed-since", metavar="REF", default=None,
+                        help="Only run the per-file checks on the files changed since the given git revision, \
+                        e.g. the base branch of a pull request. Checks of the whole add-on still run")
     parser.add_argument("--allow-folder-id-mismatch", help="Allow the addon's folder name and id to mismatch",
                         action="store_true")
     parser.add_argument("--enable-debug-log", help="Enable debug logging to kodi-addon-checker.log",
                         action="store_true", default=False)
     parser.add_argument("--skip-dependency-checks", help="Do not check if addon dependencies are available \
                         in the official Kodi addon repository", action="store_true", default=False)
+    parser.add_argument("--branches", nargs="+", choices=ValidKodiVersions, default=None,
+                        help="Branches whose repository index is consulted, defaults to all branches. \
+                        The target branch is always included. The reverse dependency and branch checks download \
+                        the index of every branch in scope, use this option to limit the downloads")
+    parser.add_argument("--repo-index", action="append", default=None, metavar="[BRANCH=]LOCATION",
+                        help="Read the repository indexes from a local directory laid out like the mirror \
+                        (<dir>/<branch>/addons.xml.gz), or from a path or file:// url which may contain a \
+                        {branch} placeholder. Prefix with BRANCH= to only replace the index of that branch. \
+                        This option can be used multiple times")
+    parser.add_argument("--cache-dir", help="Directory used to cache the downloaded repository indexes \
+                        and the results of the per-file checks between runs", default=None)
+    parser.add_argument("--cache-max-age", type=int, default=3600,
+                        help="Number of seconds a cached repository index is used before it is revalidated")
+    parser.add_argument("--cache-max-size", type=int, default=100,
+                        help="Maximum size in MB of the cached results of the per-file checks")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes used for the per-file \
+                        checks of an add-on, 0 uses one per core. Defaults to 1, checking the files serially")
+    parser.add_argument("--verify-images", action="store_true", default=False,
+                        help="Fully decode the images to find corrupted image data, opening an image only reads \
+                        its headers. The images are decoded by the --jobs worker processes")
+    parser.add_argument("--image-timeout", type=float, default=10,
+                        help="Number of seconds an image may take to be decoded by --verify-images")
+    parser.add_argument("--max-image-pixels", type=int, default=None,
+                        help="Images with more pixels are reported and not decoded, 0 disables the limit. \
+                        Defaults to 50000000")
+    parser.add_argument("--max-image-file-size", type=int, default=None,
+                        help="Image files larger than this number of KB are reported and not decoded, 0 disables \
+                        the limit. Defaults to 20480")
+    parser.add_argument("--deep-po-validation", action="store_true", default=False,
+                        help="Also load the PO files with polib and report its syntax errors, slower than the \
+                        streaming validator")
     ConfigManager.fill_cmd_args(parser)
     args = parser.parse_args()
 
     log_file_name = os.path.join(os.getcwd(), "kodi-addon-checker.log")
     Logger.create_logger(log_file_name, __package__, args.enable_debug_log)
 
-    all_repo_addons = check_addon.get_all_repo_addons()
+    cache = None
+    if args.cache_dir:
+        cache = RepositoryCache(os.path.join(args.cache_dir, "repository"), args.cache_max_age)
+        FileCheckRunner.configure(ResultCache(os.path.join(args.cache_dir, "results"),
+                                              args.cache_max_size * 1024 * 1024))
+    branches = None
+    if args.branches:
+        branches = set(args.branches) | {args.branch}
+    all_repo_addons = check_addon.get_all_repo_addons(cache, branches, args.repo_index)
 
     if args.dir:
         # Following report is a wrapper for all sub reports
@@ -8,21 +8,38 @@
 
 import xml.etree.ElementTree as ET
 
-from .AddonDependency import AddonDependency
+from .AddonDependency import AddonDependency, _intern
+
+# dependency tuples shared by all the add-ons declaring the same imports
+_DEPENDENCY_TUPLES = {}
 
 
 class Addon():
+    __slots__ = ("id", "version", "dependencies")
+
     def __init__(self, addon_xml: ET.Element):
         super().__init__()
-        self.id = addon_xml.get('id')
-        self.version = addon_xml.get('version')
-        self.dependencies = []
-        for dependency in addon_xml.findall('./requires/import'):
-            self.dependencies.append(AddonDependency(dependency))
+        self.id = _intern(addon_xml.get('id'))
+        self.version = _intern(addon_xml.get('version'))
+        dependencies = tuple(AddonDependency.shared(dependency)
+                             for dependency in addon_xml.findall('./requires/import'))
+        self.dependencies = _DEPENDENCY_TUPLES.setdefault(dependencies, dependencies)
+
+    @classmethod
+    def from_values(cls, addon_id, version, dependencies: tuple):
+        """Create an Addon without parsing XML, e.g. from a repository snapshot"""
+        addon = cls.__new__(cls)
+        addon.id = _intern(addon_id)
+        addon.version = _intern(version)
+        addon.dependencies = _DEPENDENCY_TUPLES.setdefault(dependencies, dependencies)
+        return addon
 
     def __eq__(self, other):
         return self.id == other.id and self.version == other.version
 
+    def __hash__(self):
+        return hash((self.id, self.version))
+
     def dependsOn(self, addonId):
         for dependency in self.dependencies:
             if dependency.id == addonId:
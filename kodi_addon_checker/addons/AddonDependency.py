@@ -6,14 +6,46 @@
     See LICENSES/README.md for more information.
 """
 
+import sys
 import xml.etree.ElementTree as ET
 from ..versions import AddonVersion
 
+# (addon, version, optional) -> AddonDependency shared by all the add-ons declaring it
+_DEPENDENCIES = {}
+
+
 class AddonDependency():
+    __slots__ = ("id", "version", "optional")
+
     def __init__(self, import_xml: ET.Element):
         super().__init__()
-        self.id = import_xml.get('addon')
+        self.id = _intern(import_xml.get('addon'))
         self.version = None
         if import_xml.get('version') is not None:
             self.version = AddonVersion(import_xml.get('version'))
         self.optional = import_xml.get('optional', False)
+
+    @classmethod
+    def shared(cls, import_xml: ET.Element):
+        """Return the AddonDependency for the given <import> element, identical imports
+        share a single instance. Shared instances must not be modified.
+        """
+        return cls.from_values(import_xml.get('addon'), import_xml.get('version'),
+                               import_xml.get('optional', False))
+
+    @classmethod
+    def from_values(cls, addon_id, version, optional):
+        """Return the shared AddonDependency for the given attribute values of an <import> element"""
+        key = (addon_id, version, optional)
+        dependency = _DEPENDENCIES.get(key)
+        if dependency is None:
+            dependency = cls.__new__(cls)
+            dependency.id = _intern(addon_id)
+            dependency.version = AddonVersion(version) if version is not None else None
+            dependency.optional = optional
+            dependency = _DEPENDENCIES.setdefault(key, dependency)
+        return dependency
+
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
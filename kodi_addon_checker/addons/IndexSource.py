@@ -0,0 +1,196 @@
+"""
+    Copyright (C) 2018 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import atexit
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import requests
+
+from .. import ValidKodiVersions
+from ..common import CHUNK_SIZE, read_chunks
+
+
+class RateLimitedAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, *args, retries=5, wait=None, **kwargs):
+        self._last_send = None
+        self._wait_time = wait
+        max_retries = requests.adapters.Retry(
+            total=retries,
+            backoff_factor=wait or 10,
+            status_forcelist={429, },
+            allowed_methods=None,
+        )
+        kwargs.setdefault('max_retries', max_retries)
+        super().__init__(*args, **kwargs)
+
+    def send(self, *args, **kwargs):
+        if self._wait_time and self._last_send:
+            delta = time.time() - self._last_send
+            if delta < self._wait_time:
+                time.sleep(self._wait_time - delta)
+
+        self._last_send = time.time()
+        response = super().send(*args, **kwargs)
+        status_code = getattr(response, 'status_code', None)
+        if 300 <= status_code < 400:
+            self._last_send = None
+        return response
+
+
+class IndexSource(ABC):
+    """Provides the addons.xml(.gz) payload of a branch to Repository"""
+
+    # number of branches loaded at the same time
+    concurrency = 3
+
+    def __init__(self, cache=None):
+        """
+        :param cache: optional RepositoryCache, also used to store repository snapshots
+        """
+        self.cache = cache
+
+    @abstractmethod
+    def location(self, branch):
+        """Return the url or path of the index of the given branch"""
+
+    @abstractmethod
+    def payload_path(self, branch):
+        """
+        Return the path of a local file holding the index of the given branch, or None
+        if it can only be streamed with open().
+        :raises OSError, requests.exceptions.RequestException: if the index is not available
+        """
+
+    @contextmanager
+    def open(self, branch):
+        """
+        Context manager yielding the raw payload of the given branch in chunks.
+        :raises OSError, requests.exceptions.RequestException: if the index is not available
+        """
+        yield read_chunks(self.payload_path(branch))
+
+
+class HttpIndexSource(IndexSource):
+    """Downloads the indexes from a mirror, e.g. http://mirrors.kodi.tv/addons/{branch}/addons.xml.gz"""
+
+    concurrency = 3
+    timeout = (30, 30)
+
+    # Recover from unreliable mirrors
+    _session = requests.Session()
+    _adapter = RateLimitedAdapter(retries=5, pool_maxsize=concurrency, pool_block=True)
+    _session.mount('http://', _adapter)
+    _session.mount('https://', _adapter)
+    atexit.register(_session.close)
+
+    def __init__(self, url_template, cache=None):
+        super().__init__(cache)
+        self.url_template = url_template
+
+    def location(self, branch):
+        return self.url_template.format(branch=branch)
+
+    def payload_path(self, branch):
+        if self.cache is None:
+            return None
+        return self.cache.fetch(self._session, self.location(branch), timeout=self.timeout)
+
+    @contextmanager
+    def open(self, branch):
+        if self.cache is not None:
+            yield read_chunks(self.payload_path(branch))
+        else:
+            with self._session.get(self.location(branch), timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                yield response.iter_content(CHUNK_SIZE)
+
+
+class LocalIndexSource(IndexSource):
+    """Reads the indexes from the local filesystem, e.g. an rsync copy of the mirror"""
+
+    def __init__(self, location, cache=None):
+        """
+        :param location: a directory laid out like the mirror (<directory>/<branch>/addons.xml.gz),
+                         or a path or file:// url, optionally containing a {branch} placeholder
+        """
+        super().__init__(cache)
+        if location.startswith("file://"):
+            location = url2pathname(unquote(urlparse(location).path))
+        self.path_template = location
+
+    def location(self, branch):
+        path = self.path_template.format(branch=branch)
+        if not os.path.isdir(path):
+            return path
+        if "{branch}" not in self.path_template:
+            path = os.path.join(path, branch)
+        for name in ("addons.xml.gz", "addons.xml"):
+            if os.path.isfile(os.path.join(path, name)):
+                return os.path.join(path, name)
+        return os.path.join(path, "addons.xml.gz")
+
+    def payload_path(self, branch):
+        path = self.location(branch)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Repository index {path} does not exist")
+        return path
+
+
+class BranchIndexSource(IndexSource):
+    """Dispatches every branch to its own source, falling back to a default one"""
+
+    def __init__(self, default: IndexSource, sources: dict):
+        super().__init__(default.cache)
+        self.default = default
+        self.sources = sources
+
+    def location(self, branch):
+        return self.sources.get(branch, self.default).location(branch)
+
+    def payload_path(self, branch):
+        return self.sources.get(branch, self.default).payload_path(branch)
+
+    @contextmanager
+    def open(self, branch):
+        with self.sources.get(branch, self.default).open(branch) as chunks:
+            yield chunks
+
+
+def index_source(location, cache=None):
+    """Create the IndexSource for a http(s) url, file:// url or local path"""
+    if location.startswith(("http://", "https://")):
+        return HttpIndexSource(location, cache)
+    return LocalIndexSource(location, cache)
+
+
+def parse_repo_index(entries: list, default: IndexSource):
+    """Create the IndexSource for the --repo-index command line option
+
+        :entries: list of locations, optionally prefixed with "<branch>=" to only
+                  apply them to a single branch
+        :default: source used for the branches without an entry
+    """
+    location = None
+    sources = {}
+    for entry in entries or []:
+        branch, separator, branch_location = entry.partition("=")
+        if separator and branch in ValidKodiVersions:
+            sources[branch] = index_source(branch_location, default.cache)
+        else:
+            location = entry
+
+    if location is not None:
+        default = index_source(location, default.cache)
+    if not sources:
+        return default
+    return BranchIndexSource(default, sources)
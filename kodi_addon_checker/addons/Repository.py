@@ -6,98 +6,123 @@
     See LICENSES/README.md for more information.
 """
 
-import atexit
-import gzip
-import time
+import logging
 import xml.etree.ElementTree as ET
-from io import BytesIO
+import zlib
 
 import requests
 
 from .Addon import Addon
+from .IndexSource import IndexSource, index_source
+from ..common import CHUNK_SIZE, read_chunks
 from ..versions import AddonVersion
 
-
-class RateLimitedAdapter(requests.adapters.HTTPAdapter):
-    def __init__(self, *args, retries=5, wait=None, **kwargs):
-        self._last_send = None
-        self._wait_time = wait
-        max_retries = requests.adapters.Retry(
-            total=retries,
-            backoff_factor=wait or 10,
-            status_forcelist={429, },
-            allowed_methods=None,
-        )
-        kwargs.setdefault('max_retries', max_retries)
-        super().__init__(*args, **kwargs)
-
-    def send(self, *args, **kwargs):
-        if self._wait_time and self._last_send:
-            delta = time.time() - self._last_send
-            if delta < self._wait_time:
-                time.sleep(self._wait_time - delta)
-
-        self._last_send = time.time()
-        response = super().send(*args, **kwargs)
-        status_code = getattr(response, 'status_code', None)
-        if 300 <= status_code < 400:
-            self._last_send = None
-        return response
+LOGGER = logging.getLogger(__name__)
 
 
 class Repository():
-    # Recover from unreliable mirrors
-    _session = requests.Session()
-    _adapter = RateLimitedAdapter(retries=5, pool_maxsize=3, pool_block=True)
-    _session.mount('http://', _adapter)
-    _session.mount('https://', _adapter)
-    atexit.register(_session.close)
-
-    def __init__(self, version, path):
+    def __init__(self, version, path, cache=None):
+        """
+        Load the add-ons of a branch index.
+        :param version: the branch name
+        :param path: an IndexSource, or the url or local path of the index
+        :param cache: optional RepositoryCache, when path is not an IndexSource
+        """
         super().__init__()
+        source = path if isinstance(path, IndexSource) else index_source(path, cache)
         self.version = version
-        self.path = path
+        self.path = source.location(version)
+        # a branch whose index cannot be loaded is an empty repository
+        self.addons = []
+        # multiple copies of the same addon might exist on the repository, however
+        # kodi always uses the highest version available, keep them ordered highest first
+        self._index = {}
+        # dependency id -> add-ons depending on it, in repository order
+        self._rdepends = {}
 
         try:
-            response = self._session.get(path, timeout=(30, 30))
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
+            payload_path = source.payload_path(version)
+            if payload_path is not None:
+                addons = source.cache.load_snapshot(payload_path) if source.cache else None
+                if addons is None:
+                    addons = self._parse(read_chunks(payload_path))
+                    if source.cache:
+                        source.cache.store_snapshot(payload_path, addons)
+            else:
+                with source.open(version) as chunks:
+                    addons = self._parse(chunks)
+        except (OSError, requests.exceptions.RequestException) as error:
+            LOGGER.warning("Could not load repository index %s: %s", self.path, error)
             return
-        content = response.content
-
-        if path.endswith('.gz'):
-            with gzip.open(BytesIO(content), 'rb') as xml_file:
-                content = xml_file.read()
 
-        self.addons = []
-        tree = ET.fromstring(content)
-        for addon in tree.findall("addon"):
-            self.addons.append(Addon(addon))
+        self.addons = addons
+        for addon in self.addons:
+            self._index.setdefault(addon.id, []).append(addon)
+            for dependency_id in {dependency.id for dependency in addon.dependencies}:
+                self._rdepends.setdefault(dependency_id, []).append(addon)
+        for addon_instances in self._index.values():
+            if len(addon_instances) > 1:
+                addon_instances.sort(key=lambda addon: AddonVersion(addon.version), reverse=True)
+
+    def _parse(self, chunks):
+        """Incrementally decompress and parse the addons.xml payload, only a single
+        <addon> element is kept in memory at a time
+
+        :chunks: iterable of raw payload chunks
+        """
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if self.path.endswith('.gz') else None
+        parser = ET.XMLPullParser(events=("start", "end"))
+        addons = []
+        depth = 0
+        root = None
+
+        def read_events():
+            nonlocal depth, root
+            for event, element in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = element
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth == 1:
+                    if element.tag == "addon":
+                        addons.append(Addon(element))
+                    # drop the parsed add-on from the tree
+                    root.clear()
+
+        for chunk in chunks:
+            if decompressor is None:
+                parser.feed(chunk)
+                read_events()
+                continue
+            # bound the decompressed size of every step, addons.xml compresses very well
+            while chunk:
+                parser.feed(decompressor.decompress(chunk, CHUNK_SIZE))
+                read_events()
+                chunk = decompressor.unconsumed_tail
+
+        if decompressor is not None:
+            parser.feed(decompressor.flush())
+            if not decompressor.eof:
+                raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        parser.close()
+        read_events()
+        return addons
 
     def __contains__(self, addonId):
-        for addon in self.addons:
-            if addon.id == addonId:
-                return True
-        return False
+        return addonId in self._index
 
     def find(self, addonId):
-        # multiple copies of the same addon might exist on the repository, however
-        # kodi always uses the highest version available
-        addon_instances = []
-        for addon in self.addons:
-            if addon.id == addonId:
-                addon_instances.append(addon)
-
+        # always return the highest version for the given addon id available in the repo
+        addon_instances = self._index.get(addonId)
         if not addon_instances:
             return None
-
-        # always return the highest version for the given addon id available in the repo
-        addon_instances.sort(key=lambda addon: AddonVersion(addon.version), reverse=True)
         return addon_instances[0]
 
+    def find_all(self, addonId):
+        """Return all the instances of the given addon id, highest version first"""
+        return list(self._index.get(addonId, ()))
+
     def rdepends(self, addonId):
-        rdepends = []
-        for addon in self.addons:
-            if addon.dependsOn(addonId):
-                rdepends.append(addon)
-        return rdepends
+        return list(self._rdepends.get(addonId, ()))
@@ -0,0 +1,116 @@
+"""
+    Copyright (C) 2018 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+import requests
+
+from . import RepositorySnapshot
+from ..common import CHUNK_SIZE, file_sha256, write_atomic
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RepositoryCache():
+    def __init__(self, directory, max_age=3600):
+        """
+        Create an on-disk cache for raw repository index payloads (e.g. addons.xml.gz).
+        :param directory: the directory where the payloads and their HTTP metadata are stored
+        :param max_age: number of seconds a cached payload is served without revalidation
+        """
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, session, url, timeout=None):
+        """
+        Return the path of the cached payload for the given url, revalidating the cached
+        copy with a conditional GET once it is older than max_age. The stale copy is
+        returned if the mirror cannot be reached.
+        :param session: the requests session used for downloading
+        :param url: the url of the repository index
+        :param timeout: timeout passed to requests
+        :return: path of the raw payload
+        :raises requests.exceptions.RequestException: if the download fails and nothing is cached
+        """
+        payload_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path, payload_path)
+
+        if meta and time.time() - meta.get("fetched", 0) < self.max_age:
+            return payload_path
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                if response.status_code == 304 and meta:
+                    meta["fetched"] = time.time()
+                    write_atomic(meta_path, [json.dumps(meta).encode("utf-8")])
+                    return payload_path
+                response.raise_for_status()
+                write_atomic(payload_path, response.iter_content(CHUNK_SIZE))
+        except requests.exceptions.RequestException as error:
+            if not meta:
+                raise
+            LOGGER.warning("Could not revalidate %s, using cached copy: %s", url, error)
+            return payload_path
+
+        write_atomic(meta_path, [json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }).encode("utf-8")])
+        return payload_path
+
+    def load_snapshot(self, payload_path):
+        """
+        Return the add-ons stored in the snapshot of the given payload.
+        :param payload_path: path returned by fetch() or of a local index
+        :return: list of Addon objects or None if there is no valid snapshot
+        """
+        return RepositorySnapshot.load(self._snapshot_path(payload_path), file_sha256(payload_path).digest())
+
+    def store_snapshot(self, payload_path, addons):
+        """
+        Store a snapshot of the add-ons parsed from the given payload.
+        :param payload_path: path returned by fetch() or of a local index
+        :param addons: list of Addon objects parsed from the payload
+        """
+        try:
+            data = RepositorySnapshot.dumps(addons, file_sha256(payload_path).digest())
+            write_atomic(self._snapshot_path(payload_path), [data])
+        except OSError as error:
+            LOGGER.warning("Could not store repository snapshot: %s", error)
+
+    def _snapshot_path(self, payload_path):
+        # local indexes may live in read-only mirrors, snapshots are always kept in the cache
+        key = hashlib.sha256(os.path.abspath(payload_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".snapshot")
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key), os.path.join(self.directory, key + ".json")
+
+    @staticmethod
+    def _read_meta(meta_path, payload_path):
+        if not os.path.isfile(payload_path):
+            return {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,70 @@
+"""
+    Copyright (C) 2018 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from .IndexSource import IndexSource, index_source
+from .Repository import Repository
+from .. import ValidKodiVersions
+
+
+class RepositoryCatalog(Mapping):
+    def __init__(self, source, branches=None, cache=None):
+        """
+        Read-only mapping of branch name to Repository, a branch index is only
+        loaded the first time its Repository is accessed.
+        :param source: IndexSource of the branch indexes, or their url/path with a {branch} placeholder
+        :param branches: branches in scope, defaults to all ValidKodiVersions
+        :param cache: optional RepositoryCache, when source is not an IndexSource
+        """
+        self.source = source if isinstance(source, IndexSource) else index_source(source, cache)
+        self.branches = [branch for branch in ValidKodiVersions if branches is None or branch in branches]
+        self._repositories = {}
+
+    def __getitem__(self, branch):
+        if branch not in self.branches:
+            raise KeyError(branch)
+        if branch not in self._repositories:
+            self._repositories[branch] = self._load(branch)
+        return self._repositories[branch]
+
+    def __iter__(self):
+        return iter(self.branches)
+
+    def __len__(self):
+        return len(self.branches)
+
+    def items(self):
+        self.prefetch()
+        return super().items()
+
+    def values(self):
+        self.prefetch()
+        return super().values()
+
+    def prefetch(self, branches=None):
+        """
+        Concurrently load all given branches that were not accessed yet.
+        :param branches: branches to load, defaults to all branches in scope
+        """
+        missing = [branch for branch in (branches or self.branches)
+                   if branch in self.branches and branch not in self._repositories]
+        if not missing:
+            return
+
+        # the branches are loaded concurrently, the pool size matches the
+        # connection pool of the source so the mirror is not flooded
+        with ThreadPoolExecutor(max_workers=self.source.concurrency) as executor:
+            futures = {branch: executor.submit(self._load, branch) for branch in missing}
+
+        for branch, future in futures.items():
+            self._repositories[branch] = future.result()
+
+    def _load(self, branch):
+        return Repository(branch, self.source)
@@ -0,0 +1,155 @@
+"""
+    Copyright (C) 2018 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+
+    Compact binary snapshot of the add-ons parsed from a repository index.
+
+    Layout (little endian):
+        header      magic, format version, length of the checker version, sha256 of the payload
+        checker version (utf-8)
+        counts      string table size, dependencies, dependency references, dependency tuples, add-ons
+        strings     NUL separated utf-8 string table
+        deps        (id, version, optional) string indexes per dependency
+        refs        dependency indexes, referenced by the tuples
+        tuples      (start, count) into refs per dependency tuple
+        addons      (id, version, tuple) per add-on
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from .Addon import Addon
+from .AddonDependency import AddonDependency
+from .. import __version__
+
+MAGIC = b"KACS"
+FORMAT_VERSION = 1
+NONE = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHH32s")
+_COUNTS = struct.Struct("<IIIII")
+
+
+def dumps(addons: list, digest: bytes):
+    """Serialize the given add-ons
+        :addons: list of Addon objects, as parsed from the payload
+        :digest: sha256 digest of the payload the add-ons were parsed from
+    """
+    strings, dep_table, refs, tuple_table, addon_table = _pack_tables(addons)
+    blob = "\0".join(strings).encode("utf-8")
+    checker_version = __version__.encode("utf-8")
+    return b"".join((_HEADER.pack(MAGIC, FORMAT_VERSION, len(checker_version), digest), checker_version,
+                     _COUNTS.pack(len(blob), len(dep_table) // 3, len(refs), len(tuple_table) // 2,
+                                  len(addon_table) // 3), blob,
+                     _table_bytes(dep_table), _table_bytes(refs), _table_bytes(tuple_table),
+                     _table_bytes(addon_table)))
+
+
+def _pack_tables(addons):
+    """Build the string table and the dependency, reference, tuple and add-on tables of the add-ons"""
+    strings = {}
+    deps = {}
+    tuples = {}
+    refs = array("I")
+    dep_table = array("I")
+    tuple_table = array("I")
+    addon_table = array("I")
+
+    def string(value):
+        if value is None or value is False:
+            return NONE
+        return strings.setdefault(value, len(strings))
+
+    for addon in addons:
+        tuple_index = tuples.get(addon.dependencies)
+        if tuple_index is None:
+            tuple_table.extend((len(refs), len(addon.dependencies)))
+            for dependency in addon.dependencies:
+                dep_index = deps.get(dependency)
+                if dep_index is None:
+                    dep_index = deps[dependency] = len(deps)
+                    version = repr(dependency.version) if dependency.version is not None else None
+                    dep_table.extend((string(dependency.id), string(version), string(dependency.optional)))
+                refs.append(dep_index)
+            tuple_index = tuples[addon.dependencies] = len(tuples)
+        addon_table.extend((string(addon.id), string(addon.version), tuple_index))
+    return strings, dep_table, refs, tuple_table, addon_table
+
+
+def _table_bytes(table):
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table.tobytes()
+
+
+def load(path: str, digest: bytes):
+    """Load the add-ons from a snapshot file
+        :path: path of the snapshot
+        :digest: sha256 digest of the current payload
+        :return: list of Addon objects or None if the snapshot is missing or stale
+    """
+    try:
+        with open(path, "rb") as snapshot_file, \
+             mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                return _load(view, digest)
+            finally:
+                view.release()
+    except (OSError, ValueError, struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+
+def _load(data, digest):
+    offset = _read_header(data, digest)
+    if offset is None:
+        return None
+
+    blob_size, dep_count, ref_count, tuple_count, addon_count = _COUNTS.unpack_from(data, offset)
+    offset += _COUNTS.size
+    strings = bytes(data[offset:offset + blob_size]).decode("utf-8").split("\0")
+    offset += blob_size
+    dep_table, offset = _read_table(data, offset, dep_count * 3)
+    refs, offset = _read_table(data, offset, ref_count)
+    tuple_table, offset = _read_table(data, offset, tuple_count * 2)
+    addon_table, offset = _read_table(data, offset, addon_count * 3)
+    return _unpack_addons(strings, dep_table, refs, tuple_table, addon_table)
+
+
+def _read_header(data, digest):
+    """Return the offset of the counts, None if the snapshot is not the one of the payload and checker version"""
+    magic, format_version, version_length, snapshot_digest = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    checker_version = bytes(data[offset:offset + version_length]).decode("utf-8")
+    if magic != MAGIC or format_version != FORMAT_VERSION or snapshot_digest != digest \
+            or checker_version != __version__:
+        return None
+    return offset + version_length
+
+
+def _read_table(data, offset, size):
+    """Return the table of the given number of items at the offset, and the offset following it"""
+    table = array("I")
+    table.frombytes(data[offset:offset + size * table.itemsize])
+    if sys.byteorder == "big":
+        table.byteswap()
+    return table, offset + size * table.itemsize
+
+
+def _unpack_addons(strings, dep_table, refs, tuple_table, addon_table):
+    def string(index, default=None):
+        return strings[index] if index != NONE else default
+
+    deps = [AddonDependency.from_values(string(dep_table[i]), string(dep_table[i + 1]),
+                                        string(dep_table[i + 2], False))
+            for i in range(0, len(dep_table), 3)]
+    dependency_tuples = [tuple(deps[ref] for ref in refs[start:start + count])
+                         for start, count in zip(tuple_table[::2], tuple_table[1::2])]
+    return [Addon.from_values(strings[addon_table[i]], string(addon_table[i + 1]),
+                              dependency_tuples[addon_table[i + 2]])
+            for i in range(0, len(addon_table), 3)]
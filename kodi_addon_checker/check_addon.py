@@ -8,17 +8,20 @@
 
 import logging
 import os
+import subprocess
 import xml.etree.ElementTree as ET
 
 from . import (check_allowed_versions, check_artwork, check_dependencies,
                check_entrypoint, check_files, check_addon_branches,
                check_string, check_url, common,
-               handle_files, schema_validation, ValidKodiVersions)
+               handle_files, schema_validation)
 from .addons.Addon import Addon
-from .addons.Repository import Repository
+from .addons.IndexSource import HttpIndexSource, parse_repo_index
+from .addons.RepositoryCatalog import RepositoryCatalog
 from .versions import KodiVersion
 from .record import INFORMATION, PROBLEM, Record
 from .report import Report
+from .runner import FileCheckRunner
 
 ROOT_URL = "http://mirrors.kodi.tv/addons/{branch}/addons.xml.gz"
 LOGGER = logging.getLogger(__name__)
@@ -38,7 +41,6 @@ def start(addon_path, args, all_repo_addons, config=None):
     LOGGER.info("Checking add-on %s", addon_id)
     addon_report.add(Record(INFORMATION, f"Checking add-on {addon_id}"))
 
-    repo_addons = all_repo_addons[args.branch]
     addon_xml_path = os.path.join(addon_path, "addon.xml")
     try:
         parsed_xml = ET.parse(addon_xml_path).getroot()
@@ -61,24 +63,29 @@ def start(addon_path, args, all_repo_addons, config=None):
         if not addon_xml.findall("*//broken") and \
            not (addon_xml.findall("*//lifecyclestate") and \
                 addon_xml.find("*//lifecyclestate").attrib.get("type") == "broken"):
-            file_index = handle_files.create_file_index(addon_path)
+            file_index = handle_files.FileIndex(addon_path)
+            if getattr(args, "changed_since", None):
+                file_index = _changed_files_index(addon_report, file_index, args.changed_since)
+            runner = FileCheckRunner(getattr(args, "jobs", 1))
 
             schema_validation.schemas(addon_report, parsed_xml, args.branch)
 
             check_url.check_url(addon_report, parsed_xml)
 
             if not args.skip_dependency_checks:
-                check_dependencies.check_addon_dependencies(addon_report, repo_addons, parsed_xml, args)
+                check_dependencies.check_addon_dependencies(addon_report, all_repo_addons[args.branch],
+                                                            parsed_xml, args)
 
             check_dependencies.check_reverse_dependencies(addon_report, addon_id, args.branch, all_repo_addons)
 
             check_files.check_file_permission(addon_report, file_index)
 
-            check_files.check_for_invalid_xml_files(addon_report, file_index)
+            check_files.check_for_invalid_xml_files(addon_report, file_index, runner)
 
-            check_files.check_for_invalid_json_files(addon_report, file_index)
+            check_files.check_for_invalid_json_files(addon_report, file_index, runner)
 
-            check_artwork.check_artwork(addon_report, addon_path, parsed_xml, file_index, KodiVersion(args.branch))
+            check_artwork.check_artwork(addon_report, addon_path, parsed_xml, file_index,
+                                        _artwork_options(args, config, runner))
 
             max_entrypoint_count = config.configs.get(
                 "max_entrypoint_count", 15)
@@ -90,22 +97,23 @@ def start(addon_path, args, all_repo_addons, config=None):
                 handle_files.addon_file_exists(addon_report, addon_path,
                                                r"^LICENSE\.txt|LICENSE\.md|LICENSE$")
 
-            check_string.check_for_legacy_strings_xml(addon_report, addon_path)
+            check_string.check_for_legacy_strings_xml(addon_report, file_index)
 
             if KodiVersion(args.branch) >= KodiVersion("isengard"):
-                check_files.check_for_new_language_directory_structure(addon_report, addon_path)
+                check_files.check_for_new_language_directory_structure(addon_report, file_index)
             else:
-                check_files.check_for_new_language_directory_structure(addon_report, addon_path, supported=False)
+                check_files.check_for_new_language_directory_structure(addon_report, file_index, supported=False)
 
             is_language_addon = False
             if (extension := parsed_xml.find('extension')) and extension.get('point') == 'kodi.resource.language':
                 is_language_addon = True
 
-            check_string.check_for_invalid_strings_po(addon_report, file_index, is_language_addon)
+            check_string.check_for_invalid_strings_po(addon_report, file_index, is_language_addon, runner,
+                                                      getattr(args, "deep_po_validation", False))
 
             # Kodi 18 Leia + deprecations
             if config.is_enabled("check_kodi_leia_deprecations"):
-                check_string.find_blacklisted_strings(addon_report, addon_path,
+                check_string.find_blacklisted_strings(addon_report, file_index,
                                                       ["System.HasModalDialog", "StringCompare", "SubString",
                                                        "IntegerGreaterThan", "ListItem.ChannelNumber",
                                                        "ListItem.SubChannelNumber", "MusicPlayer.ChannelNumber",
@@ -114,7 +122,7 @@ def start(addon_path, args, all_repo_addons, config=None):
                                                       [], [".py", ".xml"])
 
             # General blacklist
-            check_string.find_blacklisted_strings(addon_report, addon_path, [], [], [])
+            check_string.find_blacklisted_strings(addon_report, file_index, [], [], [])
 
             check_files.check_file_whitelist(addon_report, file_index, addon_path)
         else:
@@ -124,15 +132,58 @@ def start(addon_path, args, all_repo_addons, config=None):
     return addon_report
 
 
-def get_all_repo_addons():
-    """Returns a nested dictionary of format:
-        {'gotham':{'name_of_addon':'version_of_addon'}}
+def _artwork_options(args, config, runner: FileCheckRunner):
+    """ArtworkOptions of the given command line arguments and add-on configuration
+
+       :args: argparse object
+       :config: Config of the add-on
+       :runner: FileCheckRunner of the per-file checks
+    """
+    verify_timeout = getattr(args, "image_timeout", 10) if getattr(args, "verify_images", False) else None
+    return check_artwork.ArtworkOptions(KodiVersion(args.branch), runner, verify_timeout, _image_budget(config))
+
+
+def _image_budget(config):
+    """ImageBudget of the images that may be decoded, the default limits replaced by the configured ones
+       :config: Config of the add-on
     """
+    budget = check_artwork.DEFAULT_IMAGE_BUDGET
+    if config["max_image_pixels"] is not None:
+        budget = budget._replace(max_pixels=config["max_image_pixels"])
+    if config["max_image_file_size"] is not None:
+        budget = budget._replace(max_file_size=config["max_image_file_size"])
+    return budget
 
-    repo_addons = {}
 
-    for branch in ValidKodiVersions:
-        branch_url = ROOT_URL.format(branch=branch)
-        repo_addons[branch] = Repository(branch, branch_url)
+def _changed_files_index(report: Report, file_index, ref: str):
+    """Restrict the per-file checks to the files changed since the given git revision,
+       all files are checked if git cannot tell which files changed
 
-    return repo_addons
+       :file_index: FileIndex of the add-on
+       :ref: git revision, e.g. the base branch of a pull request
+    """
+    try:
+        changed = handle_files.changed_files(file_index.root, ref)
+    except (OSError, subprocess.CalledProcessError) as error:
+        stderr = getattr(error, "stderr", None)
+        LOGGER.warning("Could not list the files changed since %s, checking all files: %s",
+                       ref, stderr.decode(errors="replace").strip() if stderr else error)
+        report.add(Record(INFORMATION, f"Could not list the files changed since {ref}, checking all files"))
+        return file_index
+
+    file_index = file_index.restricted_to(changed)
+    report.add(Record(INFORMATION, f"Checking {len(file_index)} files changed since {ref}"))
+    return file_index
+
+
+def get_all_repo_addons(cache=None, branches=None, repo_index=None):
+    """Returns a mapping of branch name to Repository, e.g.
+        {'gotham': <Repository>, ...}
+       A branch index is only loaded the first time it is accessed.
+
+       :cache: optional RepositoryCache used to store and revalidate the downloaded indexes
+       :branches: branches to include, defaults to all ValidKodiVersions
+       :repo_index: optional list of --repo-index locations replacing ROOT_URL
+    """
+    source = parse_repo_index(repo_index, HttpIndexSource(ROOT_URL, cache))
+    return RepositoryCatalog(source, branches)
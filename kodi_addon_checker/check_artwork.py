@@ -8,26 +8,45 @@
 
 import logging
 import os
-import re
+import warnings
 
 from collections import namedtuple
 from PIL import Image
 
+from . import image_probe
 from .common import has_transparency, relative_path
+from .handle_files import FileIndex, as_file_index
 from .record import INFORMATION, PROBLEM, WARNING, Record
 from .report import Report
+from .runner import CheckTimeout, FileCheckRunner, time_limit
 from .versions import KodiVersion
 
 
 LOGGER = logging.getLogger(__name__)
 
+# images with more pixels or larger files (KB) are not decoded, 0 or None disables a limit
+ImageBudget = namedtuple("ImageBudget", ["max_pixels", "max_file_size"])
+DEFAULT_IMAGE_BUDGET = ImageBudget(50000000, 20 * 1024)
 
-def check_artwork(report: Report, addon_path: str, parsed_xml, file_index: list, kodi_version: KodiVersion):
+# kodi_version: KodiVersion of the branch, runner: FileCheckRunner used to open the other images, serially if None,
+# verify_timeout: seconds each image may take to be fully decoded, None to not decode the images,
+# budget: ImageBudget of the images that may be decoded, DEFAULT_IMAGE_BUDGET if None
+ArtworkOptions = namedtuple("ArtworkOptions", ["kodi_version", "runner", "verify_timeout", "budget"],
+                            defaults=(None, None, None))
+
+
+def check_artwork(report: Report, addon_path: str, parsed_xml, file_index: FileIndex, options: ArtworkOptions):
     """Checks for icon/fanart/screenshot
         :addon_path: path to the folder having addon files
         :parsed_xml: xml file i.e addon.xml
-        :file_index: list having name and path of all the files in an addon
+        :file_index: FileIndex of the addon
+        :options: ArtworkOptions, or the KodiVersion of the branch to check with the default options
     """
+    if isinstance(options, KodiVersion):
+        options = ArtworkOptions(options)
+    options = options._replace(runner=options.runner or FileCheckRunner(),
+                               budget=options.budget or DEFAULT_IMAGE_BUDGET)
+    kodi_version = options.kodi_version
     Asset = namedtuple('Asset', ['image_type', 'specifications'])
 
     art_assets = [
@@ -82,39 +101,144 @@ def check_artwork(report: Report, addon_path: str, parsed_xml, file_index: list,
         )
     ]
 
+    checked = set()
     for asset in art_assets:
-        _check_image_type(report, asset, parsed_xml, addon_path, kodi_version)
+        checked.update(_check_image_type(report, asset, parsed_xml, addon_path, options))
+
+    # the extensions are case sensitive here, fanart.jpg, icon.png and the other assets were opened by
+    # _check_image_type
+    file_index = as_file_index(file_index)
+    all_images = [file.full_path for file in file_index.with_extension(".png", ".jpg", ".jpeg", ".gif")
+                  if file.name.endswith(file.ext)]
+    images = [image for image in all_images if os.path.normpath(image) not in checked
+              and not os.path.basename(image).startswith(("fanart.jpg", "icon.png"))]
+    budget_id = f"{options.budget.max_pixels}:{options.budget.max_file_size}"
+    options.runner.run(report, _check_image_file, [(image, options.budget) for image in images], images,
+                       check_id=f"{__name__}._check_image_file:{budget_id}")
+
+    if options.verify_timeout is not None:
+        options.runner.run(report, _verify_image_file,
+                           [(image, options.verify_timeout, options.budget) for image in all_images], all_images,
+                           check_id=f"{__name__}._verify_image_file:{options.verify_timeout:g}:{budget_id}")
+
+
+def _image_budget(image_path: str, headers, budget: ImageBudget):
+    """Check the file size and the dimensions in the headers of an image against the budget, without decoding it
+
+        :image_path: path of the image
+        :headers: ImageInfo read by image_probe.probe_headers(), None to read the dimensions with PIL
+        :budget: ImageBudget of the images that may be decoded
+        :return: the problem if the image is over the budget, None otherwise
+        :raises OSError: if the file cannot be read
+    """
+    file_size = os.path.getsize(image_path)
+    if budget.max_file_size and file_size > budget.max_file_size * 1024:
+        return (f"Image file is too large to be decoded, it has {file_size // 1024} KB and the limit is "
+                f"{budget.max_file_size} KB. {relative_path(image_path)}")
+
+    if headers is not None:
+        size = headers.size
+    else:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(image_path) as im:
+                    size = im.size
+        except Image.DecompressionBombError:
+            return _refused_by_pil(image_path)
+        except IOError:
+            # reported by the image checks
+            return None
+    if budget.max_pixels and size[0] * size[1] > budget.max_pixels:
+        return (f"Image has too many pixels to be decoded, it has {size[0]}x{size[1]} pixels and the limit is "
+                f"{budget.max_pixels} pixels. {relative_path(image_path)}")
+    return None
+
+
+def _refused_by_pil(image_path: str):
+    """Problem of an image PIL refuses to open, it is larger than Image.MAX_IMAGE_PIXELS allows"""
+    return f"Image has too many pixels to be decoded, PIL refuses to open it. {relative_path(image_path)}"
 
-    for file in file_index:
-        if re.match(r"(?!fanart\.jpg|icon\.png).*\.(png|jpg|jpeg|gif)$", file["name"]) is not None:
-            image_path = os.path.join(file["path"], file["name"])
-            try:
-                Image.open(image_path)
-            except IOError:
-                report.add(
-                    Record(PROBLEM, f"Could not open image, is the file corrupted ? {relative_path(image_path)}"))
 
+def _check_image_file(report: Report, image_path: str, budget: ImageBudget):
+    """Check whether the given image can be opened, PIL is only used if the headers cannot be probed"""
+    try:
+        headers = image_probe.probe_headers(image_path)
+        problem = _image_budget(image_path, headers, budget)
+        if problem:
+            report.add(Record(PROBLEM, problem))
+            return
+        if image_probe.accepted(headers) is None:
+            Image.open(image_path)
+    except Image.DecompressionBombError:
+        report.add(Record(PROBLEM, _refused_by_pil(image_path)))
+    except IOError:
+        report.add(
+            Record(PROBLEM, f"Could not open image, is the file corrupted ? {relative_path(image_path)}"))
 
-def _check_image_type(report: Report, asset: tuple, parsed_xml, addon_path: str, kodi_version: KodiVersion):
-    """Check for whether the given image type exists or not if they do """
+
+def _verify_image_file(report: Report, image_path: str, timeout: float, budget: ImageBudget):
+    """Decode the whole image to find corrupted or truncated image data, opening the image only reads its headers
+
+        :image_path: path of the image
+        :timeout: seconds the image may take to be decoded
+        :budget: ImageBudget of the images that may be decoded
+    """
+    try:
+        if _image_budget(image_path, image_probe.probe_headers(image_path), budget):
+            return
+        Image.open(image_path).close()
+    except (IOError, Image.DecompressionBombError):
+        # reported by the other image checks
+        return
+    try:
+        with time_limit(timeout):
+            # verify() checks the chunk checksums of png images, the image has to be opened again to load it
+            with Image.open(image_path) as im:
+                im.verify()
+            with Image.open(image_path) as im:
+                im.load()
+    except CheckTimeout as error:
+        report.add(Record(WARNING, f"Image could not be verified, decoding it {error}. {relative_path(image_path)}"))
+    except (IOError, SyntaxError, ValueError, EOFError) as error:
+        report.add(Record(PROBLEM, f"Image data is corrupted, it could not be decoded. {relative_path(image_path)} "
+                                   f"({error})"))
+
+
+def _check_image_type(report: Report, asset: tuple, parsed_xml, addon_path: str, options: ArtworkOptions):
+    """Check for whether the given image type exists or not if they do
+
+        :options: ArtworkOptions with the budget set
+        :return: normalized paths of the existing images
+    """
 
     fallback, images = _assets(asset.image_type, parsed_xml, addon_path)
+    checked = []
 
     for image in images:
         if image:
             filepath = os.path.join(addon_path, image)
 
             if os.path.isfile(filepath):
+                checked.append(os.path.normpath(filepath))
                 report.add(Record(INFORMATION, f"Image {asset.image_type} exists"))
-                if fallback and kodi_version >= KodiVersion("krypton"):
+                if fallback and options.kodi_version >= KodiVersion("krypton"):
                     report.add(Record(
                         PROBLEM, f"Image {asset.image_type} should be explicitly declared in addon.xml <assets>."))
                 try:
-                    im = Image.open(filepath)
+                    headers = image_probe.probe_headers(filepath)
+                    problem = _image_budget(filepath, headers, options.budget)
+                    if problem:
+                        report.add(Record(PROBLEM, problem))
+                        continue
+                    info = image_probe.accepted(headers)
+                    if info is None:
+                        with Image.open(filepath) as im:
+                            info = image_probe.from_image(im)
                     # check image specifications
-                    _check_art_asset_specifications(report, filepath, im, asset)
-                    # close handler
-                    im.close()
+                    _check_art_asset_specifications(report, filepath, info, asset)
+                except Image.DecompressionBombError:
+                    report.add(Record(PROBLEM, _refused_by_pil(filepath)))
                 except IOError:
                     report.add(
                         Record(PROBLEM, f"Could not open image, is the file corrupted? {relative_path(filepath)}"))
@@ -132,6 +256,7 @@ def _check_image_type(report: Report, asset: tuple, parsed_xml, addon_path: str,
         else:
             report.add(
                 Record(WARNING, f"Empty image tag found for {asset.image_type}"))
+    return checked
 
 
 def _assets(image_type: str, parsed_xml, addon_path: str):
@@ -155,15 +280,15 @@ def _assets(image_type: str, parsed_xml, addon_path: str):
     return fallback, images
 
 
-def _check_art_asset_specifications(report: Report, filepath, im, asset):
+def _check_art_asset_specifications(report: Report, filepath, info, asset):
     """Check the art asset specifications (dimensions, transparency, extension)
 
         :filepath: file path of the image
-        :im: PIL.Image object
+        :info: ImageInfo of the image
         :asset: Asset namedtuple
     """
     _, fileextension = os.path.splitext(filepath)
-    width, height = im.size
+    width, height = info.size
     max_file_size_kb = asset.specifications.get('max_file_size')
 
     # extension check
@@ -173,9 +298,10 @@ def _check_art_asset_specifications(report: Report, filepath, im, asset):
 
     # transparency check
     if asset.specifications['transparency'] is not None:
-        if has_transparency(im) and not asset.specifications['transparency']:
+        transparent = _has_transparency(filepath, info)
+        if transparent and not asset.specifications['transparency']:
             report.add(Record(PROBLEM, f"{asset.image_type} should be solid. It has transparency."))
-        elif not has_transparency(im) and asset.specifications['transparency']:
+        elif not transparent and asset.specifications['transparency']:
             report.add(Record(PROBLEM, f"{asset.image_type} should have transparency. It is solid."))
 
     # dimensions check
@@ -205,3 +331,15 @@ def _check_art_asset_specifications(report: Report, filepath, im, asset):
             else:
                 report.add(Record(PROBLEM, f"{asset.image_type} is too large {file_size_kb}KB, "
                                            f"maximum file size of {str(max_file_size_kb)}KB."))
+
+
+def _has_transparency(filepath, info):
+    """Check the transparency of an image, it is only decoded if it has an alpha band or a transparent color
+
+        :filepath: file path of the image
+        :info: ImageInfo of the image
+    """
+    if info.mode not in ("RGBA", "LA", "PA") and not info.transparency:
+        return False
+    with Image.open(filepath) as im:
+        return has_transparency(im)
@@ -205,15 +205,13 @@ def check_reverse_dependencies(report: Report, addon: str, branch_name: str, all
                         about all the repo addonst
     """
     addonInRepo = None
-    rdepends = []
-    rdependsLowerBranch = []
+    rdepends = set()
+    rdependsLowerBranch = set()
     branchFound = False
 
     for branch, repo in sorted(all_repo_addons.items()):
         if not branchFound and branch != branch_name:
-            for rdepend in repo.rdepends(addon):
-                if rdepend not in rdependsLowerBranch:
-                    rdependsLowerBranch.append(rdepend)
+            rdependsLowerBranch.update(repo.rdepends(addon))
             continue
         branchFound = True
 
@@ -223,9 +221,9 @@ def check_reverse_dependencies(report: Report, addon: str, branch_name: str, all
 
         addonInRepo = addonFind
 
-        for rdepend in repo.rdepends(addon):
-            if rdepend not in rdependsLowerBranch and rdepend not in rdepends:
-                rdepends.append(rdepend)
+        rdepends.update(repo.rdepends(addon))
+    rdepends -= rdependsLowerBranch
+
     if addon.startswith("script.module.") and len(rdepends) + len(rdependsLowerBranch) == 0:
         report.add(Record(WARNING, "This module isn't required by any add-on."))
 
@@ -246,13 +244,15 @@ def _get_ignore_list(kodi_version: KodiVersion):
        on the branch name
     """
 
+    ignore = set(common_ignore_deps)
+
     if kodi_version >= KodiVersion("leia"):
-        common_ignore_deps.extend(["script.module.pycryptodome"])
+        ignore.update(["script.module.pycryptodome"])
 
     if kodi_version == KodiVersion("krypton"):
-        common_ignore_deps.extend(["inputstream.adaptive", "inputstream.rtmp"])
+        ignore.update(["inputstream.adaptive", "inputstream.rtmp"])
 
-    return common_ignore_deps
+    return ignore
 
 
 def _check_extensions(report: Report, parsed_xml, addon):
@@ -6,47 +6,66 @@
     See LICENSES/README.md for more information.
 """
 
-import json
 import os
 import re
+import stat
 import xml.etree.ElementTree as ET
 
-from . import handle_files
+from . import handle_files, well_formedness
 from .common import relative_path
 from .common.decorators import posix_only
+from .handle_files import FileIndex, as_file_index
 from .record import INFORMATION, PROBLEM, WARNING, Record
 from .report import Report
+from .runner import FileCheckRunner
 
+EXECUTABLE = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+WHITELIST = re.compile(
+    r"\.?(py|xml|gif|png|jpg|jpeg|md|txt|po|json|markdown|yml|"
+    r"rst|ini|flv|wav|mp4|html|css|lst|pkla|g|template|in|cfg|xsd|directory|"
+    r"help|list|mpeg|pls|info|ttf|xsp|theme|yaml|dict|crt|ico)?$",
+    re.IGNORECASE
+)
 
-def check_for_invalid_xml_files(report: Report, file_index: list):
+
+def check_for_invalid_xml_files(report: Report, file_index: FileIndex, runner: FileCheckRunner = None):
     """check if any xml file present in the addon is invalid or not
-        :file_index: A list having all the name and path of files in
-                        addons
+        :file_index: FileIndex of the addon
+        :runner: FileCheckRunner used to check the files, serially if None
     """
-    for file in file_index:
-        if os.path.splitext(file["name"])[1].lower() == ".xml":
-            xml_path = os.path.join(file["path"], file["name"])
-            try:
-                # Just try if we can successfully parse it
-                ET.parse(xml_path)
-            except ET.ParseError:
-                report.add(Record(PROBLEM, f"Invalid xml found. {relative_path(xml_path)}"))
+    runner = runner or FileCheckRunner()
+    files = [file.full_path for file in as_file_index(file_index).with_extension(".xml")]
+    runner.run(report, check_xml_file, [(file,) for file in files], files)
+
+
+def check_xml_file(report: Report, xml_path: str):
+    """check if the given xml file is invalid or not
+        :xml_path: path of the xml file
+    """
+    try:
+        well_formedness.check_xml(xml_path)
+    except well_formedness.MalformedError as error:
+        report.add(Record(PROBLEM, f"Invalid xml found. {relative_path(xml_path)} ({error})"))
 
 
-def check_for_invalid_json_files(report: Report, file_index: list):
+def check_for_invalid_json_files(report: Report, file_index: FileIndex, runner: FileCheckRunner = None):
     """ check if any json file present in the addon is invalid or not
-        :file_index: A list having all the name and path of files in
-                     addons
+        :file_index: FileIndex of the addon
+        :runner: FileCheckRunner used to check the files, serially if None
     """
-    for file in file_index:
-        if os.path.splitext(file["name"])[1].lower() == ".json":
-            path = os.path.join(file["path"], file["name"])
-            try:
-                # Just try if we can successfully parse it
-                with open(path, "r", encoding="utf8") as json_data:
-                    json.load(json_data)
-            except ValueError:
-                report.add(Record(PROBLEM, f"Invalid json found. {relative_path(path)}"))
+    runner = runner or FileCheckRunner()
+    files = [file.full_path for file in as_file_index(file_index).with_extension(".json")]
+    runner.run(report, check_json_file, [(file,) for file in files], files)
+
+
+def check_json_file(report: Report, path: str):
+    """ check if the given json file is invalid or not
+        :path: path of the json file
+    """
+    try:
+        well_formedness.check_json(path)
+    except ValueError as error:
+        report.add(Record(PROBLEM, f"Invalid json found. {relative_path(path)} ({error})"))
 
 
 def check_addon_xml(report: Report, addon_path: str, parsed_xml, folder_id_mismatch: bool):
@@ -86,63 +105,58 @@ def addon_xml_matches_folder(report: Report, addon_path: str, parsed_xml, folder
             report.add(Record(PROBLEM, "Addon id and folder name does not match."))
 
 
-def check_for_new_language_directory_structure(report: Report, addon_path: str, supported=True):
+def check_for_new_language_directory_structure(report: Report, file_index: FileIndex, supported=True):
     """Check whether the language directory structure is new or not
-        :addon_path: path to addon folder
+        :file_index: FileIndex of the addon folder
         :supported: if we should error out in case the new language format is not supported
         by the respective kodiversion
     """
-    language_path = os.path.join(addon_path, "resources", "language")
-    if os.path.exists(language_path):
-        dirs = next(os.walk(language_path))[1]
-        for directory in dirs:
-            if "resource.language." not in directory and supported:
-                report.add(Record(
-                    PROBLEM, "Using the old language directory structure in " \
-                    f"{os.path.join(language_path, directory)}, please move to the new one."))
-            elif "resource.language." in directory and not supported:
-                report.add(Record(
-                    PROBLEM, "Using the new language directory structure "\
-                            f"in {os.path.join(language_path, directory)} " \
-                             "for a Kodi version that does not support it. " \
-                             "Please use the old language file structure or move the addon to" \
-                             "an upper branch/kodi version."))
-
-
-def check_file_whitelist(report: Report, file_index: list, addon_path: str):
+    file_index = as_file_index(file_index)
+    language_path = os.path.join(file_index.root, "resources", "language")
+    for directory in file_index.subdirectories("resources", "language") or []:
+        if "resource.language." not in directory and supported:
+            report.add(Record(
+                PROBLEM, "Using the old language directory structure in " \
+                f"{os.path.join(language_path, directory)}, please move to the new one."))
+        elif "resource.language." in directory and not supported:
+            report.add(Record(
+                PROBLEM, "Using the new language directory structure "\
+                        f"in {os.path.join(language_path, directory)} " \
+                         "for a Kodi version that does not support it. " \
+                         "Please use the old language file structure or move the addon to" \
+                         "an upper branch/kodi version."))
+
+
+def check_file_whitelist(report: Report, file_index: FileIndex, addon_path: str):
     """check whether the files present in addon are in whitelist or not
         It ignores README.md and .gitignore file
-        :file_index: list having names and path of all the files present in addon
+        :file_index: FileIndex of the addon
         :addon_path: path to the addon folder
     """
     if ".module." in addon_path:
         report.add(Record(INFORMATION, "Module skipping whitelist"))
         return
 
-    whitelist = (
-        r"\.?(py|xml|gif|png|jpg|jpeg|md|txt|po|json|markdown|yml|"
-        r"rst|ini|flv|wav|mp4|html|css|lst|pkla|g|template|in|cfg|xsd|directory|"
-        r"help|list|mpeg|pls|info|ttf|xsp|theme|yaml|dict|crt|ico)?$"
-    )
+    file_index = as_file_index(file_index)
+    # the whitelist is matched once per extension instead of once per file
+    rejected = [ext for ext in file_index.extensions() if ext and WHITELIST.match(ext) is None]
+    # names starting with a dot have no extension, their ending is still checked (e.g. .gitignore)
+    rejected_names = [file.name for file in file_index.with_extension("")
+                      if "." in file.name and WHITELIST.match("." + file.name.rsplit(".")[-1]) is None]
 
-    for file in file_index:
-        file_parts = file["name"].rsplit(".")
-        if len(file_parts) > 1:
-            file_ending = "." + file_parts[len(file_parts) - 1]
-            if re.match(whitelist, file_ending, re.IGNORECASE) is None:
-                filename = relative_path(os.path.join(file['path'], file['name']))
-                report.add(Record(WARNING,
-                                  f"Found non whitelisted file ending in filename {filename}"))
+    for file in file_index.select(extensions=rejected, names=rejected_names):
+        filename = relative_path(file.full_path)
+        report.add(Record(WARNING,
+                          f"Found non whitelisted file ending in filename {filename}"))
 
 
 @posix_only
-def check_file_permission(report: Report, file_index: list):
+def check_file_permission(report: Report, file_index: FileIndex):
     """Check whether the files present in addon are marked executable
        or not
-        :file_index: list having names and path of all the files present in addon
+        :file_index: FileIndex of the addon folder
     """
 
-    for file in file_index:
-        file = os.path.join(file["path"], file["name"])
-        if os.path.isfile(file) and os.access(str(file), os.X_OK):
-            report.add(Record(PROBLEM, f"{relative_path(str(file))} is marked as stand-alone executable"))
+    for file in as_file_index(file_index):
+        if file.stat is not None and stat.S_ISREG(file.stat.st_mode) and file.stat.st_mode & EXECUTABLE:
+            report.add(Record(PROBLEM, f"{relative_path(file.full_path)} is marked as stand-alone executable"))
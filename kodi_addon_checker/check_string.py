@@ -11,51 +11,73 @@ import re
 
 import polib
 
-from . import handle_files
+from . import handle_files, po_validator
 from .common import relative_path
+from .handle_files import FileIndex, as_file_index
 from .record import INFORMATION, PROBLEM, WARNING, Record
 from .report import Report
+from .runner import FileCheckRunner
 
 RE_LANG_CODE = re.compile(r"^[a-z]{2,3}(?:_[a-zA-Z]{2}(?:@\S+)?)?$")
 
 
-def check_for_legacy_strings_xml(report: Report, addon_path: str):
+def check_for_legacy_strings_xml(report: Report, file_index: FileIndex):
     """Find for the string.xml file in addon which was used in old versions
-        :addon_path: path of the addon
+        :file_index: FileIndex of the addon
     """
-    for file in handle_files.find_files_recursive("strings.xml", os.path.join(addon_path, "resources", "language")):
+    for file in as_file_index(file_index).find_recursive("strings.xml", "resources", "language"):
         report.add(
             Record(PROBLEM, f"Found {relative_path(file)} please migrate to strings.po."))
 
 
-def find_blacklisted_strings(report: Report, addon_path: str, problems: list, warnings: list, file_types: list):
+def find_blacklisted_strings(report: Report, file_index: FileIndex, problems: list, warnings: list, file_types: list):
     """Find for any blacklisted strings in the addons files
-        :addon_path: Path of theh addon
+        :file_index: FileIndex of the addon
         :problems: List of all the strings that will cause problem being in an addon
         :warnings: List of all the strings that shouldn't be in addon
                         but doesn't cause any problem
         :file_type: List of the whitelisted files to look into
     """
-    for result in handle_files.find_in_file(addon_path, problems, file_types):
-        report.add(Record(PROBLEM, f"Found blacklisted term {result['term']} in file "\
-                     f"{result['searchfile']}:{result['linenumber']} ({result['line']})"))
+    terms = problems + warnings
+    if not terms:
+        return
 
-    for result in handle_files.find_in_file(addon_path, warnings, file_types):
-        report.add(Record(WARNING, f"Found blacklisted term {result['term']} in file "\
-                    f"{result['searchfile']}:{result['linenumber']} ({result['line']})"))
+    # all terms are matched in a single scan of every file, problems are reported before warnings
+    results = handle_files.scan_files(file_index, handle_files.TermScanner(terms), file_types)
+    for level, hits in ((PROBLEM, [result for result in results if result[0] < len(problems)]),
+                        (WARNING, [result for result in results if result[0] >= len(problems)])):
+        for index, file_path, linenumber, line in hits:
+            report.add(Record(level, f"Found blacklisted term {terms[index]} in file "\
+                                     f"{file_path}:{linenumber} ({line.strip()})"))
 
 
-def check_for_invalid_strings_po(report: Report, file_index: list, is_language_addon: bool = False):
+def check_for_invalid_strings_po(report: Report, file_index: FileIndex, is_language_addon: bool = False,
+                                 runner: FileCheckRunner = None, deep: bool = False):
     """Validate strings.po files
-        :file_index: list having names and path of all the files present in addon
+        :file_index: FileIndex of the addon, or list having names and path of all the files present in addon.
+                     Only the files of a restricted FileIndex are validated, the presence of the default
+                     language is checked for the whole add-on
+        :runner: FileCheckRunner used to parse the files, serially if None
+        :deep: also parse the files with polib
     """
     en_gb_present = False
     report_made = False
 
-    po_file_index = [f for f in file_index if f["name"] == "strings.po"]
-
-    for po_file in po_file_index:
-        success, language_code = parse_po_file(report, po_file.get("path"), po_file)
+    file_index = as_file_index(file_index)
+    checked_po_files = file_index.named("strings.po")
+    po_file_index = file_index.complete.named("strings.po")
+
+    runner = runner or FileCheckRunner()
+    results = runner.run(report, parse_po_file,
+                         [(po_file.get("path"), po_file, deep) for po_file in checked_po_files],
+                         [os.path.join(po_file["path"], po_file["name"]) for po_file in checked_po_files],
+                         check_id=f"{__name__}.parse_po_file:polib" if deep else None)
+    # files that are not validated are assumed to be valid
+    if len(checked_po_files) < len(po_file_index):
+        checked = {id(po_file) for po_file in checked_po_files}
+        results += [(True, _language_code(po_file.get("path"))) for po_file in po_file_index
+                    if id(po_file) not in checked]
+    for success, language_code in results:
         if not en_gb_present and success and language_code and language_code.lower() == 'en_gb':
             en_gb_present = True
 
@@ -81,18 +103,25 @@ def check_for_invalid_strings_po(report: Report, file_index: list, is_language_a
         report.add(Record(INFORMATION, "PO files are valid"))
 
 
-def parse_po_file(report: Report, language_path: str, po_file: dict):
+def _language_code(language_path: str):
+    """Language code of a language directory, e.g. en_gb for resource.language.en_gb"""
+    if len(language_path.rpartition('.')) == 3:
+        return language_path.rpartition('.')[2]
+    return ''
+
+
+def parse_po_file(report: Report, language_path: str, po_file: dict, deep: bool = False):
     """Parse strings.po files
         :language_path: base language path, "<ADDON_PATH>/resources/language/resource.language.
         or <ADDON_PATH>/resources/language/language (legacy)"
         :po_file: dict containing name and path of the po file representing a file from file_index
+        :deep: also parse the file with polib and report its syntax errors instead of the ones of the
+               streaming validator
     """
     success = True
     full_path = os.path.join(po_file["path"], po_file["name"])
 
-    language_code = ''
-    if len(language_path.rpartition('.')) == 3:
-        language_code = language_path.rpartition('.')[2]
+    language_code = _language_code(language_path)
 
     if not _is_using_legacy_language_directory_structure(po_file["path"]) \
         and not RE_LANG_CODE.match(language_code):
@@ -101,41 +130,56 @@ def parse_po_file(report: Report, language_path: str, po_file: dict):
             f"{relative_path(full_path)}"))
         return success, language_code
 
-    with open(full_path, "r", encoding="utf-8") as f:
-        try:
-            contents = f.read()
-            f.seek(0)
-            lines = f.readlines()
-        except UnicodeDecodeError:
-            success = False
-            report.add(Record(PROBLEM,
-                f"Invalid PO file {relative_path(full_path)}: File is not saved with UTF-8 encoding"))
-            return success, language_code
-
-    if not contents:
+    try:
+        scan = po_validator.scan(full_path)
+    except UnicodeDecodeError:
         success = False
         report.add(Record(PROBLEM,
-            f"Invalid PO file {relative_path(full_path)}: File is empty"))
+            f"Invalid PO file {relative_path(full_path)}: File is not saved with UTF-8 encoding"))
         return success, language_code
 
-    if "\r\n" in contents:
+    if scan.empty:
         success = False
+        report.add(Record(PROBLEM,
+            f"Invalid PO file {relative_path(full_path)}: File is empty"))
+        return success, language_code
+
+    if scan.crlf:
+        # only a warning, the file is still valid
         report.add(Record(WARNING,
             f"Windows line endings found in {relative_path(full_path)}, consider converting to Linux line endings."
         ))
 
-    header = contents[:contents.find("msgctxt \"#")]
-    if not re.search(r'msgid ""\s+msgstr ""', header):
+    if not scan.header:
         # This is only required by polib if metadata follows, Kodi requires this regardless of metadata
         success = False
         report.add(Record(PROBLEM, f"Invalid PO file {relative_path(full_path)}:\nMissing required header:\n"
                                    "\tmsgid \"\"\n\tmsgstr \"\""))
 
-    if contents[0] == "\ufeff":
+    if scan.bom:
         success = False
         report.add(Record(PROBLEM, f"Invalid PO file {relative_path(full_path)}: File contains BOM (byte order mark)"))
         return success, language_code
 
+    if deep:
+        message = _polib_error(full_path)
+    else:
+        message = f"{scan.error[0]} on line {scan.error[1]}" if scan.error else None
+    if message:
+        success = False
+        report.add(Record(PROBLEM, f"Invalid PO file {relative_path(full_path)}: {message}"))
+
+    return success, language_code
+
+
+def _polib_error(full_path: str):
+    """Parse a strings.po file with polib
+        :full_path: path of the po file, saved with UTF-8 encoding
+        :return: the first syntax error found by polib, None if there is none
+    """
+    with open(full_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
     # fix any Gettext automatic comments in the source before testing with polib
     contents = ''.join(['# ' + line.replace('#', '').lstrip()
                         if (line.startswith('#') and line.replace('#', '').lstrip())
@@ -156,11 +200,8 @@ def parse_po_file(report: Report, language_path: str, po_file: dict):
                 # restructure message to remove file and path
                 message = f"{match.group('message')} on line {match.group('line_num')}"
                 break
-
-        success = False
-        report.add(Record(PROBLEM, f"Invalid PO file {relative_path(full_path)}: {message}"))
-
-    return success, language_code
+        return message
+    return None
 
 
 def _is_using_legacy_language_directory_structure(po_file: str):
@@ -6,32 +6,37 @@
     See LICENSES/README.md for more information.
 """
 
-__all__ = ["decorators", "has_transparency", "relative_path", "load_plugins"]
+__all__ = ["decorators", "has_transparency", "relative_path", "load_plugins", "CHUNK_SIZE", "read_chunks",
+           "file_sha256", "write_atomic"]
 
+import hashlib
 import importlib
 import os
 import pkgutil
 import sys
+import tempfile
 
 REL_PATH = ""
+# size of the blocks files are read and written in
+CHUNK_SIZE = 64 * 1024
 
 
 def has_transparency(im):
-    """Check the transparency(alpha layer) in the given image
+    """Check the transparency(alpha layer, transparent color or palette alpha values) in the given image
 
         :im: PIL.Image object
     """
-    try:
-        if im.mode == "RGBA":
-            alpha = im.split()[-1]
-            listdata = list(alpha.getdata())
-            first_transparent_pixel = next(x[0]
-                                           for x in enumerate(listdata) if x[1] < 255)
-            if first_transparent_pixel is not None:
-                return True
-        return False
-    except StopIteration:
+    if im.mode in ("RGBA", "LA", "PA"):
+        return im.getchannel("A").getextrema()[0] < 255
+    transparency = im.info.get("transparency")
+    if transparency is None:
         return False
+    if im.mode == "P":
+        # alpha values of the palette entries, or the index of the transparent entry
+        if isinstance(transparency, bytes):
+            return any(index < len(transparency) and transparency[index] < 255 for _, index in im.getcolors(256))
+        return any(index == transparency for _, index in im.getcolors(256))
+    return im.convert("RGBA").getchannel("A").getextrema()[0] < 255
 
 
 def load_plugins():
@@ -49,3 +54,42 @@ def relative_path(file_path):
     """
     path_to_print = file_path[len(REL_PATH):]
     return f".{path_to_print}"
+
+
+def read_chunks(file_path):
+    """Read a file in chunks
+
+        :file_path: path of the file
+    """
+    with open(file_path, "rb") as chunked_file:
+        while chunk := chunked_file.read(CHUNK_SIZE):
+            yield chunk
+
+
+def file_sha256(file_path):
+    """Return the sha256 hash object of the content of the file, read in chunks
+
+        :file_path: path of the file
+    """
+    digest = hashlib.sha256()
+    for chunk in read_chunks(file_path):
+        digest.update(chunk)
+    return digest
+
+
+def write_atomic(path, chunks):
+    """Write the chunks to a temporary file next to the given path and move it into place, so
+    concurrent runs never see a partial file
+
+        :path: path of the written file
+        :chunks: iterable of bytes
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            for chunk in chunks:
+                tmp_file.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
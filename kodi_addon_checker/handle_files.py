@@ -6,9 +6,12 @@
     See LICENSES/README.md for more information.
 """
 
+import mmap
 import os
 import pathlib
 import re
+import subprocess
+from difflib import SequenceMatcher
 
 from .common import relative_path
 from .record import PROBLEM, Record
@@ -39,43 +42,362 @@ def find_files_recursive(name: str, path: str):
                 yield os.path.join(root, file)
 
 
+class FileEntry():
+    """A file of the add-on, captured while building the FileIndex"""
+    __slots__ = ("path", "name", "relpath", "ext", "stat")
+
+    def __init__(self, path, name, relpath, stat):
+        self.path = path
+        self.name = name
+        self.relpath = relpath
+        self.ext = os.path.splitext(name)[1].lower()
+        self.stat = stat
+
+    @property
+    def full_path(self):
+        return os.path.join(self.path, self.name)
+
+    def __getitem__(self, key):
+        # entries can be used in place of the {"path", "name"} dicts of create_file_index
+        if key not in ("path", "name"):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"FileEntry({self.full_path!r})"
+
+
+class FileIndex():
+    def __init__(self, root: str):
+        """
+        Index all files of a directory tree with a single os.scandir traversal, ignoring .git
+        directories. The stat result of every file is captured, so the checks do not need to
+        walk or stat the tree again.
+        :param root: path of the add-on directory
+        """
+        self.root = root
+        self.files = []
+        # relative directory path ("" for the root) -> names of its subdirectories
+        self.directories = {}
+        # index of all files of the add-on, differs from self if the index was restricted
+        self.complete = self
+        self._scan(root, "")
+        self._build_lookups()
+
+    @classmethod
+    def from_files(cls, files, root: str = None):
+        """Index of the given files, e.g. the list of create_file_index. The files are stat'ed again
+        and only the directories containing files are known.
+            :files: iterable of {"path", "name"} dicts
+            :root: path of the add-on directory, the common directory of the files if None
+        """
+        files = list(files)
+        if root is None:
+            root = os.path.commonpath([file["path"] for file in files]) if files else ""
+        index = object.__new__(cls)
+        index.root = root
+        index.files = []
+        index.directories = {"": []}
+        index.complete = index
+        for file in files:
+            full_path = os.path.join(file["path"], file["name"])
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                stat = None
+            relpath = os.path.relpath(full_path, root)
+            index.files.append(FileEntry(file["path"], file["name"], relpath, stat))
+
+            directory = ""
+            for name in relpath.split(os.sep)[:-1]:
+                subdirectories = index.directories.setdefault(directory, [])
+                if name not in subdirectories:
+                    subdirectories.append(name)
+                directory = os.path.join(directory, name)
+            index.directories.setdefault(directory, [])
+        index._build_lookups()  # pylint: disable=protected-access
+        return index
+
+    def _build_lookups(self):
+        # lowercase extension / file name -> positions of the files in the index
+        self._by_extension = {}
+        self._by_name = {}
+        for position, entry in enumerate(self.files):
+            self._by_extension.setdefault(entry.ext, []).append(position)
+            self._by_name.setdefault(entry.name, []).append(position)
+
+    def _scan(self, path, relpath):
+        subdirectories = []
+        self.directories[relpath] = subdirectories
+        try:
+            with os.scandir(path) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+
+        walk_into = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                if entry.name == ".git":
+                    continue
+                subdirectories.append(entry.name)
+                # like os.walk, symlinked directories are listed but not followed
+                if not entry.is_symlink():
+                    walk_into.append(entry)
+            else:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    stat = None
+                self.files.append(FileEntry(path, entry.name, os.path.join(relpath, entry.name), stat))
+
+        # files of a directory are listed before the files of its subdirectories, as with os.walk
+        for entry in walk_into:
+            self._scan(entry.path, os.path.join(relpath, entry.name))
+
+    def restricted_to(self, relpaths):
+        """Index of the files of this index with one of the given paths, e.g. the files changed by a
+        pull request. The directories and the complete index still describe the whole add-on.
+            :relpaths: paths relative to the root
+        """
+        relpaths = {os.path.normpath(relpath) for relpath in relpaths}
+        index = object.__new__(FileIndex)
+        index.root = self.root
+        index.files = [entry for entry in self.files if entry.relpath in relpaths]
+        index.directories = self.directories
+        index.complete = self.complete
+        index._build_lookups()  # pylint: disable=protected-access
+        return index
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def extensions(self):
+        """All lowercase extensions of the indexed files, "" for files without one"""
+        return self._by_extension.keys()
+
+    def with_extension(self, *extensions):
+        """Files with one of the given lowercase extensions, in index order
+            :extensions: extensions including the dot, e.g. ".xml"
+        """
+        return self.select(extensions=extensions)
+
+    def named(self, *names):
+        """Files with one of the given names, in index order"""
+        return self.select(names=names)
+
+    def select(self, extensions=(), names=()):
+        """Files with one of the given lowercase extensions or names, in index order"""
+        if len(extensions) + len(names) == 1:
+            positions = self._by_extension.get(extensions[0], ()) if extensions else self._by_name.get(names[0], ())
+        else:
+            positions = sorted({position for ext in extensions for position in self._by_extension.get(ext, ())}
+                               | {position for name in names for position in self._by_name.get(name, ())})
+        return [self.files[position] for position in positions]
+
+    def subdirectories(self, *relpath):
+        """Names of the subdirectories of the given directory, None if it does not exist
+            :relpath: path components relative to the root
+        """
+        return self.directories.get(os.path.join("", *relpath))
+
+    def find_recursive(self, name: str, *relpath):
+        """Same as find_files_recursive, using the index
+            :name: substring of the file names to look for
+            :relpath: path components of the directory relative to the root
+        """
+        prefix = os.path.join("", *relpath, "")
+        for entry in self.files:
+            if entry.relpath.startswith(prefix) and name in entry.name:
+                yield entry.full_path
+
+
+def as_file_index(file_index):
+    """Return the given FileIndex, or a FileIndex of the given list of {"path", "name"} dicts
+        :file_index: FileIndex, or list like the one returned by create_file_index
+    """
+    if isinstance(file_index, FileIndex):
+        return file_index
+    return FileIndex.from_files(file_index)
+
+
 def create_file_index(path: str):
     """Creates a list having multiple dictionaries in following format:
         [{'name':<file_name>, 'path': '<path_to_file>'}]
+        The file checks also accept this list in place of a FileIndex.
 
         :path: path for the directory
     """
-    file_index = []
-    for root, folders, files in os.walk(path, topdown=True):
-        if ".git" in folders:
-            folders.remove(".git")
-        for file_name in files:
-            file_index.append({"path": root, "name": file_name})
-    return file_index
+    return [{"path": entry.path, "name": entry.name} for entry in FileIndex(path)]
+
+
+def changed_files(path: str, ref: str):
+    """Paths of the files changed since the given git revision, including untracked files
+        :path: directory inside a git work tree, e.g. the add-on
+        :ref: git revision, the changes are taken from its merge base with HEAD
+        :return: set of the paths relative to path
+        :raises OSError, subprocess.CalledProcessError: if git is not available or fails
+    """
+    def git(*args):
+        return subprocess.run(["git", "-C", path, *args], check=True, capture_output=True).stdout
+
+    base = git("merge-base", ref, "HEAD").decode().strip()
+    # compared with the work tree, so staged and unstaged changes are included
+    output = git("diff", "--name-only", "--relative", "--diff-filter=d", "-z", base, "--", ".") + \
+        git("ls-files", "--others", "--exclude-standard", "-z", "--", ".")
+    return {os.path.normpath(os.fsdecode(relpath)) for relpath in output.split(b"\0") if relpath}
+
+
+class TermScanner():
+    # minimum length of a substring shared by several terms to be searched for them at once
+    MIN_ANCHOR_LENGTH = 8
+    # smaller files are read at once, larger ones are memory-mapped
+    MMAP_THRESHOLD = 1024 * 1024
+
+    def __init__(self, terms: list):
+        """
+        Match all given terms with a single read per file. The utf-8 encoded terms are searched
+        in the raw bytes of the files, so undecodable content does not stop the scan. Terms sharing
+        a long substring are grouped behind that anchor, so the content is searched once per anchor
+        and the terms of a group are only searched for in files containing it.
+        :param terms: list of the terms to look for
+        """
+        self.terms = list(terms)
+        self.groups = [(anchor.encode("utf-8"), indexes)
+                       for anchor, indexes in _anchor_groups(self.terms, self.MIN_ANCHOR_LENGTH)]
+        self._patterns = [term.encode("utf-8") for term in self.terms]
+
+    def scan(self, file_path: str):
+        """Yields (term index, line number, line) for every term found on a line of the file,
+        ordered by line number and term index
+            :file_path: path of the file to search
+        """
+        with open(file_path, "rb") as searchfile:
+            size = os.fstat(searchfile.fileno()).st_size
+            if size and size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(searchfile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    yield from self._scan(data)
+            else:
+                yield from self._scan(searchfile.read())
+
+    def _scan(self, data):
+        # line breaks are \n, \r\n or \r, like the universal newlines of text mode
+        has_cr = data.find(b"\r") != -1
+
+        def line_bounds(position):
+            start = data.rfind(b"\n", 0, position)
+            if has_cr:
+                start = max(start, data.rfind(b"\r", 0, position))
+            end = data.find(b"\n", position)
+            if has_cr:
+                cr_end = data.find(b"\r", position)
+                if cr_end != -1 and (end == -1 or cr_end < end):
+                    end = cr_end
+            return start + 1, end
+
+        # line start -> (line end, term indexes found on that line)
+        hits = {}
+        for anchor, indexes in self.groups:
+            if data.find(anchor) == -1:
+                continue
+            for index in indexes:
+                pattern = self._patterns[index]
+                position = data.find(pattern)
+                while position != -1 and position < len(data):
+                    line_start, line_end = line_bounds(position)
+                    hits.setdefault(line_start, (line_end, set()))[1].add(index)
+                    # a term is reported once per line
+                    position = data.find(pattern, line_end + 1) if line_end != -1 else -1
+        yield from self._numbered(data, hits, has_cr)
+
+    @staticmethod
+    def _numbered(data, hits, has_cr):
+        """Yields (term index, line number, line) for the hits, the line numbers are only counted
+        for the lines with hits
+            :hits: line start -> (line end, term indexes found on that line)
+        """
+        linenumber = 1
+        last_start = 0
+        for line_start in sorted(hits):
+            skipped = data[last_start:line_start]
+            linenumber += skipped.count(b"\n")
+            if has_cr:
+                linenumber += skipped.count(b"\r") - skipped.count(b"\r\n")
+            last_start = line_start
+            line_end, indexes = hits[line_start]
+            line = data[line_start:line_end if line_end != -1 else len(data)].decode("utf-8", errors="replace")
+            for index in sorted(indexes):
+                yield index, linenumber, line
+
+
+def _anchor_groups(terms: list, min_length: int):
+    """Group the indexes of the given terms by a substring they all contain
+        :return: list of (anchor, [term index, ...])
+    """
+    ungrouped = list(range(len(terms)))
+    groups = []
+    while ungrouped:
+        index = ungrouped[0]
+        term = terms[index]
+        anchor = term
+        for other in ungrouped[1:]:
+            match = SequenceMatcher(None, term, terms[other], autojunk=False).find_longest_match(
+                0, len(term), 0, len(terms[other]))
+            if match.size >= min_length and (anchor == term or match.size > len(anchor)):
+                anchor = term[match.a:match.a + match.size]
+        members = [other for other in ungrouped if anchor in terms[other]]
+        groups.append((anchor, members))
+        ungrouped = [other for other in ungrouped if other not in members]
+    return groups
+
 
+def scan_files(file_index: FileIndex, scanner: TermScanner, whitelisted_file_types: list):
+    """Scans every whitelisted file of the index once with the given scanner
+        :file_index: FileIndex of the directory
+        :scanner: TermScanner of the terms to look for
+        :whitelisted_file_type: list of all the whitelisted file types, all files if empty
+        :return: list of (term index, file path, line number, line)
+    """
+    file_index = as_file_index(file_index)
+    if whitelisted_file_types:
+        files = [entry for entry in file_index.with_extension(*{ext.lower() for ext in whitelisted_file_types})
+                 if pathlib.Path(entry.name).suffix in whitelisted_file_types]
+    else:
+        files = file_index
 
-def find_in_file(path: str, search_terms: list, whitelisted_file_types: list):
+    results = []
+    for entry in files:
+        file_path = entry.full_path
+        for index, linenumber, line in scanner.scan(file_path):
+            results.append((index, file_path, linenumber, line))
+    return results
+
+
+def find_in_file(file_index: FileIndex, search_terms: list, whitelisted_file_types: list):
     """Finds for particular terms in whitelisted file type i.e .py or .xml
-        :path: path of a directory
+        :file_index: FileIndex of the directory
         :search_term: list of all the terms to be searched
         :whitelisted_file_type: list of all the whitelisted file types
     """
-    results = []
-    if search_terms:
-        for directory in os.walk(path):
-            for file_name in directory[2]:
-                if pathlib.Path(file_name).suffix in whitelisted_file_types or not whitelisted_file_types:
-                    file_path = os.path.join(directory[0], file_name)
-
-                    with open(file_path, "r", encoding="utf8") as searchfile:
-                        linenumber = 0
-                        for line in searchfile:
-                            linenumber = linenumber + 1
-                            for term in search_terms:
-                                if term in line:
-                                    results.append({"term": term, "line": line.strip(
-                                    ), "searchfile": file_path, "linenumber": linenumber})
-    return results
+    if not search_terms:
+        return []
+    return [{"term": search_terms[index], "line": line.strip(), "searchfile": file_path, "linenumber": linenumber}
+            for index, file_path, linenumber, line in scan_files(file_index, TermScanner(search_terms),
+                                                                 whitelisted_file_types)]
 
 
 def addon_file_exists(report: Report, addon_path: str, file_name: str):
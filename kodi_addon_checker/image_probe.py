@@ -0,0 +1,274 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import re
+import struct
+import zlib
+from collections import namedtuple
+
+from PIL import GifImagePlugin, Image, PngImagePlugin
+
+# format and mode as reported by PIL, size as (width, height), and whether a transparent color or
+# palette alpha values are defined next to the bands of the mode
+ImageInfo = namedtuple("ImageInfo", ["format", "size", "mode", "transparency"])
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# (bit depth, color type) -> mode
+PNG_MODES = {
+    (1, 0): "1", (2, 0): "L", (4, 0): "L", (8, 0): "L", (16, 0): "I;16",
+    (8, 2): "RGB", (16, 2): "RGB",
+    (1, 3): "P", (2, 3): "P", (4, 3): "P", (8, 3): "P",
+    (8, 4): "LA", (16, 4): "RGBA",
+    (8, 6): "RGBA", (16, 6): "RGBA",
+}
+# minimum length of the chunks PIL parses while opening an image
+PNG_PARSED_CHUNKS = {b"PLTE": 0, b"tRNS": 0, b"gAMA": 4, b"cHRM": 0, b"sRGB": 1, b"pHYs": 9, b"tEXt": 0,
+                     b"eXIf": 0}
+# chunks PIL parses in ways not mirrored here, images containing them are left to PIL
+PNG_UNSUPPORTED_CHUNKS = {b"IHDR", b"IEND", b"zTXt", b"iTXt", b"acTL", b"fcTL", b"fdAT"}
+PNG_CHUNK_NAME = re.compile(rb"\w\w\w\w")
+# longer chunks before the image data are left to PIL
+MAX_HEADER_CHUNK = 1024 * 1024
+
+JPEG_SOI = b"\xff\xd8\xff"
+# start of frame markers, the frame header holds the size and number of components
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF, 0xDE}
+# segments that are skipped
+JPEG_SKIPPED = {0xC4, 0xCC, 0xDC, 0xDD, 0xDF, 0xFE}
+JPEG_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+
+class _Unsupported(Exception):
+    """The headers are not opened by PIL the way they are probed, the image is left to PIL"""
+
+
+def probe(path: str):
+    """Read the format, size, mode and transparency of a png, jpeg or gif image from its headers,
+    without decoding it. Only headers PIL opens the same way are accepted, anything else, including
+    other formats and damaged headers, is left to PIL.
+        :path: path of the image
+        :return: ImageInfo, None if the image has to be opened with PIL
+        :raises OSError: if the file cannot be read
+    """
+    return accepted(probe_headers(path))
+
+
+def probe_headers(path: str):
+    """Read the ImageInfo of a png, jpeg or gif image from its headers like probe(), also of images PIL
+    refuses to open because of their size.
+        :path: path of the image
+        :return: ImageInfo, None if the headers cannot be probed
+        :raises OSError: if the file cannot be read
+    """
+    with open(path, "rb") as image_file:
+        signature = image_file.read(8)
+        try:
+            if signature == PNG_SIGNATURE:
+                return _probe_png(image_file)
+            if signature.startswith(JPEG_SOI):
+                image_file.seek(3)
+                return _probe_jpeg(image_file)
+            if signature.startswith((b"GIF87a", b"GIF89a")):
+                image_file.seek(0)
+                return _probe_gif(image_file)
+            return None
+        except (struct.error, IndexError, _Unsupported):
+            return None
+
+
+def accepted(info):
+    """Return the ImageInfo read by probe_headers() if PIL opens the image the same way, None otherwise"""
+    if info is None or not info.size[0] or not info.size[1]:
+        return None
+    # PIL warns about or refuses very large images when opening them
+    if Image.MAX_IMAGE_PIXELS and info.size[0] * info.size[1] > Image.MAX_IMAGE_PIXELS:
+        return None
+    return info
+
+
+def from_image(im):
+    """ImageInfo of an image opened with PIL"""
+    return ImageInfo(im.format, im.size, im.mode, "transparency" in im.info)
+
+
+def _read(image_file, length):
+    data = image_file.read(length)
+    if len(data) != length:
+        raise IndexError("truncated image")
+    return data
+
+
+def _probe_png(image_file):
+    size = mode = None
+    transparency = False
+    while True:
+        name, data = _png_chunk(image_file)
+        if name == b"IDAT":
+            break
+        if mode is None:
+            # the first chunk is the image header
+            size, mode = _png_header(name, data)
+        elif _png_transparency(name, data, mode):
+            transparency = True
+    if mode is None:
+        return None
+    return ImageInfo("PNG", size, mode, transparency)
+
+
+def _png_chunk(image_file):
+    """Read the name and data of the next chunk, the image data of the IDAT chunk is not read"""
+    length, name = struct.unpack(">I4s", _read(image_file, 8))
+    if not PNG_CHUNK_NAME.fullmatch(name):
+        raise _Unsupported()
+    if name == b"IDAT":
+        return name, None
+    if length > MAX_HEADER_CHUNK:
+        raise _Unsupported()
+    data = _read(image_file, length)
+    if zlib.crc32(data, zlib.crc32(name)) != struct.unpack(">I", _read(image_file, 4))[0]:
+        raise _Unsupported()
+    return name, data
+
+
+def _png_header(name, data):
+    """Size and mode of the IHDR chunk"""
+    if name != b"IHDR" or len(data) < 13 or data[11] or (data[8], data[9]) not in PNG_MODES:
+        raise _Unsupported()
+    return struct.unpack(">II", data[:8]), PNG_MODES[(data[8], data[9])]
+
+
+def _png_transparency(name, data, mode):
+    """Check a chunk following the header, return whether it defines a transparent color or palette alpha values"""
+    length = len(data)
+    if name in PNG_UNSUPPORTED_CHUNKS or length < PNG_PARSED_CHUNKS.get(name, 0) or name == b"cHRM" and length % 4:
+        raise _Unsupported()
+    if name == b"iCCP" and not _valid_icc_profile(data):
+        raise _Unsupported()
+    if name == b"tRNS" and mode in ("1", "L", "I;16", "RGB", "P"):
+        if length < {"RGB": 6, "P": 0}.get(mode, 2):
+            raise _Unsupported()
+        return True
+    return False
+
+
+def _valid_icc_profile(data: bytes):
+    """Whether PIL accepts the compressed profile of an iCCP chunk"""
+    compression = data[data.find(b"\0") + 1]
+    if compression != 0:
+        return False
+    decompressor = zlib.decompressobj()
+    try:
+        decompressor.decompress(data[data.find(b"\0") + 2:], PngImagePlugin.MAX_TEXT_CHUNK)
+    except zlib.error:
+        # PIL ignores broken profiles
+        return True
+    return not decompressor.unconsumed_tail
+
+
+def _probe_jpeg(image_file):
+    size = mode = None
+    while True:
+        marker, data = _jpeg_segment(image_file)
+        if marker == 0xDA:
+            # start of scan, the compressed data follows
+            break
+        if marker in JPEG_SOF:
+            size, mode = _jpeg_frame(data)
+        else:
+            _check_jpeg_segment(marker, data)
+        if _read(image_file, 1) != b"\xff":
+            return None
+    if mode is None:
+        return None
+    return ImageInfo("JPEG", size, mode, False)
+
+
+def _jpeg_segment(image_file):
+    """Read the marker and data of the next segment"""
+    marker = _read(image_file, 1)[0]
+    # fill bytes
+    while marker == 0xFF:
+        marker = _read(image_file, 1)[0]
+    length = struct.unpack(">H", _read(image_file, 2))[0]
+    if length < 2:
+        raise _Unsupported()
+    return marker, _read(image_file, length - 2)
+
+
+def _jpeg_frame(data):
+    """Size and mode of a start of frame segment"""
+    if data[0] != 8 or data[5] not in JPEG_MODES:
+        raise _Unsupported()
+    return (struct.unpack(">H", data[3:5])[0], struct.unpack(">H", data[1:3])[0]), JPEG_MODES[data[5]]
+
+
+def _check_jpeg_segment(marker, data):
+    """Check a segment other than the frame header the way PIL parses it"""
+    if marker == 0xDB:
+        # quantization tables, 64 values of 1 or 2 bytes each
+        while data:
+            table_length = 1 + 64 * (1 if data[0] < 16 else 2)
+            if len(data) < table_length:
+                raise _Unsupported()
+            data = data[table_length:]
+    elif 0xE0 <= marker <= 0xEF:
+        if marker == 0xE2 and data.startswith(b"MPF\0"):
+            # multi picture, opened as MPO
+            raise _Unsupported()
+        if (marker == 0xE0 and data.startswith(b"JFIF") or marker == 0xEE and data.startswith(b"Adobe")) \
+                and len(data) < 7:
+            raise _Unsupported()
+    elif marker not in JPEG_SKIPPED:
+        raise _Unsupported()
+
+
+def _probe_gif(image_file):
+    if GifImagePlugin.LOADING_STRATEGY != GifImagePlugin.LoadingStrategy.RGB_AFTER_FIRST:
+        return None
+    header = _read(image_file, 13)
+    width, height = struct.unpack("<HH", header[6:10])
+    global_palette = False
+    if header[10] & 128:
+        global_palette = _palette_needed(_read(image_file, 3 << ((header[10] & 7) + 1)))
+
+    transparency = False
+    while True:
+        block = _read(image_file, 1)
+        if block == b";":
+            return None
+        if block == b"!":
+            label = _read(image_file, 1)[0]
+            data = _sub_block(image_file)
+            if label == 0xF9 and data is not None:
+                # graphic control extension
+                if len(data) < 4:
+                    return None
+                transparency = transparency or bool(data[0] & 1)
+            while data is not None:
+                data = _sub_block(image_file)
+        elif block == b",":
+            # image descriptor of the first frame, it may extend the logical screen
+            descriptor = _read(image_file, 9)
+            left, top, frame_width, frame_height = struct.unpack("<HHHH", descriptor[:8])
+            width, height = max(width, left + frame_width), max(height, top + frame_height)
+            palette = global_palette
+            if descriptor[8] & 128:
+                palette = _palette_needed(_read(image_file, 3 << ((descriptor[8] & 7) + 1)))
+            _read(image_file, 1)
+            return ImageInfo("GIF", (width, height), "P" if palette else "L", transparency)
+
+
+def _sub_block(image_file):
+    length = _read(image_file, 1)[0]
+    return _read(image_file, length) if length else None
+
+
+def _palette_needed(palette: bytes):
+    """Whether a gif color table is not just the grayscale ramp"""
+    return any(not index == palette[index * 3] == palette[index * 3 + 1] == palette[index * 3 + 2]
+               for index in range(len(palette) // 3))
@@ -0,0 +1,224 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import codecs
+import re
+from collections import namedtuple
+
+from .common import CHUNK_SIZE
+
+# empty: the file has no content, bom: it starts with a byte order mark, crlf: it has windows line endings,
+# header: the msgid ""/msgstr "" header precedes the first string, error: the first syntax error as
+# (message, line number), None if there is none
+PoScan = namedtuple("PoScan", ["empty", "bom", "crlf", "header", "error"])
+
+RE_HEADER = re.compile(r'msgid ""\s+msgstr ""')
+RE_UNESCAPED_QUOTE = re.compile(r'([^\\]|^)"')
+
+KEYWORDS = {"msgctxt": "ct", "msgid": "mi", "msgstr": "ms", "msgid_plural": "mp"}
+PREVIOUS_KEYWORDS = {"msgid_plural": "pp", "msgid": "pm", "msgctxt": "pc"}
+# comments that are skipped without text
+COMMENT_KEYWORDS = {"#:": "oc", "#,": "fl", "#.": "gc"}
+
+# the state machine of the polib parser, the states and symbols are
+# st: start, he: header comment, tc: translator comment, gc: generated comment, oc: occurrence,
+# fl: flags, ct: msgctxt, pc/pm/pp: previous msgctxt/msgid/msgid_plural, mi: msgid, mp: msgid_plural,
+# ms: msgstr, mx: msgstr plural, mc: continuation line, which keeps the current state
+_ALL_STATES = ["st", "he", "gc", "oc", "fl", "ct", "pc", "pm", "pp", "tc", "ms", "mp", "mx", "mi"]
+_TRANSITIONS = [
+    ("tc", ["st", "he"], "he"),
+    ("tc", ["gc", "oc", "fl", "tc", "pc", "pm", "pp", "ms", "mp", "mx", "mi"], "tc"),
+    ("gc", _ALL_STATES, "gc"),
+    ("oc", _ALL_STATES, "oc"),
+    ("fl", _ALL_STATES, "fl"),
+    ("pc", _ALL_STATES, "pc"),
+    ("pm", _ALL_STATES, "pm"),
+    ("pp", _ALL_STATES, "pp"),
+    ("ct", ["st", "he", "gc", "oc", "fl", "tc", "pc", "pm", "pp", "ms", "mx"], "ct"),
+    ("mi", ["st", "he", "gc", "oc", "fl", "ct", "tc", "pc", "pm", "pp", "ms", "mx"], "mi"),
+    ("mp", ["tc", "gc", "pc", "pm", "pp", "mi"], "mp"),
+    ("ms", ["mi", "mp", "tc"], "ms"),
+    ("mx", ["mi", "mx", "mp", "tc"], "mx"),
+    ("mc", ["ct", "mi", "mp", "ms", "mx", "pm", "pp", "pc"], None),
+]
+# (symbol, state) -> next state
+TRANSITIONS = {(symbol, state): next_state or state for symbol, states, next_state in _TRANSITIONS for state in states}
+
+
+class _PoSyntaxError(Exception):
+    pass
+
+
+def scan(path: str):
+    """Check a strings.po file in a single pass over its bytes: the byte order mark, line endings, the
+    header and the syntax of the entries. The syntax is checked like polib parses the file once the
+    gettext comments are turned into translator comments, stopping at the first error.
+        :path: path of the po file
+        :return: PoScan
+        :raises UnicodeDecodeError: if the file is not saved with UTF-8 encoding
+        :raises OSError: if the file cannot be read
+    """
+    lines = _Lines()
+    parser = _Parser()
+    header = _Header()
+    with open(path, "rb") as po_file:
+        for lineno, line in enumerate(lines.read(po_file), 1):
+            if not header.done:
+                header.feed(line)
+            if parser.error is None:
+                parser.feed(line, lineno)
+    return PoScan(lines.empty, lines.bom, lines.crlf, header.found, parser.error)
+
+
+class _Lines():
+    """Split a file into lines like when it is read in text mode, noting how the lines end"""
+
+    def __init__(self):
+        self.empty = True
+        self.bom = False
+        self.crlf = False
+
+    def read(self, po_file):
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        while chunk := po_file.read(CHUNK_SIZE):
+            text = pending + decoder.decode(chunk)
+            if self.empty and text:
+                self.empty = False
+                if text[0] == "\ufeff":
+                    self.bom = True
+                    text = text[1:]
+            lines = text.split("\n")
+            pending = lines.pop()
+            yield from self._carriage_returns(lines) if "\r" in text else lines
+        text = pending + decoder.decode(b"", True)
+        if text:
+            self.empty = False
+            lines = text.split("\r")
+            if len(lines) > 1 and not lines[-1]:
+                lines.pop()
+            yield from lines
+
+    def _carriage_returns(self, lines):
+        for line in lines:
+            if line.endswith("\r"):
+                self.crlf = True
+                line = line[:-1]
+            # lone carriage returns end lines as well
+            yield from line.split("\r")
+
+
+class _Header():
+    """Look for the msgid ""/msgstr "" header in the lines preceding the first string. Only the end of the
+    previous lines that can still start the header is kept, the last msgid "" followed by whitespace only"""
+
+    def __init__(self):
+        self.found = False
+        self.done = False
+        self._tail = ""
+
+    def feed(self, line: str):
+        position = line.find('msgctxt "#')
+        if position != -1:
+            text = self._tail + line[:position]
+            self.done = True
+        else:
+            text = self._tail + line + "\n"
+        if 'msgstr ""' in text and RE_HEADER.search(text):
+            self.found = self.done = True
+            return
+
+        position = text.rfind('msgid ""')
+        rest = text[position + len('msgid ""'):]
+        if position == -1 or rest.strip():
+            self._tail = ""
+        else:
+            # any whitespace separates msgid "" from msgstr "", a single space stands for all of it
+            self._tail = 'msgid ""' + (" " if rest else "")
+
+
+class _Parser():
+    """The syntax checks of the polib parser, without building the entries"""
+
+    def __init__(self):
+        self.state = "st"
+        self.error = None
+
+    def feed(self, line: str, lineno: int):
+        try:
+            self._parse(line)
+        except _PoSyntaxError as error:
+            self.error = (str(error), lineno)
+
+    def _parse(self, line):
+        if line.startswith("#"):
+            # gettext comments are checked as translator comments, comments without text are skipped
+            if line.replace("#", "").strip():
+                self._process("tc")
+            return
+
+        line = line.strip()
+        if not line:
+            return
+        tokens = line.split(None, 2)
+        if tokens[0] == "#~|":
+            return
+        if tokens[0] == "#~" and len(tokens) > 1:
+            line = line[3:].strip()
+            tokens = tokens[1:]
+
+        if tokens[0] in KEYWORDS and len(tokens) > 1:
+            self._check_quotes(line[len(tokens[0]):].lstrip())
+            self._process(KEYWORDS[tokens[0]])
+        elif tokens[0].startswith("#"):
+            self._parse_comment(tokens)
+        elif line[:1] == '"':
+            self._check_quotes(line)
+            self._process("mc")
+        elif line[:7] == "msgstr[":
+            self._process("mx")
+            # the plural index is a single digit
+            if len(line) < 8 or not line[7].isdecimal():
+                raise _PoSyntaxError("Syntax error")
+        else:
+            raise _PoSyntaxError("Syntax error")
+
+    def _parse_comment(self, tokens):
+        if tokens[0] in COMMENT_KEYWORDS:
+            if len(tokens) > 1:
+                self._process(COMMENT_KEYWORDS[tokens[0]])
+        elif tokens[0] == "#" or tokens[0].startswith("##"):
+            self._process("tc")
+        elif tokens[0] == "#|":
+            self._parse_previous(tokens)
+        else:
+            raise _PoSyntaxError("Syntax error")
+
+    def _parse_previous(self, tokens):
+        if len(tokens) <= 1:
+            raise _PoSyntaxError("Syntax error")
+        if tokens[1].startswith('"'):
+            self._process("mc")
+        elif len(tokens) == 2:
+            raise _PoSyntaxError("invalid continuation line")
+        elif tokens[1] not in PREVIOUS_KEYWORDS:
+            raise _PoSyntaxError(f"unknown keyword {tokens[1]}")
+        else:
+            self._process(PREVIOUS_KEYWORDS[tokens[1]])
+
+    def _process(self, symbol):
+        state = TRANSITIONS.get((symbol, self.state))
+        if state is None:
+            raise _PoSyntaxError("Syntax error")
+        self.state = state
+
+    @staticmethod
+    def _check_quotes(token):
+        text = token[1:-1]
+        if '"' in text and RE_UNESCAPED_QUOTE.search(text):
+            raise _PoSyntaxError("unescaped double quote found")
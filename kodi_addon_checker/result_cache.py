@@ -0,0 +1,102 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from . import __version__
+from .common import file_sha256, relative_path, write_atomic
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ResultCache():
+    def __init__(self, directory, max_size=100 * 1024 * 1024):
+        """
+        Create an on-disk cache for the findings of the per-file checks, keyed by the content of the
+        checked file, the check and the checker version. Least recently used entries are evicted
+        once the cache grows beyond max_size.
+        :param directory: the directory where the cache index is stored
+        :param max_size: maximum size of the cached entries in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.path = os.path.join(directory, "results.json")
+        os.makedirs(directory, exist_ok=True)
+        self._entries = self._load()
+        # logical clock ordering the uses of the entries, wall-clock times can be equal
+        self._clock = max((entry["used"] for entry in self._entries.values()), default=0)
+        self._dirty = False
+
+    def key(self, check_id: str, file_path: str):
+        """
+        Return the cache key of a check of the given file.
+        :param check_id: identifies the check, e.g. its qualified function name
+        :param file_path: path of the checked file, the messages refer to its relative path
+        :raises OSError: if the file cannot be read
+        """
+        return hashlib.sha256("\0".join((check_id, __version__, relative_path(file_path),
+                                         file_sha256(file_path).hexdigest())).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        Return the cached (records, result) of the given key, None if it is not cached.
+        :param key: key returned by key()
+        :return: records as a list of (log level, message) and the return value of the check
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry["used"] = self._tick()
+        self._dirty = True
+        return entry["records"], entry["result"]
+
+    def put(self, key: str, records: list, result):
+        """
+        Store the findings of a check.
+        :param key: key returned by key()
+        :param records: list of (log level, message)
+        :param result: JSON serializable return value of the check
+        """
+        entry = {"records": records, "result": result, "used": self._tick()}
+        entry["size"] = len(json.dumps(entry))
+        self._entries[key] = entry
+        self._dirty = True
+
+    def save(self):
+        """Write the cache to disk, evicting the least recently used entries beyond max_size"""
+        if not self._dirty:
+            return
+        size = 0
+        entries = {}
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["used"], reverse=True):
+            size += entry["size"] + len(key)
+            if size > self.max_size:
+                break
+            entries[key] = entry
+        self._entries = entries
+
+        try:
+            write_atomic(self.path, [json.dumps(entries).encode("utf-8")])
+        except OSError as error:
+            LOGGER.warning("Could not store check results: %s", error)
+        self._dirty = False
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
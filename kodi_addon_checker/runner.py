@@ -0,0 +1,150 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import atexit
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from . import common
+from .record import Record
+
+
+class FileCheckRunner():
+    # worker pools shared by all add-ons of a run, by number of jobs
+    _executors = {}
+    # ResultCache shared by all runners, see configure()
+    cache = None
+
+    def __init__(self, jobs: int = 1):
+        """
+        Run independent per-file checks, optionally in a pool of worker processes.
+        :param jobs: number of worker processes, 0 for one per core, 1 to run the checks serially
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+
+    @classmethod
+    def configure(cls, cache):
+        """
+        Reuse the findings of checks of unchanged files, also between runs.
+        :param cache: ResultCache, None to disable
+        """
+        cls.cache = cache
+        if cache is not None:
+            atexit.register(cache.save)
+
+    def run(self, report, func, tasks: list, files: list = None, check_id: str = None):
+        """
+        Run func(report, *task) for every task. The records added by the checks are added to the
+        report in task order, so the output does not depend on the number of jobs.
+        :param report: the report the records are added to
+        :param func: module level check function, only calling report.add()
+        :param tasks: list of argument tuples
+        :param files: optional list of the file checked by each task, when given the findings
+                      of a task are cached by the content of its file
+        :param check_id: identifies the check in the cache, defaults to the qualified name of func.
+                         It has to change with the arguments of the tasks affecting the findings
+        :return: list of the return values of func, in task order
+        """
+        if self.cache is not None and files is not None:
+            keys, cached = self._lookup(check_id or f"{func.__module__}.{func.__qualname__}", files)
+        else:
+            keys = cached = [None] * len(tasks)
+
+        pending = [i for i in range(len(tasks)) if cached[i] is None]
+        computed = dict(zip(pending, self._execute(func, [tasks[i] for i in pending])))
+
+        results = []
+        for i in range(len(tasks)):
+            if cached[i] is not None:
+                records, result = cached[i]
+                records = [Record(log_level, message) for log_level, message in records]
+            else:
+                records, result = computed[i]
+                if keys[i] is not None:
+                    self.cache.put(keys[i], [(record.log_level, record.message) for record in records], result)
+            for record in records:
+                report.add(record)
+            results.append(result)
+        return results
+
+    def _lookup(self, check_id, files):
+        """Return the cache keys of the files, None if a file cannot be read, and their cached findings"""
+        keys = [None] * len(files)
+        cached = [None] * len(files)
+        for i, file_path in enumerate(files):
+            try:
+                keys[i] = self.cache.key(check_id, file_path)
+            except OSError:
+                continue
+            cached[i] = self.cache.get(keys[i])
+        return keys, cached
+
+    def _execute(self, func, tasks):
+        work = [(func, common.REL_PATH, task) for task in tasks]
+        if self.jobs <= 1 or len(tasks) < 2:
+            return [_run_check(item) for item in work]
+
+        chunksize = max(1, len(tasks) // (self.jobs * 4))
+        return list(self._executor().map(_run_check, work, chunksize=chunksize))
+
+    def _executor(self):
+        executor = self._executors.get(self.jobs)
+        if executor is None:
+            executor = self._executors[self.jobs] = ProcessPoolExecutor(max_workers=self.jobs)
+            atexit.register(executor.shutdown)
+        return executor
+
+
+class CheckTimeout(Exception):
+    """Raised by time_limit() when a check runs out of time"""
+
+
+@contextmanager
+def time_limit(seconds: float):
+    """
+    Raise CheckTimeout in the block once it has run for the given number of seconds. Long running
+    C code, like an image decoder, is interrupted when it returns to the interpreter. Without
+    interval timers (Windows) or outside of the main thread the block is not limited.
+    :param seconds: time budget of the block
+    """
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _timeout(signum, frame):
+        raise CheckTimeout(f"took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class _RecordCollector():
+    """Stands in for the Report in the worker processes"""
+
+    def __init__(self):
+        self.records = []
+
+    def add(self, record):
+        self.records.append(record)
+
+
+def _run_check(work):
+    func, rel_path, task = work
+    # messages use paths relative to the checked repository
+    common.REL_PATH = rel_path
+    collector = _RecordCollector()
+    result = func(collector, *task)
+    return collector.records, result
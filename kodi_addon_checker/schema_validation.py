@@ -6,9 +6,10 @@
     See LICENSES/README.md for more information.
 """
 
-import copy
 import logging
-from os.path import dirname, exists, join
+import os
+from functools import lru_cache
+from os.path import dirname, join
 
 import xmlschema
 
@@ -19,16 +20,60 @@ from .report import Report
 XML_SCHEMA = join(dirname(__file__), 'xml_schema')
 LOGGER = logging.getLogger(__name__)
 
-
-def schemas(report: Report, CONST_parsed_xml, branch_name):
+VALID_POINTS = {
+    'kodi.audiodecoder': 'binary_audiodecoder.xsd',
+    'kodi.audioencoder': 'binary_audioencoder.xsd',
+    'kodi.context.item': 'contextitem.xsd',
+    'kodi.gameclient': 'binary_gameclient.xsd',
+    'kodi.game.controller': 'controller.xsd',
+    'kodi.imagedecoder': 'binary_imagedecoder.xsd',
+    'kodi.inputstream': 'binary_inputstream.xsd',
+    'kodi.peripheral': 'binary_peripheral.xsd',
+    'kodi.pvrclient': 'binary_pvr.xsd',
+    'kodi.resource.games': 'games.xsd',
+    'kodi.resource.images': 'images.xsd',
+    'kodi.resource.language': 'language.xsd',
+    'kodi.addon.metadata': 'metadata.xsd',
+    'kodi.resource.uisounds': 'uisounds.xsd',
+    'kodi.resource.font': 'font.xsd',
+    'kodi.vfs': 'binary_vfs.xsd',
+    'xbmc.addon.metadata': 'metadata.xsd',
+    'xbmc.addon.repository': 'repository.xsd',
+    'xbmc.gui.skin': 'skin.xsd',
+    'xbmc.metadata.scraper.albums': 'scraper.xsd',
+    'xbmc.metadata.scraper.artists': 'scraper.xsd',
+    'xbmc.metadata.scraper.movies': 'scraper.xsd',
+    'xbmc.metadata.scraper.musicvideos': 'scraper.xsd',
+    'xbmc.metadata.scraper.tvshows': 'scraper.xsd',
+    'xbmc.metadata.scraper.library': 'scraper.xsd',
+    'xbmc.player.musicviz': 'binary_visualization.xsd',
+    'xbmc.python.script': 'pythonscript.xsd',
+    'xbmc.python.lyrics': 'script.xsd',
+    'xbmc.python.weather': 'script.xsd',
+    'xbmc.python.library': 'script.xsd',
+    'xbmc.python.pluginsource': 'pluginsource.xsd',
+    'xbmc.python.module': 'script.xsd',
+    'xbmc.service': 'service.xsd',
+    'xbmc.subtitle.module': 'script.xsd',
+    'xbmc.ui.screensaver': 'script.xsd',
+    'xbmc.webinterface': 'webinterface.xsd',
+}
+
+
+def schemas(report: Report, parsed_xml, branch_name):
     """validates XML file with existing schemas
     :parsed_xml: parsed data from an XML file
     """
-    parsed_xml = copy.copy(CONST_parsed_xml)
-    failed, metadatacount, valid = _validation_checks(report, parsed_xml, branch_name)
+    failed, metadatacount, valid, validated = _validation_checks(report, parsed_xml, branch_name)
+
+    # the root schema only covers the children that were not validated by an extension point schema,
+    # validate a stub holding those children instead of copying and pruning the parsed tree
+    root = parsed_xml.makeelement(parsed_xml.tag, parsed_xml.attrib)
+    root.text = parsed_xml.text
+    root.extend(child for child in parsed_xml if child not in validated)
 
     root_schema = join(XML_SCHEMA, 'addon.xsd')
-    if not _validate(parsed_xml, root_schema):
+    if not _validate(report, root, root_schema, "root addon element"):
         report.add(Record(PROBLEM, "Schema validation failed for root addon element"))
         valid = False
 
@@ -47,90 +92,91 @@ def _validation_checks(report: Report, parsed_xml, branch_name):
     metadatacount = 0
     valid = True
     failed = []
-    valid_points = {
-        'kodi.audiodecoder': 'binary_audiodecoder.xsd',
-        'kodi.audioencoder': 'binary_audioencoder.xsd',
-        'kodi.context.item': 'contextitem.xsd',
-        'kodi.gameclient': 'binary_gameclient.xsd',
-        'kodi.game.controller': 'controller.xsd',
-        'kodi.imagedecoder': 'binary_imagedecoder.xsd',
-        'kodi.inputstream': 'binary_inputstream.xsd',
-        'kodi.peripheral': 'binary_peripheral.xsd',
-        'kodi.pvrclient': 'binary_pvr.xsd',
-        'kodi.resource.games': 'games.xsd',
-        'kodi.resource.images': 'images.xsd',
-        'kodi.resource.language': 'language.xsd',
-        'kodi.addon.metadata': 'metadata.xsd',
-        'kodi.resource.uisounds': 'uisounds.xsd',
-        'kodi.resource.font': 'font.xsd',
-        'kodi.vfs': 'binary_vfs.xsd',
-        'xbmc.addon.metadata': 'metadata.xsd',
-        'xbmc.addon.repository': 'repository.xsd',
-        'xbmc.gui.skin': 'skin.xsd',
-        'xbmc.metadata.scraper.albums': 'scraper.xsd',
-        'xbmc.metadata.scraper.artists': 'scraper.xsd',
-        'xbmc.metadata.scraper.movies': 'scraper.xsd',
-        'xbmc.metadata.scraper.musicvideos': 'scraper.xsd',
-        'xbmc.metadata.scraper.tvshows': 'scraper.xsd',
-        'xbmc.metadata.scraper.library': 'scraper.xsd',
-        'xbmc.player.musicviz': 'binary_visualization.xsd',
-        'xbmc.python.script': 'pythonscript.xsd',
-        'xbmc.python.lyrics': 'script.xsd',
-        'xbmc.python.weather': 'script.xsd',
-        'xbmc.python.library': 'script.xsd',
-        'xbmc.python.pluginsource': 'pluginsource.xsd',
-        'xbmc.python.module': 'script.xsd',
-        'xbmc.service': 'service.xsd',
-        'xbmc.subtitle.module': 'script.xsd',
-        'xbmc.ui.screensaver': 'script.xsd',
-        'xbmc.webinterface': 'webinterface.xsd',
-    }
+    validated = []
+    schema_table = _schema_table(branch_name)
 
     for extension in parsed_xml.findall("extension"):
         extension_point = extension.get("point")
-        if extension_point in valid_points:
-            schema_path = check_version(branch_name, valid_points[extension_point])
+        if extension_point in VALID_POINTS:
+            schema_path = schema_table[extension_point]
 
             if schema_path:
                 if extension_point in ("xbmc.addon.metadata", "kodi.addon.metadata"):
                     metadatacount += 1
 
-                if not exists(schema_path):
-                    report.add(Record(PROBLEM, f"{schema_path} doesn't exist"))
-                    continue
-
-                if not _validate(extension, schema_path):
+                if not _validate(report, extension, schema_path, extension_point):
                     failed.append(extension_point)
                     valid = False
 
-                parsed_xml.remove(extension)
+                validated.append(extension)
             else:
                 report.add(Record(PROBLEM, f"schema for {extension_point} doesn't exists"))
         else:
             report.add(Record(PROBLEM, f"{extension_point} is not a valid extension point"))
             valid = False
 
-    return failed, metadatacount, valid
+    return failed, metadatacount, valid, validated
+
+
+@lru_cache(maxsize=None)
+def _schema_table(branch_name):
+    """Map every extension point to the schema used for the given branch, i.e. the
+    schema of the branch itself or of the closest lower branch, None if there is none
+    """
+    return {extension_point: check_version(branch_name, schema_file)
+            for extension_point, schema_file in VALID_POINTS.items()}
+
+
+@lru_cache(maxsize=None)
+def _schema_files():
+    # listed once, so resolving the schemas does not stat the filesystem
+    return frozenset(os.listdir(XML_SCHEMA))
 
 
-def _validate(xml, schemapath):
-    """Validates given XML file/element with a given schema
+@lru_cache(maxsize=None)
+def _realpath(schemapath):
+    # realpath lstat()s every component of the path, resolve each schema path once
+    return os.path.realpath(schemapath)
+
+
+class SchemaRegistry():
+    """Process-wide registry of compiled schemas, keyed by their resolved path,
+    so every schema is only compiled once per run.
+    """
+    schemas = {}
+
+    @classmethod
+    def get(cls, schemapath):
+        path = _realpath(schemapath)
+        schema = cls.schemas.get(path)
+        if schema is None:
+            schema = cls.schemas[path] = xmlschema.XMLSchema(path)
+        return schema
+
+
+def _validate(report: Report, xml, schemapath, name):
+    """Validates given XML file/element with a given schema, every
+    validation error is added to the report as information, the
+    caller reports the failed validation as a problem
 
     :xml: parsed xml element/file
     :schemapath: path to a schema file
+    :name: name of the validated element used in the report
     """
-    schema = xmlschema.XMLSchema(schemapath)
-    for error in schema.iter_errors(xml):
-        print(error)
-    return schema.is_valid(xml)
+    valid = True
+    for error in SchemaRegistry.get(schemapath).iter_errors(xml):
+        valid = False
+        report.add(Record(INFORMATION, f"Schema validation error for {name}: "
+                                       f"{error.reason or error.message} (path: {error.path})"))
+    return valid
 
 
 def check_version(branch_name, schema_file):
+    """Return the path of the given schema for the given branch, None if there is none"""
     all_branches = ValidKodiVersions[::-1]
     branches = all_branches[all_branches.index(branch_name)::1]
     for branch in branches:
         file = branch + '_' + schema_file
-        schema_file_path = join(XML_SCHEMA, file)
-        if exists(schema_file_path):
-            return schema_file_path
+        if file in _schema_files():
+            return join(XML_SCHEMA, file)
     return None
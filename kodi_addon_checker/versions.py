@@ -6,18 +6,31 @@
     See LICENSES/README.md for more information.
 """
 
+from functools import lru_cache
+
 from packaging.version import parse
 from kodi_addon_checker import ValidKodiVersions
 
+# position of every branch, used to compare KodiVersion objects
+_KODI_ORDINALS = {version: ordinal for ordinal, version in enumerate(ValidKodiVersions)}
+
+
+@lru_cache(maxsize=None)
+def _parse_version(version):
+    """Parse an add-on version string, the same strings are parsed over and over
+       (repository indexes, dependencies, VERSION_ATTRB) so the results are shared
+    """
+    # non PEP440 compliant versions (legacy), for beta and alpha versions
+    # convert them into PEP440 format: 1.1.0~beta01 -> 1.1.0beta01
+    if "~beta" in version or "~alpha" in version:
+        version = version.replace("~", "")
+
+    return parse(str(version).lower())
+
 
 class AddonVersion():
     def __init__(self, version):
-        # non PEP440 compliant versions (legacy), for beta and alpha versions
-        # convert them into PEP440 format: 1.1.0~beta01 -> 1.1.0beta01
-        if "~beta" in version or "~alpha" in version:
-            version = version.replace("~", "")
-
-        self.version = parse(str(version).lower())
+        self.version = _parse_version(version)
 
     def __lt__(self, other):
         if not isinstance(other, self.__class__):
@@ -35,6 +48,9 @@ class AddonVersion():
     def __ne__(self, other):
         return not isinstance(other, self.__class__) or self.version != other.version
 
+    def __hash__(self):
+        return hash(self.version)
+
     def __gt__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError()
@@ -51,20 +67,21 @@ class AddonVersion():
 
 class KodiVersion():
     def __init__(self, version: str):
-        if version not in ValidKodiVersions:
+        if version not in _KODI_ORDINALS:
             raise ValueError("Invalid KodiVersion")
         super().__init__()
         self.version = version
+        self.ordinal = _KODI_ORDINALS[version]
 
     def __lt__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError()
-        return ValidKodiVersions.index(self.version) < ValidKodiVersions.index(other.version)
+        return self.ordinal < other.ordinal
 
     def __le__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError()
-        return ValidKodiVersions.index(self.version) <= ValidKodiVersions.index(other.version)
+        return self.ordinal <= other.ordinal
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.version == other.version
@@ -72,15 +89,18 @@ class KodiVersion():
     def __ne__(self, other):
         return not isinstance(other, self.__class__) or self.version != other.version
 
+    def __hash__(self):
+        return hash(self.version)
+
     def __gt__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError()
-        return ValidKodiVersions.index(self.version) > ValidKodiVersions.index(other.version)
+        return self.ordinal > other.ordinal
 
     def __ge__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError()
-        return ValidKodiVersions.index(self.version) >= ValidKodiVersions.index(other.version)
+        return self.ordinal >= other.ordinal
 
     def __repr__(self):
         return str(self.version)
@@ -0,0 +1,213 @@
+"""
+    Copyright (C) 2024 Team Kodi
+    This file is part of Kodi - kodi.tv
+
+    SPDX-License-Identifier: GPL-3.0-only
+    See LICENSES/README.md for more information.
+"""
+
+import json
+import re
+from xml.parsers import expat
+
+from .common import CHUNK_SIZE
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+STRING_CONTENT = re.compile(r'(?:[^"\\\x00-\x1f]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+# constants accepted by the json module next to numbers
+LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+# longest token that can be cut by the end of a chunk without being a string or number
+MAX_LOOKAHEAD = len("-Infinity")
+
+DECODER = json.JSONDecoder()
+
+# what the JSON tokenizer expects next
+VALUE, FIRST_VALUE, KEY, FIRST_KEY, COLON, SEPARATOR, END = range(7)
+
+
+class MalformedError(ValueError):
+    def __init__(self, msg: str, lineno: int, colno: int):
+        """
+        A file is not well-formed.
+        :param msg: description of the error
+        :param lineno: line of the error, starting at 1
+        :param colno: column of the error, starting at 1
+        """
+        super().__init__(f"{msg}: line {lineno}, column {colno}")
+        self.msg = msg
+        self.lineno = lineno
+        self.colno = colno
+
+
+def check_xml(path: str):
+    """Check that a file is well-formed XML, feeding it to expat in chunks without building a tree.
+    Namespaces and undefined entities are handled like xml.etree.ElementTree does.
+        :path: path of the file
+        :raises MalformedError: if the file is not well-formed
+        :raises OSError: if the file cannot be read
+    """
+    parser = expat.ParserCreate(None, "}")
+
+    def skipped_entity(name, is_parameter_entity):
+        if not is_parameter_entity:
+            raise MalformedError(f"undefined entity &{name};", parser.CurrentLineNumber,
+                                 parser.CurrentColumnNumber + 1)
+
+    parser.SkippedEntityHandler = skipped_entity
+    with open(path, "rb") as xml_file:
+        try:
+            while chunk := xml_file.read(CHUNK_SIZE):
+                parser.Parse(chunk, False)
+            parser.Parse(b"", True)
+        except expat.ExpatError as error:
+            raise MalformedError(expat.ErrorString(error.code), error.lineno, error.offset + 1) from None
+        except LookupError as error:
+            # the declared encoding is not known
+            raise MalformedError(str(error), parser.CurrentLineNumber, parser.CurrentColumnNumber + 1) from None
+
+
+def check_json(path: str):
+    """Check that a utf-8 file is a well-formed JSON document, accepting what the json module accepts.
+    The file is tokenized in chunks, only the containers found within a chunk are decoded at once.
+        :path: path of the file
+        :raises MalformedError: if the file is not well-formed
+        :raises UnicodeDecodeError: if the file is not utf-8 encoded
+        :raises OSError: if the file cannot be read
+    """
+    with open(path, "r", encoding="utf8") as json_file:
+        _JsonTokenizer(json_file).run()
+
+
+class _JsonTokenizer():
+    def __init__(self, json_file):
+        self.file = json_file
+        self.buffer = ""
+        self.eof = False
+        # line number and offset in the buffer of the start of the line at the start of the buffer
+        self.lineno = 1
+        self.line_start = 0
+        # brackets of the open containers and what is expected next
+        self.stack = []
+        self.expect = VALUE
+
+    def _fill(self, position):
+        """Drop the buffer before position and append the next chunk, return the new position"""
+        consumed = self.buffer[:position]
+        newlines = consumed.count("\n")
+        if newlines:
+            self.lineno += newlines
+            self.line_start = consumed.rfind("\n") + 1
+        self.line_start -= position
+        chunk = self.file.read(CHUNK_SIZE)
+        self.eof = not chunk
+        self.buffer = self.buffer[position:] + chunk
+        return 0
+
+    def _error(self, msg, position):
+        lines = self.buffer.count("\n", 0, position)
+        line_start = self.buffer.rfind("\n", 0, position) + 1 if lines else self.line_start
+        raise MalformedError(msg, self.lineno + lines, position - line_start + 1)
+
+    def run(self):
+        # a chunk is kept ahead of the current position, so most containers can be decoded at once
+        lookahead = max(CHUNK_SIZE, MAX_LOOKAHEAD)
+        position = self._fill(0)
+        if self.buffer.startswith("\ufeff"):
+            self._error("Unexpected UTF-8 BOM", position)
+        while True:
+            position = WHITESPACE.match(self.buffer, position).end()
+            if not self.eof and len(self.buffer) - position <= lookahead:
+                position = self._fill(position)
+                continue
+            if position == len(self.buffer):
+                self._finish(position)
+                return
+
+            char = self.buffer[position]
+            expect = self.expect
+            if expect == END:
+                self._error("Extra data", position)
+            if expect in (SEPARATOR, FIRST_VALUE, FIRST_KEY) and char == ("]" if self.stack[-1] == "[" else "}"):
+                self.stack.pop()
+                self.expect = SEPARATOR if self.stack else END
+                position += 1
+            elif expect == SEPARATOR:
+                position = self._separator(char, position)
+            elif expect == COLON:
+                position = self._colon(char, position)
+            elif expect in (KEY, FIRST_KEY):
+                if char != '"':
+                    self._error("Expecting property name enclosed in double quotes", position)
+                position = self._string(position)
+                self.expect = COLON
+            elif char in "[{":
+                position = self._container(char, position)
+            else:
+                position = self._string(position) if char == '"' else self._scalar(position)
+                self.expect = SEPARATOR if self.stack else END
+
+    def _finish(self, position):
+        """Check that the document is complete at the end of the file"""
+        if self.expect != END:
+            self._error("Expecting value" if self.expect in (VALUE, FIRST_VALUE) else "Unexpected end of data",
+                        position)
+
+    def _separator(self, char, position):
+        """Return the position after the separator of the values of the current container"""
+        if char != ",":
+            self._error("Expecting ',' delimiter", position)
+        self.expect = VALUE if self.stack[-1] == "[" else KEY
+        return position + 1
+
+    def _colon(self, char, position):
+        """Return the position after the colon following a key"""
+        if char != ":":
+            self._error("Expecting ':' delimiter", position)
+        self.expect = VALUE
+        return position + 1
+
+    def _container(self, char, position):
+        """Return the position after the container starting at position if it is decoded at once, or
+        after its opening bracket"""
+        try:
+            position = DECODER.raw_decode(self.buffer, position)[1]
+            self.expect = SEPARATOR if self.stack else END
+            return position
+        except (ValueError, RecursionError):
+            # the container continues in the next chunk or is malformed
+            pass
+        self.stack.append(char)
+        self.expect = FIRST_VALUE if char == "[" else FIRST_KEY
+        return position + 1
+
+    def _string(self, position):
+        """Return the position after the string starting at position"""
+        content = position + 1
+        while True:
+            end = STRING_CONTENT.match(self.buffer, content).end()
+            if end < len(self.buffer) - 6 or self.eof:
+                break
+            # the string or an escape sequence may continue in the next chunk, long strings are
+            # matched on from where the previous chunk ended
+            content = end - position
+            position = self._fill(position)
+        if end == len(self.buffer):
+            self._error("Unterminated string", position)
+        if self.buffer[end] != '"':
+            self._error("Invalid control character" if self.buffer[end] != "\\" else "Invalid \\escape", end)
+        return end + 1
+
+    def _scalar(self, position):
+        """Return the position after the number or literal starting at position"""
+        while True:
+            match = NUMBER.match(self.buffer, position)
+            if not match or match.end() < len(self.buffer) or self.eof:
+                break
+            position = self._fill(position)
+        for literal in LITERALS:
+            if self.buffer.startswith(literal, position):
+                return position + len(literal)
+        if not match:
+            self._error("Expecting value", position)
+        return match.end()
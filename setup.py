@@ -21,7 +21,7 @@ setuptools.setup(
     author="Team Kodi",
     url="https://github.com/xbmc/addon-check",
     download_url="https://github.com/xbmc/addon-check/archive/master.zip",
-    packages=setuptools.find_packages(exclude=["script.test", "tests*"]),
+    packages=setuptools.find_packages(exclude=["script.test", "tests*", "benchmarks*"]),
     package_data={"kodi_addon_checker": ["xml_schema/*.xsd"]},
     install_requires=requirements,
     python_requires=">=3.8",
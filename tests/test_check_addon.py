@@ -1,4 +1,6 @@
 import unittest
+from os.path import abspath, dirname, join
+
 from kodi_addon_checker.check_addon import get_all_repo_addons
 from kodi_addon_checker.check_addon import start
 from kodi_addon_checker.common import load_plugins
@@ -6,6 +8,9 @@ from kodi_addon_checker.record import Record
 from kodi_addon_checker.reporter import ReportManager
 from kodi_addon_checker.config import Config
 
+# used for every branch, so the test does not depend on the mirrors
+REPO_INDEX = join(abspath(dirname(__file__)), "fixtures", "repository", "addons.xml")
+
 
 class Args():
     PR = False
@@ -24,7 +29,7 @@ class TestCheckAddon(unittest.TestCase):
         load_plugins()
         self.config = Config(self.path)
         ReportManager.enable(["array"])
-        self.all_repo_addons = get_all_repo_addons()
+        self.all_repo_addons = get_all_repo_addons(repo_index=[REPO_INDEX])
         self.args = Args()
         self.args.skip_dependency_checks = False
 
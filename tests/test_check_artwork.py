@@ -0,0 +1,137 @@
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from os.path import getsize, join
+from unittest import mock
+
+from PIL import Image
+
+from kodi_addon_checker import check_artwork, common
+from kodi_addon_checker.check_artwork import DEFAULT_IMAGE_BUDGET, ArtworkOptions, ImageBudget
+from kodi_addon_checker.common import load_plugins
+from kodi_addon_checker.handle_files import FileIndex
+from kodi_addon_checker.record import Record
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.reporter import ReportManager
+from kodi_addon_checker.runner import CheckTimeout
+from kodi_addon_checker.versions import KodiVersion
+
+
+class ArtworkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        load_plugins()
+        ReportManager.enable(["array"])
+        self.path = tempfile.mkdtemp()
+        self.rel_path = common.REL_PATH
+        common.REL_PATH = self.path
+
+    def tearDown(self):
+        common.REL_PATH = self.rel_path
+        shutil.rmtree(self.path)
+
+    def image(self, name, damage=None):
+        image_path = join(self.path, name)
+        Image.effect_noise((200, 200), 50).convert("RGB").save(image_path)
+        if damage:
+            with open(image_path, "rb") as image_file:
+                data = image_file.read()
+            with open(image_path, "wb") as image_file:
+                image_file.write(damage(data))
+        return image_path
+
+    def records(self, check, *args):
+        ReportManager.getEnabledReporters()[0].reports = []
+        check(Report(""), *args)
+        return [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+
+class TestVerifyImageFile(ArtworkTestCase):
+
+    def verify(self, image_path, budget=DEFAULT_IMAGE_BUDGET):
+        return self.records(check_artwork._verify_image_file,  # pylint: disable=protected-access
+                            image_path, 10, budget)
+
+    def test_valid(self):
+        self.assertEqual(self.verify(self.image("image.png")), [])
+        self.assertEqual(self.verify(self.image("image.jpg")), [])
+
+    def test_truncated(self):
+        for name in ("image.png", "image.jpg"):
+            with self.subTest(name=name):
+                records = self.verify(self.image(name, lambda data: data[:len(data) // 2]))
+                self.assertEqual(len(records), 1)
+                self.assertTrue(records[0].startswith(
+                    f"ERROR: Image data is corrupted, it could not be decoded. ./{name} ("))
+
+    def test_checksum(self):
+        records = self.verify(self.image("image.png", lambda data: data[:-40] + b"\0" + data[-39:]))
+        self.assertEqual(len(records), 1)
+        self.assertTrue(records[0].startswith("ERROR: Image data is corrupted"))
+
+    def test_not_an_image(self):
+        self.assertEqual(self.verify(self.image("image.png", lambda data: b"not an image")), [])
+
+    def test_timeout(self):
+        image_path = self.image("image.png")
+        with mock.patch.object(Image.Image, "load", side_effect=CheckTimeout("took longer than 10s")):
+            self.assertEqual(self.verify(image_path),
+                             ["WARN: Image could not be verified, decoding it took longer than 10s. ./image.png"])
+
+    def test_over_budget(self):
+        self.assertEqual(self.verify(self.image("image.png", lambda data: data[:len(data) // 2]),
+                                     ImageBudget(100, 0)), [])
+
+
+class TestImageBudget(ArtworkTestCase):
+
+    def check(self, image_path, budget):
+        return self.records(check_artwork._check_image_file,  # pylint: disable=protected-access
+                            image_path, budget)
+
+    def test_within_budget(self):
+        self.assertEqual(self.check(self.image("image.png"), ImageBudget(200 * 200, 1024)), [])
+        self.assertEqual(self.check(self.image("image.png"), ImageBudget(0, 0)), [])
+
+    def test_pixels(self):
+        self.assertEqual(self.check(self.image("image.png"), ImageBudget(200 * 200 - 1, 0)),
+                         ["ERROR: Image has too many pixels to be decoded, it has 200x200 pixels and the limit is "
+                          "39999 pixels. ./image.png"])
+
+    def test_file_size(self):
+        image_path = self.image("image.png")
+        self.assertEqual(self.check(image_path, ImageBudget(0, 1)),
+                         [f"ERROR: Image file is too large to be decoded, it has {getsize(image_path) // 1024} KB "
+                          "and the limit is 1 KB. ./image.png"])
+
+    def test_refused_by_pil_without_budget(self):
+        image_path = self.image("image.png")
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+            self.assertEqual(self.check(image_path, ImageBudget(0, 0)),
+                             ["ERROR: Image has too many pixels to be decoded, PIL refuses to open it. ./image.png"])
+
+    def test_refused_by_pil(self):
+        image_path = self.image("image.bmp")
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+            self.assertEqual(self.check(image_path, DEFAULT_IMAGE_BUDGET),
+                             ["ERROR: Image has too many pixels to be decoded, PIL refuses to open it. ./image.bmp"])
+
+
+class TestCheckArtwork(ArtworkTestCase):
+
+    def check(self, options):
+        parsed_xml = ET.fromstring('<addon id="script.test"><extension point="xbmc.addon.metadata">'
+                                   '<assets><icon>icon.png</icon></assets></extension></addon>')
+        return self.records(check_artwork.check_artwork, self.path, parsed_xml, FileIndex(self.path), options)
+
+    def test_kodi_version(self):
+        self.image("icon.png")
+        self.assertIn("ERROR: icon should have either 256x256 or 512x512 but it has 200x200",
+                      self.check(KodiVersion("matrix")))
+
+    def test_options(self):
+        self.image("icon.png")
+        self.assertIn("ERROR: Image has too many pixels to be decoded, it has 200x200 pixels and the limit is "
+                      "100 pixels. ./icon.png",
+                      self.check(ArtworkOptions(KodiVersion("matrix"), budget=ImageBudget(100, 0))))
@@ -1,8 +1,11 @@
 import os
+import shutil
+import tempfile
 import unittest
 from os.path import abspath, dirname, join
 
-from kodi_addon_checker.check_files import check_file_permission, check_file_whitelist
+from kodi_addon_checker.check_files import (check_file_permission, check_file_whitelist,
+                                            check_for_invalid_json_files, check_for_invalid_xml_files)
 from kodi_addon_checker.handle_files import create_file_index
 
 from kodi_addon_checker.common import load_plugins
@@ -47,3 +50,38 @@ class TestCheckFilePermission(unittest.TestCase):
         records = [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
         self.assertGreater(len(records), 0)
         self.assertEqual(records[-1], string)
+
+
+class TestCheckFileList(unittest.TestCase):
+
+    def setUp(self):
+        load_plugins()
+        ReportManager.enable(["array"])
+        self.report = Report("")
+        self.path = tempfile.mkdtemp()
+        for name, content in (("addon.xml", "<addon>"), ("settings.json", "{}"), ("run.exe", "")):
+            with open(join(self.path, name), "w", encoding="utf8") as f:
+                f.write(content)
+        # the list of create_file_index is accepted in place of a FileIndex
+        self.file_index = [{"path": self.path, "name": name} for name in sorted(os.listdir(self.path))]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def records(self):
+        return [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+    def test_invalid_xml_files(self):
+        check_for_invalid_xml_files(self.report, self.file_index)
+        self.assertEqual(self.report.problem_count, 1)
+        self.assertIn(relative_path(join(self.path, "addon.xml")), self.records()[-1])
+
+    def test_invalid_json_files(self):
+        check_for_invalid_json_files(self.report, self.file_index)
+        self.assertEqual(self.report.problem_count, 0)
+
+    def test_file_whitelist(self):
+        check_file_whitelist(self.report, self.file_index, self.path)
+        self.assertEqual(self.report.warning_count, 1)
+        filename = relative_path(join(self.path, 'run.exe'))
+        self.assertEqual(self.records()[-1], f"WARN: Found non whitelisted file ending in filename {filename}")
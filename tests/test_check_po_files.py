@@ -178,3 +178,22 @@ class TestPOFiles(unittest.TestCase):
         records = [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
         output = [s for s in records if s.startswith(matches)]
         self.assertListEqual(expected, output)
+
+    def test_check_for_invalid_strings_po_windows_line_endings(self):
+        ReportManager.getEnabledReporters()[0].reports = []
+
+        path = join(self.path, "crlf")
+        language_path = join(path, "resources", "language", "resource.language.en_gb")
+        full_path = join(language_path, "strings.po")
+
+        file_index = [{"path": language_path, "name": "strings.po"}]
+
+        expected = [f"WARN: Windows line endings found in { relative_path(full_path) }, "
+                    "consider converting to Linux line endings.",
+                    "INFO: PO files are valid"]
+
+        check_for_invalid_strings_po(self.report, file_index)
+
+        records = [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+        self.assertListEqual(expected, records)
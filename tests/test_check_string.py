@@ -0,0 +1,86 @@
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+from kodi_addon_checker.check_string import find_blacklisted_strings
+from kodi_addon_checker.common import load_plugins
+from kodi_addon_checker.handle_files import FileIndex, TermScanner, find_in_file
+from kodi_addon_checker.record import Record
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.reporter import ReportManager
+
+
+class TestFindBlacklistedStrings(unittest.TestCase):
+
+    def setUp(self):
+        load_plugins()
+        ReportManager.enable(["array"])
+        ReportManager.getEnabledReporters()[0].reports = []
+        self.report = Report("")
+        self.path = tempfile.mkdtemp()
+        with open(join(self.path, "Home.xml"), "w", encoding="utf8") as xml_file:
+            xml_file.write("<visible>StringCompare(a,b)</visible>\n"
+                           "<label>ListItem.SubChannelNumber</label>\n"
+                           "<visible>SubString(a,b) + StringCompare(b,c)</visible>\n")
+        with open(join(self.path, "main.py"), "w", encoding="utf8") as py_file:
+            py_file.write("xbmc.getCondVisibility('SubString(a,b)')\n")
+        with open(join(self.path, "notes.txt"), "w", encoding="utf8") as txt_file:
+            txt_file.write("StringCompare\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def records(self):
+        return [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+    def test_problems_before_warnings(self):
+        find_blacklisted_strings(self.report, FileIndex(self.path), ["StringCompare", "ChannelNumber"],
+                                 ["SubString"], [".py", ".xml"])
+        xml_path = join(self.path, "Home.xml")
+        py_path = join(self.path, "main.py")
+        self.assertEqual(sorted(self.records()), sorted([
+            f"ERROR: Found blacklisted term StringCompare in file {xml_path}:1 (<visible>StringCompare(a,b)</visible>)",
+            f"ERROR: Found blacklisted term ChannelNumber in file {xml_path}:2 "
+            "(<label>ListItem.SubChannelNumber</label>)",
+            f"ERROR: Found blacklisted term StringCompare in file {xml_path}:3 "
+            "(<visible>SubString(a,b) + StringCompare(b,c)</visible>)",
+            f"WARN: Found blacklisted term SubString in file {xml_path}:3 "
+            "(<visible>SubString(a,b) + StringCompare(b,c)</visible>)",
+            f"WARN: Found blacklisted term SubString in file {py_path}:1 (xbmc.getCondVisibility('SubString(a,b)'))",
+        ]))
+        levels = [record.split(":")[0] for record in self.records()]
+        self.assertEqual(levels, sorted(levels))
+        self.assertEqual(self.report.problem_count, 3)
+
+    def test_overlapping_terms(self):
+        results = find_in_file(FileIndex(self.path), ["SubChannelNumber", "ChannelNumber", "Sub"], [".xml"])
+        self.assertEqual([(result["term"], result["linenumber"]) for result in results],
+                         [("SubChannelNumber", 2), ("ChannelNumber", 2), ("Sub", 2), ("Sub", 3)])
+
+    def test_all_file_types(self):
+        results = find_in_file(FileIndex(self.path), ["StringCompare"], [])
+        self.assertEqual(sorted(result["searchfile"] for result in results),
+                         sorted([join(self.path, "Home.xml"), join(self.path, "Home.xml"),
+                                 join(self.path, "notes.txt")]))
+
+    def test_undecodable_content(self):
+        with open(join(self.path, "latin1.py"), "wb") as py_file:
+            py_file.write(b"# caf\xe9\nvisible = 'StringCompare'\n")
+        results = find_in_file(FileIndex(self.path), ["StringCompare"], [".py"])
+        self.assertEqual([(result["linenumber"], result["line"]) for result in results],
+                         [(2, "visible = 'StringCompare'")])
+
+    def test_line_endings(self):
+        with open(join(self.path, "Home.xml"), "wb") as xml_file:
+            xml_file.write(b"SubString\r\n\r\nStringCompare\rend\rStringCompare\n\nSubString")
+        results = find_in_file(FileIndex(self.path), ["StringCompare", "SubString"], [".xml"])
+        self.assertEqual([(result["term"], result["linenumber"]) for result in results],
+                         [("SubString", 1), ("StringCompare", 3), ("StringCompare", 5), ("SubString", 7)])
+
+    def test_memory_mapped_files(self):
+        with mock.patch.object(TermScanner, "MMAP_THRESHOLD", 1):
+            mapped = find_in_file(FileIndex(self.path), ["StringCompare", "SubString"], [".py", ".xml"])
+        self.assertEqual(mapped, find_in_file(FileIndex(self.path), ["StringCompare", "SubString"], [".py", ".xml"]))
+        self.assertEqual(len(mapped), 4)
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 #
 
+import hashlib
 import os
+from unittest import mock
 
+import pytest
 from PIL import Image
 
-from kodi_addon_checker.common import has_transparency
+from kodi_addon_checker import common
+from kodi_addon_checker.common import file_sha256, has_transparency, write_atomic
 from kodi_addon_checker.config import Config
 
 FIXTURE_PATH = os.path.join("tests", "fixtures")
@@ -49,3 +53,60 @@ def test_has_transparency_rgba():
 def test_has_transparency_rgba_transparency():
     image = __load_image("rgba_icon_transparency.png")
     assert has_transparency(image) is True
+
+
+def test_has_transparency_la():
+    assert has_transparency(Image.new("LA", (4, 4), (10, 255))) is False
+    image = Image.new("LA", (4, 4), (10, 255))
+    image.putpixel((3, 3), (10, 128))
+    assert has_transparency(image) is True
+
+
+def test_has_transparency_palette():
+    image = Image.new("P", (4, 4), 1)
+    image.putpixel((3, 3), 2)
+    image.info["transparency"] = 0
+    assert has_transparency(image) is False
+    image.info["transparency"] = 2
+    assert has_transparency(image) is True
+    image.info["transparency"] = b"\xff\xff\x80"
+    assert has_transparency(image) is True
+    image.info["transparency"] = b"\x00\xff"
+    assert has_transparency(image) is False
+
+
+def test_has_transparency_transparent_color():
+    image = Image.new("RGB", (4, 4), (1, 2, 3))
+    image.info["transparency"] = (0, 0, 0)
+    assert has_transparency(image) is False
+    image.putpixel((0, 0), (0, 0, 0))
+    assert has_transparency(image) is True
+
+
+def test_file_sha256(tmp_path):
+    path = tmp_path / "payload"
+    path.write_bytes(b"0123456789" * 10)
+    with mock.patch.object(common, "CHUNK_SIZE", 7):
+        assert file_sha256(str(path)).hexdigest() == hashlib.sha256(b"0123456789" * 10).hexdigest()
+
+
+def test_write_atomic(tmp_path):
+    path = str(tmp_path / "payload")
+    write_atomic(path, [b"first", b" second"])
+    with open(path, "rb") as payload:
+        assert payload.read() == b"first second"
+
+
+def test_write_atomic_keeps_previous_file(tmp_path):
+    path = str(tmp_path / "payload")
+    write_atomic(path, [b"previous"])
+
+    def chunks():
+        yield b"partial"
+        raise OSError("download failed")
+
+    with pytest.raises(OSError):
+        write_atomic(path, chunks())
+    with open(path, "rb") as payload:
+        assert payload.read() == b"previous"
+    assert os.listdir(str(tmp_path)) == ["payload"]
@@ -1,11 +1,12 @@
 import unittest
 import tempfile
 import shutil
-from os import makedirs
+import subprocess
+from os import makedirs, walk
 from os.path import abspath, dirname, join
 
 from kodi_addon_checker.handle_files import find_file
-from kodi_addon_checker.handle_files import create_file_index
+from kodi_addon_checker.handle_files import FileIndex, as_file_index, changed_files, create_file_index
 from kodi_addon_checker.handle_files import find_files_recursive as FFR
 
 HERE = abspath(dirname(__file__))
@@ -71,3 +72,107 @@ class TestCreateFileIndex(unittest.TestCase):
         expected_list = [{'path': path, 'name': 'file_index.py'}]
         output = create_file_index(path)
         self.assertListEqual(output, expected_list)
+
+
+class TestFileIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for directory in ("resources/language/resource.language.en_gb", "resources/lib", ".git/objects"):
+            makedirs(join(self.path, directory))
+        for file in ("addon.xml", "Icon.PNG", "resources/language/resource.language.en_gb/strings.po",
+                     "resources/lib/main.py", ".git/objects/blob"):
+            with open(join(self.path, file), "w", encoding="utf8") as f:
+                f.write("data")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_files(self):
+        file_index = FileIndex(self.path)
+        self.assertEqual(sorted(entry.relpath for entry in file_index),
+                         sorted(["addon.xml", "Icon.PNG", join("resources", "language", "resource.language.en_gb",
+                                                               "strings.po"), join("resources", "lib", "main.py")]))
+        entry = next(entry for entry in file_index if entry.name == "Icon.PNG")
+        self.assertEqual(entry.ext, ".png")
+        self.assertEqual(entry.stat.st_size, 4)
+        self.assertEqual(entry["path"], self.path)
+        self.assertEqual(entry.full_path, join(self.path, "Icon.PNG"))
+
+    def test_same_files_as_os_walk(self):
+        expected = []
+        for root, folders, files in walk(self.path):
+            if ".git" in folders:
+                folders.remove(".git")
+            expected.extend(join(root, file) for file in files)
+        self.assertListEqual([entry.full_path for entry in FileIndex(self.path)], expected)
+
+    def test_directories(self):
+        file_index = FileIndex(self.path)
+        self.assertEqual(file_index.subdirectories("resources", "language"), ["resource.language.en_gb"])
+        self.assertIsNone(file_index.subdirectories("resources", "skins"))
+        self.assertEqual(list(file_index.find_recursive("strings", "resources", "language")),
+                         [join(self.path, "resources", "language", "resource.language.en_gb", "strings.po")])
+
+    def test_buckets(self):
+        file_index = FileIndex(self.path)
+        self.assertEqual([entry.name for entry in file_index.with_extension(".png")], ["Icon.PNG"])
+        self.assertEqual([entry.name for entry in file_index.with_extension(".xml", ".py")],
+                         [entry.name for entry in file_index if entry.ext in (".xml", ".py")])
+        self.assertEqual([entry.relpath for entry in file_index.named("strings.po")],
+                         [join("resources", "language", "resource.language.en_gb", "strings.po")])
+        self.assertEqual(file_index.select(extensions=[".png"], names=["Icon.PNG"]),
+                         file_index.with_extension(".png"))
+        self.assertEqual(file_index.with_extension(".json"), [])
+
+    def test_restricted_to(self):
+        file_index = FileIndex(self.path)
+        restricted = file_index.restricted_to(["addon.xml", "resources/lib/main.py", "removed.py"])
+        self.assertEqual([entry.relpath for entry in restricted], ["addon.xml", join("resources", "lib", "main.py")])
+        self.assertEqual(restricted.named("strings.po"), [])
+        self.assertEqual(len(restricted.complete.named("strings.po")), 1)
+        self.assertEqual(restricted.subdirectories("resources", "language"), ["resource.language.en_gb"])
+
+    def test_from_files(self):
+        file_index = as_file_index(create_file_index(self.path))
+        expected = FileIndex(self.path)
+        self.assertEqual(file_index.root, self.path)
+        self.assertListEqual([(entry.full_path, entry.relpath, entry.stat.st_mode) for entry in file_index],
+                             [(entry.full_path, entry.relpath, entry.stat.st_mode) for entry in expected])
+        self.assertEqual(file_index.subdirectories("resources", "language"), ["resource.language.en_gb"])
+        self.assertEqual(file_index.named("strings.po")[0].full_path, expected.named("strings.po")[0].full_path)
+        self.assertIs(as_file_index(expected), expected)
+
+
+class TestChangedFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addon_path = join(self.path, "plugin.test")
+        makedirs(join(self.addon_path, "resources"))
+        for file in ("addon.xml", "resources/settings.xml", "README.md"):
+            self.write(file, "data")
+        self.git("init", "-q")
+        self.git("add", ".")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "base")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, file, content):
+        with open(join(self.addon_path, file), "w", encoding="utf8") as f:
+            f.write(content)
+
+    def git(self, *args):
+        subprocess.run(["git", "-C", self.path, *args], check=True)
+
+    def test_changed_files(self):
+        self.write("resources/settings.xml", "changed")
+        self.write("resources/new.py", "untracked")
+        self.git("rm", "-q", "plugin.test/README.md")
+        self.assertEqual(changed_files(self.addon_path, "HEAD"),
+                         {join("resources", "settings.xml"), join("resources", "new.py")})
+
+    def test_unknown_revision(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            changed_files(self.addon_path, "unknown-branch")
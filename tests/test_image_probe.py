@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+from PIL import Image
+
+from kodi_addon_checker import image_probe
+from kodi_addon_checker.image_probe import ImageInfo, probe, probe_headers
+
+
+class TestProbe(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def save(self, im, name, **params):
+        image_path = join(self.path, name)
+        im.save(image_path, **params)
+        return image_path
+
+    def assertSameAsPil(self, image_path):
+        with Image.open(image_path) as im:
+            self.assertEqual(probe(image_path), image_probe.from_image(im))
+
+    def test_png(self):
+        for mode in ("1", "L", "LA", "P", "RGB", "RGBA", "I;16"):
+            with self.subTest(mode=mode):
+                self.assertSameAsPil(self.save(Image.new(mode, (37, 21)), "image.png"))
+        self.assertSameAsPil(self.save(Image.new("RGB", (37, 21)), "image.png", transparency=(0, 0, 0)))
+        self.assertSameAsPil(self.save(Image.new("RGB", (37, 21)), "image.png", icc_profile=b"profile" * 20,
+                                       dpi=(72, 72)))
+        self.assertEqual(probe(self.save(Image.new("P", (10, 10)), "image.png", transparency=0)),
+                         ImageInfo("PNG", (10, 10), "P", True))
+
+    def test_jpeg(self):
+        for mode in ("L", "RGB", "CMYK"):
+            with self.subTest(mode=mode):
+                self.assertSameAsPil(self.save(Image.new(mode, (33, 17)), "image.jpg", progressive=True))
+        self.assertEqual(probe(self.save(Image.new("RGB", (1920, 1080)), "image.jpg")),
+                         ImageInfo("JPEG", (1920, 1080), "RGB", False))
+
+    def test_gif(self):
+        self.assertSameAsPil(self.save(Image.new("P", (20, 10)), "image.gif"))
+        self.assertSameAsPil(self.save(Image.new("P", (20, 10)), "image.gif", transparency=3))
+        self.assertSameAsPil(self.save(Image.new("L", (20, 10)), "image.gif"))
+
+    def test_left_to_pil(self):
+        image_path = self.save(Image.new("RGB", (20, 10)), "image.png")
+        with open(image_path, "rb") as image_file:
+            data = image_file.read()
+        for name, content in (("truncated.png", data[:30]), ("checksum.png", data[:29] + b"\0" + data[30:]),
+                              ("image.txt", b"not an image")):
+            with self.subTest(name=name):
+                with open(join(self.path, name), "wb") as image_file:
+                    image_file.write(content)
+                self.assertIsNone(probe(join(self.path, name)))
+        self.assertIsNone(probe(self.save(Image.new("RGB", (20, 10)), "image.bmp")))
+
+    def test_headers_of_images_pil_refuses(self):
+        image_path = self.save(Image.new("RGB", (20, 10)), "image.png")
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+            self.assertIsNone(probe(image_path))
+            self.assertEqual(probe_headers(image_path), ImageInfo("PNG", (20, 10), "RGB", False))
@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+from kodi_addon_checker import po_validator
+from kodi_addon_checker.check_string import _polib_error
+
+HEADER = 'msgid ""\nmsgstr ""\n"Language: en_gb\\n"\n\n'
+
+
+class TestScan(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, content, name="strings.po"):
+        file_path = join(self.path, name)
+        with open(file_path, "wb") as po_file:
+            po_file.write(content if isinstance(content, bytes) else content.encode("utf-8"))
+        return file_path
+
+    def test_valid(self):
+        scan = po_validator.scan(self.write(HEADER + '#. comment\n#: file.py:1\nmsgctxt "#32000"\nmsgid "Hello"\n'
+                                            'msgstr "Hallo"\n\n#, fuzzy\nmsgctxt "#32001"\nmsgid "One"\n'
+                                            'msgid_plural "Many"\nmsgstr[0] "Eins"\nmsgstr[1] "Viele"\n'))
+        self.assertEqual(scan, po_validator.PoScan(False, False, False, True, None))
+
+    def test_same_errors_as_polib(self):
+        documents = ['msgctxt "#1"\n# comment\nmsgid "a"\nmsgstr ""\n', 'msgid "a"\n"b"c"\nmsgstr ""\n',
+                     'msgid "a"\nmsgstr[x] "b"\n', '#| msgid\n', '  #| "a"\n', '  #| msgid "a"\n  #| foo "b"\n',
+                     '  #~ msgid "a"\n  #~ msgstr "b"\n', 'msgid\n', ';msgctxt "#1"\n', '"a"\n', 'msgstr "a"\n']
+        for document in documents:
+            with self.subTest(document=document):
+                file_path = self.write(HEADER + document)
+                error = po_validator.scan(file_path).error
+                self.assertEqual(f"{error[0]} on line {error[1]}" if error else None, _polib_error(file_path))
+
+    def test_line_endings(self):
+        scan = po_validator.scan(self.write(HEADER.replace("\n", "\r\n") + 'msgid "a"\r\nmsgstr "b"\r\n;\r\n'))
+        self.assertEqual((scan.crlf, scan.header, scan.error), (True, True, ("Syntax error", 7)))
+        # lone carriage returns end lines, like in text mode
+        scan = po_validator.scan(self.write(HEADER.replace("\n", "\r") + 'msgid "a"\rmsgstr "b"\r;\r'))
+        self.assertEqual((scan.crlf, scan.header, scan.error), (False, True, ("Syntax error", 7)))
+
+    def test_header(self):
+        self.assertFalse(po_validator.scan(self.write('msgctxt "#1"\nmsgid ""\nmsgstr ""\n')).header)
+        self.assertTrue(po_validator.scan(self.write('# msgid ""\n\n msgstr "" msgctxt "#1"\n')).header)
+        self.assertTrue(po_validator.scan(self.write('msgid "a"\nmsgid ""\n\n\t\nmsgstr ""\n')).header)
+        self.assertFalse(po_validator.scan(self.write('msgid ""\nx\nmsgstr ""\n')).header)
+
+    def test_header_without_strings(self):
+        # without a msgctxt line every line may precede the header, they are not kept
+        header = po_validator._Header()  # pylint: disable=protected-access
+        for i in range(1000):
+            header.feed(f'msgid "String {i}"')
+            header.feed('msgstr ""')
+            self.assertEqual(header._tail, "")  # pylint: disable=protected-access
+        self.assertFalse(header.found)
+
+    def test_bom_empty_and_encoding(self):
+        self.assertTrue(po_validator.scan(self.write(b"\xef\xbb\xbf" + HEADER.encode("utf-8"))).bom)
+        self.assertTrue(po_validator.scan(self.write(b"")).empty)
+        self.assertRaises(UnicodeDecodeError, po_validator.scan, self.write(HEADER.encode("utf-8") + b'msgid "\xe9"'))
+
+    def test_chunks(self):
+        file_path = self.write("\ufeff" + HEADER.replace("\n", "\r\n") + 'msgid "\u00e9\u20ac"\r\nmsgstr "a"\r;\r\n')
+        scan = po_validator.scan(file_path)
+        self.assertEqual(scan, po_validator.PoScan(False, True, True, True, ("Syntax error", 7)))
+        for chunk_size in (1, 2, 3):
+            with mock.patch.object(po_validator, "CHUNK_SIZE", chunk_size):
+                self.assertEqual(po_validator.scan(file_path), scan)
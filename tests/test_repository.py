@@ -0,0 +1,260 @@
+import argparse
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from kodi_addon_checker import ValidKodiVersions, check_addon
+from kodi_addon_checker.addons.IndexSource import (BranchIndexSource, HttpIndexSource, LocalIndexSource,
+                                                   parse_repo_index)
+from kodi_addon_checker.addons.Repository import Repository
+from kodi_addon_checker.addons.RepositoryCache import RepositoryCache
+from kodi_addon_checker.check_addon_branches import check_for_existing_addon
+from kodi_addon_checker.report import Report
+
+ADDONS_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<addons>
+    <addon id="script.module.foo" version="1.0.0">
+        <requires><import addon="xbmc.python" version="3.0.0"/></requires>
+    </addon>
+    <addon id="plugin.video.bar" version="2.1.0">
+        <requires>
+            <import addon="xbmc.python" version="3.0.0"/>
+            <import addon="script.module.foo" version="1.0.0"/>
+            <import addon="script.module.baz" optional="true"/>
+        </requires>
+    </addon>
+    <addon id="script.module.foo" version="1.1.0~beta1">
+        <requires><import addon="xbmc.python" version="3.0.0"/></requires>
+    </addon>
+</addons>
+"""
+
+
+class IndexHandler(BaseHTTPRequestHandler):
+    """Serves a gzipped addons.xml with an ETag, answering conditional requests with 304"""
+    etag = '"v1"'
+    status = 200
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.requests.append(dict(self.headers))
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        payload = gzip.compress(ADDONS_XML)
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestRepositoryCache(unittest.TestCase):
+
+    def setUp(self):
+        IndexHandler.requests = []
+        IndexHandler.status = 200
+        self.server = HTTPServer(("127.0.0.1", 0), IndexHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/matrix/addons.xml.gz"
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def test_repository_without_cache(self):
+        repo = Repository("matrix", self.url)
+        self.assertIn("plugin.video.bar", repo)
+        self.assertEqual(len(IndexHandler.requests), 1)
+
+    def test_fresh_cache_skips_download(self):
+        cache = RepositoryCache(self.cache_dir, max_age=3600)
+        Repository("matrix", self.url, cache)
+        repo = Repository("matrix", self.url, cache)
+        self.assertIn("script.module.foo", repo)
+        self.assertEqual(len(IndexHandler.requests), 1)
+
+    def test_expired_cache_revalidates(self):
+        cache = RepositoryCache(self.cache_dir, max_age=0)
+        Repository("matrix", self.url, cache)
+        repo = Repository("matrix", self.url, cache)
+        self.assertIn("script.module.foo", repo)
+        self.assertEqual(len(IndexHandler.requests), 2)
+        self.assertEqual(IndexHandler.requests[1].get("If-None-Match"), IndexHandler.etag)
+
+    def test_stale_copy_when_mirror_fails(self):
+        cache = RepositoryCache(self.cache_dir, max_age=0)
+        Repository("matrix", self.url, cache)
+        IndexHandler.status = 500
+        repo = Repository("matrix", self.url, cache)
+        self.assertEqual(repo.find("plugin.video.bar").version, "2.1.0")
+
+    def test_failure_without_cached_copy(self):
+        IndexHandler.status = 500
+        repo = Repository("matrix", self.url, RepositoryCache(self.cache_dir))
+        self.assertListEqual(repo.addons, [])
+        self.assertNotIn("plugin.video.bar", repo)
+        self.assertIsNone(repo.find("plugin.video.bar"))
+        self.assertListEqual(repo.rdepends("script.module.foo"), [])
+
+    def test_find_highest_version(self):
+        repo = Repository("matrix", self.url)
+        self.assertEqual(repo.find("script.module.foo").version, "1.1.0~beta1")
+        self.assertListEqual([addon.version for addon in repo.find_all("script.module.foo")],
+                             ["1.1.0~beta1", "1.0.0"])
+        self.assertIsNone(repo.find("script.module.missing"))
+        self.assertListEqual(repo.find_all("script.module.missing"), [])
+
+    def test_rdepends(self):
+        repo = Repository("matrix", self.url)
+        self.assertListEqual([addon.id for addon in repo.rdepends("script.module.foo")], ["plugin.video.bar"])
+        self.assertListEqual([addon.id for addon in repo.rdepends("xbmc.python")],
+                             ["script.module.foo", "plugin.video.bar", "script.module.foo"])
+        self.assertListEqual(repo.rdepends("plugin.video.bar"), [])
+
+    def test_shared_dependencies(self):
+        repo = Repository("matrix", self.url)
+        latest, previous = repo.find_all("script.module.foo")
+        self.assertIs(latest.dependencies, previous.dependencies)
+        python_dependency = repo.find("plugin.video.bar").dependencies[0]
+        self.assertIs(python_dependency, latest.dependencies[0])
+        self.assertEqual(python_dependency.id, "xbmc.python")
+        self.assertEqual(repr(python_dependency.version), "3.0.0")
+
+    def test_snapshot(self):
+        cache = RepositoryCache(self.cache_dir)
+        parsed = Repository("matrix", self.url, cache)
+        snapshots = [name for name in os.listdir(self.cache_dir) if name.endswith(".snapshot")]
+        self.assertEqual(len(snapshots), 1)
+
+        with mock.patch.object(Repository, "_parse", side_effect=AssertionError("snapshot not used")):
+            loaded = Repository("matrix", self.url, cache)
+
+        def describe(repo):
+            return [(addon.id, addon.version,
+                     [(dep.id, repr(dep.version), dep.optional) for dep in addon.dependencies])
+                    for addon in repo.addons]
+        self.assertListEqual(describe(loaded), describe(parsed))
+        self.assertEqual(loaded.find("script.module.foo").version, "1.1.0~beta1")
+
+    def test_stale_snapshot_is_rebuilt(self):
+        cache = RepositoryCache(self.cache_dir, max_age=0)
+        Repository("matrix", self.url, cache)
+        IndexHandler.etag = '"v2"'
+        try:
+            with mock.patch(__name__ + ".ADDONS_XML", ADDONS_XML.replace(b'"2.1.0"', b'"2.2.0"')):
+                repo = Repository("matrix", self.url, cache)
+        finally:
+            IndexHandler.etag = '"v1"'
+        self.assertEqual(repo.find("plugin.video.bar").version, "2.2.0")
+
+
+class TestGetAllRepoAddons(unittest.TestCase):
+
+    def setUp(self):
+        IndexHandler.requests = []
+        IndexHandler.status = 200
+        self.server = HTTPServer(("127.0.0.1", 0), IndexHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.root_url = check_addon.ROOT_URL
+        check_addon.ROOT_URL = f"http://127.0.0.1:{self.server.server_port}/{{branch}}/addons.xml.gz"
+
+    def tearDown(self):
+        check_addon.ROOT_URL = self.root_url
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_all_branches_loaded_in_order(self):
+        all_repo_addons = check_addon.get_all_repo_addons()
+        self.assertListEqual(list(all_repo_addons), ValidKodiVersions)
+        for branch, repo in all_repo_addons.items():
+            self.assertEqual(repo.version, branch)
+            self.assertIn("script.module.foo", repo)
+        self.assertEqual(len(IndexHandler.requests), len(ValidKodiVersions))
+
+    def test_branches_loaded_on_access(self):
+        all_repo_addons = check_addon.get_all_repo_addons()
+        self.assertEqual(len(IndexHandler.requests), 0)
+        self.assertIn("script.module.foo", all_repo_addons["matrix"])
+        self.assertIn("script.module.foo", all_repo_addons["matrix"])
+        self.assertEqual(len(IndexHandler.requests), 1)
+
+    def test_branches_scope(self):
+        all_repo_addons = check_addon.get_all_repo_addons(branches={"leia", "matrix"})
+        self.assertListEqual(list(all_repo_addons), ["leia", "matrix"])
+        self.assertNotIn("nexus", all_repo_addons)
+        self.assertEqual(len(list(all_repo_addons.items())), 2)
+        self.assertEqual(len(IndexHandler.requests), 2)
+
+
+class TestLocalIndexSource(unittest.TestCase):
+
+    def setUp(self):
+        self.mirror = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.mirror, "matrix"))
+        os.makedirs(os.path.join(self.mirror, "leia"))
+        with open(os.path.join(self.mirror, "matrix", "addons.xml.gz"), "wb") as index:
+            index.write(gzip.compress(ADDONS_XML))
+        with open(os.path.join(self.mirror, "leia", "addons.xml"), "wb") as index:
+            index.write(ADDONS_XML.replace(b'"2.1.0"', b'"1.0.0"'))
+
+    def tearDown(self):
+        shutil.rmtree(self.mirror)
+
+    def test_mirror_directory(self):
+        all_repo_addons = check_addon.get_all_repo_addons(repo_index=[self.mirror])
+        self.assertEqual(all_repo_addons["matrix"].find("plugin.video.bar").version, "2.1.0")
+        self.assertEqual(all_repo_addons["leia"].find("plugin.video.bar").version, "1.0.0")
+        self.assertEqual(all_repo_addons["leia"].path, os.path.join(self.mirror, "leia", "addons.xml"))
+        self.assertListEqual(all_repo_addons["nexus"].addons, [])
+
+    def test_partial_mirror(self):
+        all_repo_addons = check_addon.get_all_repo_addons(repo_index=[self.mirror])
+        addon = all_repo_addons["matrix"].find("plugin.video.bar")
+        args = argparse.Namespace(PR=False, branch="nexus")
+        report = Report("plugin.video.bar")
+        check_for_existing_addon(report, addon, all_repo_addons, args)
+        self.assertEqual(report.problem_count, 0)
+        # found on the mirrored branches, not reported as a new addon
+        self.assertEqual(report.information_count, 0)
+        self.assertNotIn("plugin.video.bar", all_repo_addons["nexus"])
+        self.assertIsNone(all_repo_addons["omega"].find("plugin.video.bar"))
+        self.assertListEqual(all_repo_addons["nexus"].rdepends("script.module.foo"), [])
+
+    def test_file_url_template(self):
+        source = LocalIndexSource(f"file://{self.mirror}/{{branch}}/addons.xml.gz")
+        self.assertIn("script.module.foo", Repository("matrix", source))
+
+    def test_branch_override(self):
+        source = parse_repo_index([f"leia={self.mirror}"], HttpIndexSource(check_addon.ROOT_URL))
+        self.assertIsInstance(source, BranchIndexSource)
+        self.assertEqual(source.location("leia"), os.path.join(self.mirror, "leia", "addons.xml"))
+        self.assertEqual(source.location("matrix"), check_addon.ROOT_URL.format(branch="matrix"))
+
+    def test_snapshot_kept_in_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            source = LocalIndexSource(self.mirror, RepositoryCache(cache_dir))
+            Repository("matrix", source)
+            with mock.patch.object(Repository, "_parse", side_effect=AssertionError("snapshot not used")):
+                self.assertIn("script.module.foo", Repository("matrix", source))
+            self.assertListEqual(sorted(os.listdir(os.path.join(self.mirror, "matrix"))), ["addons.xml.gz"])
+        finally:
+            shutil.rmtree(cache_dir)
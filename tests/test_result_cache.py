@@ -0,0 +1,74 @@
+import shutil
+import tempfile
+import unittest
+from os.path import join
+
+from kodi_addon_checker.record import PROBLEM, Record
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.result_cache import ResultCache
+from kodi_addon_checker.runner import FileCheckRunner
+
+CALLS = []
+
+
+def _check(report, path):
+    CALLS.append(path)
+    with open(path, "r", encoding="utf8") as checked_file:
+        if "bad" in checked_file.read():
+            report.add(Record(PROBLEM, f"bad file {path}"))
+    return len(CALLS)
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.files = []
+        for i, content in enumerate(("good", "bad", "good")):
+            self.files.append(join(self.path, f"file{i}.xml"))
+            with open(self.files[-1], "w", encoding="utf8") as checked_file:
+                checked_file.write(content + str(i))
+        CALLS.clear()
+
+    def tearDown(self):
+        FileCheckRunner.cache = None
+        shutil.rmtree(self.path)
+
+    def run_checks(self, cache):
+        FileCheckRunner.cache = cache
+        report = Report("")
+        results = FileCheckRunner().run(report, _check, [(file,) for file in self.files], self.files)
+        return report.problem_count, results
+
+    def test_cached_between_runs(self):
+        cache = ResultCache(join(self.path, "cache"))
+        self.assertEqual(self.run_checks(cache), (1, [1, 2, 3]))
+        cache.save()
+
+        CALLS.clear()
+        self.assertEqual(self.run_checks(ResultCache(join(self.path, "cache"))), (1, [1, 2, 3]))
+        self.assertEqual(CALLS, [])
+
+    def test_changed_file_is_checked_again(self):
+        cache = ResultCache(join(self.path, "cache"))
+        self.run_checks(cache)
+        with open(self.files[1], "w", encoding="utf8") as checked_file:
+            checked_file.write("fixed")
+
+        CALLS.clear()
+        self.assertEqual(self.run_checks(cache), (0, [1, 1, 3]))
+        self.assertEqual(CALLS, [self.files[1]])
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ResultCache(join(self.path, "cache"))
+        keys = [cache.key("check", file) for file in self.files]
+        for key in keys:
+            cache.put(key, [], None)
+        cache.get(keys[0])
+        cache.max_size = 2 * (cache._entries[keys[0]]["size"] + len(keys[0]))  # pylint: disable=protected-access
+        cache.save()
+
+        cache = ResultCache(join(self.path, "cache"))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import time
+import unittest
+from os.path import join
+
+from kodi_addon_checker import common
+from kodi_addon_checker.check_files import check_for_invalid_xml_files
+from kodi_addon_checker.common import load_plugins
+from kodi_addon_checker.handle_files import FileIndex
+from kodi_addon_checker.record import Record
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.reporter import ReportManager
+from kodi_addon_checker.runner import CheckTimeout, FileCheckRunner, time_limit
+
+
+class TestFileCheckRunner(unittest.TestCase):
+
+    def setUp(self):
+        load_plugins()
+        ReportManager.enable(["array"])
+        self.path = tempfile.mkdtemp()
+        for i in range(20):
+            with open(join(self.path, f"file{i}.xml"), "w", encoding="utf8") as xml_file:
+                xml_file.write("<valid/>" if i % 3 else "<invalid>")
+        self.rel_path = common.REL_PATH
+        common.REL_PATH = self.path
+
+    def tearDown(self):
+        common.REL_PATH = self.rel_path
+        shutil.rmtree(self.path)
+
+    def records(self, jobs):
+        ReportManager.getEnabledReporters()[0].reports = []
+        report = Report("")
+        check_for_invalid_xml_files(report, FileIndex(self.path), FileCheckRunner(jobs))
+        return report.problem_count, [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+    def test_same_records_as_serial(self):
+        serial = self.records(1)
+        self.assertEqual(serial[0], 7)
+        self.assertTrue(all(record.startswith("ERROR: Invalid xml found. ./file") for record in serial[1]))
+        self.assertEqual(self.records(2), serial)
+
+    def test_results_in_task_order(self):
+        report = Report("")
+        results = FileCheckRunner(2).run(report, _square, [(i,) for i in range(50)])
+        self.assertEqual(results, [i * i for i in range(50)])
+
+
+def _square(_report, value):
+    return value * value
+
+
+class TestTimeLimit(unittest.TestCase):
+
+    def test_interrupts_the_block(self):
+        with self.assertRaises(CheckTimeout):
+            with time_limit(0.05):
+                while True:
+                    pass
+
+    def test_block_within_the_limit(self):
+        with time_limit(5):
+            pass
+        # the timer is cancelled when the block ends
+        time.sleep(0.1)
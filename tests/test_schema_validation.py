@@ -0,0 +1,83 @@
+import os
+import unittest
+import xml.etree.ElementTree as ET
+from os.path import join
+from unittest import mock
+
+from kodi_addon_checker import schema_validation
+from kodi_addon_checker.common import load_plugins
+from kodi_addon_checker.record import Record
+from kodi_addon_checker.report import Report
+from kodi_addon_checker.reporter import ReportManager
+from kodi_addon_checker.schema_validation import SchemaRegistry
+
+ADDON_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<addon id="script.test" name="Test" version="1.0.0" provider-name="test">
+    <requires>
+        <import addon="xbmc.python" version="3.0.0"/>
+    </requires>
+    <extension point="xbmc.python.script" library="default.py"/>
+    <extension point="xbmc.addon.metadata">
+        <summary lang="en_GB">Summary</summary>
+        <description lang="en_GB">Description</description>
+        <platform>all</platform>
+        <license>GPL-3.0-only</license>
+        {extra}
+    </extension>
+</addon>
+"""
+
+
+class TestSchemaValidation(unittest.TestCase):
+
+    def setUp(self):
+        load_plugins()
+        ReportManager.enable(["array"])
+        self.report = Report("")
+
+    def tearDown(self):
+        SchemaRegistry.schemas.clear()
+
+    def records(self):
+        return [Record.__str__(r) for r in ReportManager.getEnabledReporters()[0].reports]
+
+    def test_valid_xml(self):
+        schema_validation.schemas(self.report, ET.fromstring(ADDON_XML.format(extra="")), "matrix")
+        self.assertIn("INFO: Valid XML file found", self.records())
+        self.assertEqual(self.report.problem_count, 0)
+
+    def test_errors_are_reported(self):
+        parsed_xml = ET.fromstring(ADDON_XML.format(extra="<unknown/>"))
+        schema_validation.schemas(self.report, parsed_xml, "matrix")
+        records = self.records()
+        errors = [r for r in records if r.startswith("INFO: Schema validation error for xbmc.addon.metadata:")]
+        self.assertEqual(len(errors), 1)
+        self.assertIn("unknown", errors[0])
+        self.assertIn("ERROR: Schema validation failed for the following points: xbmc.addon.metadata ", records)
+        # the details do not count as problems on their own
+        self.assertEqual(self.report.problem_count, 1)
+
+    def test_parsed_xml_is_not_modified(self):
+        parsed_xml = ET.fromstring(ADDON_XML.format(extra=""))
+        schema_validation.schemas(self.report, parsed_xml, "matrix")
+        self.assertEqual(len(parsed_xml.findall("extension")), 2)
+
+    def test_schema_of_lower_branch(self):
+        self.assertEqual(schema_validation.check_version("nexus", "metadata.xsd"),
+                         join(schema_validation.XML_SCHEMA, "matrix_metadata.xsd"))
+        self.assertEqual(schema_validation.check_version("leia", "metadata.xsd"),
+                         join(schema_validation.XML_SCHEMA, "gotham_metadata.xsd"))
+        self.assertIsNone(schema_validation.check_version("gotham", "unknown.xsd"))
+
+    def test_registry_compiles_once(self):
+        path = join(schema_validation.XML_SCHEMA, "addon.xsd")
+        schema = SchemaRegistry.get(path)
+        self.assertIs(SchemaRegistry.get(join(schema_validation.XML_SCHEMA, "..", "xml_schema", "addon.xsd")), schema)
+
+    def test_registry_does_not_stat(self):
+        parsed_xml = ET.fromstring(ADDON_XML.format(extra=""))
+        schema_validation.schemas(self.report, parsed_xml, "matrix")
+        with mock.patch("os.lstat", side_effect=os.lstat) as lstat, \
+                mock.patch("os.stat", side_effect=os.stat) as stat:
+            schema_validation.schemas(self.report, parsed_xml, "matrix")
+        self.assertEqual(lstat.call_count + stat.call_count, 0)
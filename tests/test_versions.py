@@ -39,3 +39,14 @@ def test_kodi_non_compliant_pep440_builtin_versions():
 
 def test_kodiversions():
     assert KodiVersion("matrix") > KodiVersion("leia")
+
+
+def test_addonversion_hashable():
+    versions = {AddonVersion("1.0.0~beta1"), AddonVersion("1.0.0beta1"), AddonVersion("1.0.0")}
+    assert len(versions) == 2
+
+
+def test_kodiversion_hashable():
+    assert len({KodiVersion("matrix"), KodiVersion("matrix"), KodiVersion("leia")}) == 2
+    assert sorted([KodiVersion("piers"), KodiVersion("gotham"), KodiVersion("leia")]) == \
+        [KodiVersion("gotham"), KodiVersion("leia"), KodiVersion("piers")]
@@ -0,0 +1,84 @@
+import json
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+from kodi_addon_checker import well_formedness
+from kodi_addon_checker.well_formedness import MalformedError, check_json, check_xml
+
+
+class WellFormednessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, content, name="file"):
+        file_path = join(self.path, name)
+        with open(file_path, "wb") as checked_file:
+            checked_file.write(content.encode("utf-8"))
+        return file_path
+
+    def assertMalformed(self, check, content, msg, lineno, colno):
+        with self.assertRaises(MalformedError) as context:
+            check(self.write(content))
+        self.assertEqual((context.exception.msg, context.exception.lineno, context.exception.colno),
+                         (msg, lineno, colno))
+
+
+class TestCheckXml(WellFormednessTestCase):
+
+    def test_well_formed(self):
+        check_xml(self.write('<?xml version="1.0"?>\n<window xmlns:a="urn:a"><a:b c="1">&amp;</a:b></window>'))
+
+    def test_position(self):
+        self.assertMalformed(check_xml, "<window>\n  <control></window>", "mismatched tag", 2, 14)
+
+    def test_same_as_elementtree(self):
+        self.assertMalformed(check_xml, "<window><a:b/></window>", "unbound prefix", 1, 9)
+        self.assertMalformed(check_xml, '<!DOCTYPE w SYSTEM "w.dtd">\n<w>&nbsp;</w>', "undefined entity &nbsp;", 2, 4)
+
+    def test_chunks(self):
+        with mock.patch.object(well_formedness, "CHUNK_SIZE", 3):
+            check_xml(self.write("<window>" + "<label>text</label>" * 10 + "</window>"))
+            self.assertMalformed(check_xml, "<window>\n<label>\n</window>", "mismatched tag", 3, 3)
+
+
+class TestCheckJson(WellFormednessTestCase):
+
+    def test_same_as_json_module(self):
+        documents = ['{"a": [1, -2.5e3, true, false, null, "\\u00e9\\n"], "b": {}}', "[NaN, -Infinity]", "12", "",
+                     "[1,]", '{"a" 1}', '{"a": 1,}', "[1 2]", "01", '"a\tb"', '"\\x"', "[tru]", "{} {}", "\ufeff{}"]
+        for chunk_size in (1, 4, 64 * 1024):
+            with mock.patch.object(well_formedness, "CHUNK_SIZE", chunk_size):
+                for document in documents:
+                    try:
+                        json.loads(document)
+                        valid = True
+                    except ValueError:
+                        valid = False
+                    with self.subTest(document=document, chunk_size=chunk_size):
+                        if valid:
+                            check_json(self.write(document))
+                        else:
+                            self.assertRaises(MalformedError, check_json, self.write(document))
+
+    def test_position(self):
+        self.assertMalformed(check_json, '{\n  "a": 1,\n  "b" 2\n}', "Expecting ':' delimiter", 3, 7)
+        with mock.patch.object(well_formedness, "CHUNK_SIZE", 4):
+            self.assertMalformed(check_json, '[\n  "long string",\n  [1, 2], x]', "Expecting value", 3, 11)
+
+    def test_nested_containers_across_chunks(self):
+        document = json.dumps([{"id": i, "values": [i, str(i), {"deep": [None] * i}]} for i in range(50)])
+        with mock.patch.object(well_formedness, "CHUNK_SIZE", 16):
+            check_json(self.write(document))
+            self.assertMalformed(check_json, document[:-1], "Unexpected end of data", 1, len(document))
+
+    def test_not_utf8(self):
+        with open(join(self.path, "latin.json"), "wb") as checked_file:
+            checked_file.write('"\xe9"'.encode("latin-1"))
+        self.assertRaises(UnicodeDecodeError, check_json, join(self.path, "latin.json"))